@@ -0,0 +1,80 @@
+"""
+Synthetic table data modeled on the `Dessert` records of `tests/data.py`.
+"""
+
+import random
+from typing import Literal
+
+import flet as ft
+
+import flet_datatable2 as ftd
+
+RowStyle = Literal["values", "cells"]
+
+_NAMES = [
+    "Frozen Yogurt",
+    "Ice Cream Sandwich",
+    "Eclair",
+    "Cupcake",
+    "Gingerbread",
+    "Jelly Bean",
+    "Lollipop",
+    "Honeycomb",
+    "Donut",
+    "KitKat",
+]
+
+# (label, numeric)
+_COLUMNS = [
+    ("Name", False),
+    ("Calories", True),
+    ("Fat", True),
+    ("Carbs", True),
+    ("Protein", True),
+    ("Sodium", True),
+    ("Calcium", True),
+    ("Iron", True),
+]
+
+
+def generate_desserts(count: int, seed: int = 0) -> list[tuple]:
+    """
+    Returns `count` dessert records as tuples of the values of the columns
+    returned by [`dessert_columns()`][..], always the same for a `seed`.
+    """
+    rnd = random.Random(seed)
+    return [
+        (
+            f"{rnd.choice(_NAMES)} #{i}",
+            rnd.randint(100, 500),
+            round(rnd.uniform(0, 30), 1),
+            rnd.randint(10, 100),
+            round(rnd.uniform(0, 10), 1),
+            rnd.randint(0, 600),
+            rnd.randint(0, 20),
+            rnd.randint(0, 10),
+        )
+        for i in range(count)
+    ]
+
+
+def dessert_columns() -> list[ftd.DataColumn2]:
+    return [
+        ftd.DataColumn2(
+            label=ft.Text(label),
+            numeric=numeric,
+            size=ftd.DataColumnSize.S if numeric else ftd.DataColumnSize.L,
+        )
+        for label, numeric in _COLUMNS
+    ]
+
+
+def dessert_row(dessert: tuple, style: RowStyle) -> ftd.DataRow2:
+    """
+    Builds the row of a dessert, either from plain
+    [`values`][flet_datatable2.DataRow2.values] or from `DataCell`s with
+    a `Text` each, the way `tests/sorting_test.py` does.
+    """
+    if style == "values":
+        return ftd.DataRow2(values=list(dessert))
+    return ftd.DataRow2(cells=[ft.DataCell(ft.Text(str(value))) for value in dessert])
@@ -0,0 +1,300 @@
+"""
+Benchmarks of building, sending, updating and sorting `DataTable2`s.
+
+For each row style and number of rows, measures:
+
+- `construct_s`: time to build the rows and the table;
+- `construct_peak_mb`: peak memory allocated while building them,
+  traced with `tracemalloc`;
+- `full_load_s`, `full_load_bytes`: time to compute and encode the patch
+  adding the table to a page, and its size;
+- `row_update_s`, `row_update_bytes`: the same for replacing a single row,
+  the fastest of `--repeat` runs;
+- `cell_update_s`, `cell_update_bytes`: the same for changing the value
+  of a single cell and updating it;
+- `sort_s`: time of the first `sort_by()` of a column, extracting its keys;
+- `resort_s`: time of sorting the same column the other way round, from
+  cached keys;
+- `sort_update_bytes`: size of the update sending a new order.
+
+Patches are encoded the way a page session sends them, without a client.
+
+Tables of 1,000 and 10,000 rows are benchmarked by default, in seconds;
+`--large` adds tables of 100,000 and 1,000,000 rows, which take minutes.
+
+Usage:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --large --output results.json
+    python benchmarks/run.py --sizes 10000 100000 --baseline results.json
+
+With `--baseline`, results are compared to those of a previous run and
+the run fails if any metric got worse by more than its tolerance.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+import flet as ft
+import msgpack
+from data import RowStyle, dessert_columns, dessert_row, generate_desserts
+from flet.controls.base_control import BaseControl
+from flet.messaging.connection import Connection
+from flet.messaging.protocol import configure_encode_object_for_msgpack
+from flet.messaging.session import Session
+from flet.pubsub.pubsub_hub import PubSubHub
+
+import flet_datatable2 as ftd
+
+DEFAULT_SIZES = [1_000, 10_000]
+
+# sizes added by --large
+LARGE_SIZES = [100_000, 1_000_000]
+
+# relative tolerances of metrics, by kind, when comparing to a baseline
+DEFAULT_TOLERANCES = {"s": 0.25, "bytes": 0.0, "mb": 0.1}
+
+# timings within this many seconds of the baseline are never regressions
+TIME_SLACK = 0.002
+
+_encode = configure_encode_object_for_msgpack(BaseControl)
+
+
+class _MemoryConnection(Connection):
+    """
+    A connection keeping the sizes of the messages sent to the client.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pubsubhub = PubSubHub()
+        self.sizes: list[int] = []
+
+    def send_message(self, message):
+        self.sizes.append(
+            len(msgpack.packb([message.action, message.body], default=_encode))
+        )
+
+
+def _create_page() -> tuple[ft.Page, _MemoryConnection]:
+    connection = _MemoryConnection()
+    connection.loop = asyncio.new_event_loop()
+    session = Session(connection)
+    connection.session = session
+    # the page itself is sent first, which also links it to its controls
+    msgpack.packb(session.get_page_patch(), default=_encode)
+    return session.page, connection
+
+
+def _sent(
+    connection: _MemoryConnection, action: Callable[[], Any]
+) -> tuple[float, int]:
+    """
+    Runs `action`, returning its duration and the number of bytes it sent.
+    """
+    sent = len(connection.sizes)
+    start = time.perf_counter()
+    action()
+    duration = time.perf_counter() - start
+    return duration, sum(connection.sizes[sent:])
+
+
+def _build_table(desserts: Sequence[tuple], style: RowStyle) -> ftd.DataTable2:
+    return ftd.DataTable2(
+        columns=dessert_columns(),
+        rows=[dessert_row(d, style) for d in desserts],
+    )
+
+
+def run_case(style: RowStyle, size: int, repeat: int) -> dict[str, float]:
+    desserts = generate_desserts(size)
+    results: dict[str, float] = {}
+
+    gc.collect()
+    start = time.perf_counter()
+    table = _build_table(desserts, style)
+    results["construct_s"] = time.perf_counter() - start
+    del table
+
+    gc.collect()
+    tracemalloc.start()
+    table = _build_table(desserts, style)
+    results["construct_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    page, connection = _create_page()
+    results["full_load_s"], results["full_load_bytes"] = _sent(
+        connection, lambda: page.add(table)
+    )
+
+    middle = size // 2
+    replacements = [dessert_row(d, style) for d in generate_desserts(repeat, seed=1)]
+    timings = []
+    for replacement in replacements:
+
+        def replace_row(replacement=replacement):
+            table.rows[middle] = replacement
+            table.update()
+
+        duration, sent = _sent(connection, replace_row)
+        timings.append(duration)
+    results["row_update_s"] = min(timings)
+    results["row_update_bytes"] = sent
+
+    row = table.rows[middle + 1]
+    cell = row.cells[1].content if style == "cells" else None
+    timings = []
+    for i in range(repeat):
+        if cell is None:
+            row.values[1] = i
+            duration, sent = _sent(connection, row.update)
+        else:
+            cell.value = str(i)
+            duration, sent = _sent(connection, cell.update)
+        timings.append(duration)
+    results["cell_update_s"] = min(timings)
+    results["cell_update_bytes"] = sent
+
+    start = time.perf_counter()
+    table.sort_by(1)
+    results["sort_s"] = time.perf_counter() - start
+    _, results["sort_update_bytes"] = _sent(connection, table.update)
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        table.sort_by(1, ascending=i % 2 == 1)
+        timings.append(time.perf_counter() - start)
+    results["resort_s"] = min(timings)
+
+    connection.loop.close()
+    return results
+
+
+def compare(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerances: dict[str, float],
+) -> list[str]:
+    """
+    Returns descriptions of metrics of `results` that are worse than in
+    `baseline` by more than their tolerance. Cases and metrics missing
+    from either are ignored.
+    """
+    regressions = []
+    for case, metrics in results["cases"].items():
+        base_metrics = baseline.get("cases", {}).get(case, {})
+        for name, value in metrics.items():
+            base = base_metrics.get(name)
+            if base is None:
+                continue
+            kind = name.rsplit("_", 1)[-1]
+            limit = base * (1 + tolerances[kind])
+            if kind == "s":
+                limit += TIME_SLACK
+            if value > limit:
+                change = f"{(value - base) / base:+.1%}" if base else "new"
+                regressions.append(
+                    f"{case} {name}: {_format(base)} -> {_format(value)} ({change})"
+                )
+    return regressions
+
+
+def _format(value: float) -> str:
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+
+def _print_results(results: dict[str, Any]):
+    for case, metrics in results["cases"].items():
+        print(case)
+        for name, value in metrics.items():
+            print(f"  {name:<20} {_format(value):>14}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="numbers of rows to benchmark",
+    )
+    parser.add_argument(
+        "--large",
+        action="store_true",
+        help=f"also benchmark {' and '.join(map(str, LARGE_SIZES))} rows",
+    )
+    parser.add_argument(
+        "--styles",
+        nargs="+",
+        choices=["values", "cells"],
+        default=["values"],
+        help="row styles: plain values, or a DataCell and a Text per cell",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="runs of cheap operations, of which the fastest is kept",
+    )
+    parser.add_argument("--output", type=Path, help="file to write results to")
+    parser.add_argument("--baseline", type=Path, help="results to compare to")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TOLERANCES["s"])
+    parser.add_argument(
+        "--size-tolerance", type=float, default=DEFAULT_TOLERANCES["bytes"]
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=DEFAULT_TOLERANCES["mb"]
+    )
+    args = parser.parse_args(argv)
+
+    results: dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "flet": getattr(ft, "__version__", None),
+        },
+        "cases": {},
+    }
+    sizes = list(dict.fromkeys([*args.sizes, *(LARGE_SIZES if args.large else ())]))
+    for style in args.styles:
+        for size in sizes:
+            case = f"{style}/{size}"
+            print(f"running {case}...", file=sys.stderr)
+            results["cases"][case] = run_case(style, size, args.repeat)
+
+    _print_results(results)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(
+            results,
+            baseline,
+            {
+                "s": args.time_tolerance,
+                "bytes": args.size_tolerance,
+                "mb": args.memory_tolerance,
+            },
+        )
+        if regressions:
+            print("\nregressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import flet as ft
+
+import flet_datatable2 as fdt
+
+
+class SquaresSource(fdt.DataTable2Source):
+    @property
+    def row_count(self) -> int:
+        return 200_000
+
+    def get_rows(self, start: int, count: int) -> list[fdt.DataRow2]:
+        return [
+            fdt.DataRow2(
+                cells=[
+                    ft.DataCell(content=ft.Text(str(i))),
+                    ft.DataCell(content=ft.Text(str(i * i))),
+                ]
+            )
+            for i in range(start, start + count)
+        ]
+
+
+def main(page: ft.Page):
+    page.add(
+        fdt.DataTable2(
+            expand=True,
+            data_row_height=40,
+            source=SquaresSource(),
+            columns=[
+                fdt.DataColumn2(label=ft.Text("Number"), numeric=True),
+                fdt.DataColumn2(label=ft.Text("Square"), numeric=True),
+            ],
+        ),
+    )
+
+
+ft.run(main)
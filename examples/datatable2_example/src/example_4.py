@@ -0,0 +1,49 @@
+import asyncio
+
+import flet as ft
+
+import flet_datatable2 as fdt
+
+NUMBERS = list(range(1, 10_001))
+
+
+async def fetch_page(start, count, sort, page_filter):
+    await asyncio.sleep(0.2)  # simulate a slow backend query
+    numbers = NUMBERS
+    if sort is not None:
+        numbers = sorted(numbers, reverse=not sort[1])
+    return fdt.PageResult(
+        rows=[
+            fdt.DataRow2(
+                cells=[
+                    ft.DataCell(content=ft.Text(str(n))),
+                    ft.DataCell(content=ft.Text(hex(n))),
+                ]
+            )
+            for n in numbers[start : start + count]
+        ],
+        total=len(numbers),
+    )
+
+
+def main(page: ft.Page):
+    def handle_sort(e: ft.DataColumnSortEvent):
+        table.sort_column_index = e.column_index
+        table.sort_ascending = e.ascending
+
+    page.add(
+        table := fdt.AsyncPaginatedDataTable2(
+            expand=True,
+            rows_per_page=20,
+            fetch_page=fetch_page,
+            columns=[
+                fdt.DataColumn2(
+                    label=ft.Text("Number"), numeric=True, on_sort=handle_sort
+                ),
+                fdt.DataColumn2(label=ft.Text("Hex")),
+            ],
+        ),
+    )
+
+
+ft.run(main)
@@ -1,10 +1,50 @@
-from flet_datatable2.datacolumn2 import DataColumn2, DataColumnSize
-from flet_datatable2.datarow2 import DataRow2
-from flet_datatable2.datatable2 import DataTable2
+from flet_datatable2.async_paginated_datatable2 import (
+    AsyncPaginatedDataTable2,
+    PageResult,
+)
+from flet_datatable2.column_format import ColumnFormat, ColumnFormatType
+from flet_datatable2.datacolumn2 import ColumnSummary, DataColumn2, DataColumnSize
+from flet_datatable2.dataframe_source import DataFrameSource
+from flet_datatable2.datarow2 import CellValue, DataRow2
+from flet_datatable2.datasource import DataTable2Source
+from flet_datatable2.datatable2 import (
+    DataTable2,
+    LoadProgressEvent,
+    MetricsEvent,
+    RowEvent,
+    TableScrollEvent,
+)
+from flet_datatable2.filters import RangeFilter, RowFilter, ValuesFilter
+from flet_datatable2.grouping import Aggregate, RowGroups
+from flet_datatable2.metrics import TableMetrics
+from flet_datatable2.selection import SelectionModel
+from flet_datatable2.sqlite_source import SqliteDataSource
+from flet_datatable2.table_model import TableModel
 
 __all__ = [
+    "Aggregate",
+    "AsyncPaginatedDataTable2",
+    "CellValue",
+    "ColumnFormat",
+    "ColumnFormatType",
+    "ColumnSummary",
     "DataColumn2",
     "DataColumnSize",
+    "DataFrameSource",
     "DataRow2",
     "DataTable2",
+    "DataTable2Source",
+    "LoadProgressEvent",
+    "MetricsEvent",
+    "PageResult",
+    "RangeFilter",
+    "RowEvent",
+    "RowFilter",
+    "RowGroups",
+    "SelectionModel",
+    "SqliteDataSource",
+    "TableMetrics",
+    "TableScrollEvent",
+    "TableModel",
+    "ValuesFilter",
 ]
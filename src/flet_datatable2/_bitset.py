@@ -0,0 +1,19 @@
+from collections.abc import Iterable
+
+
+def from_indexes(indexes: Iterable[int], size: int) -> int:
+    """
+    Returns a bitset of `size` bits with the bits at `indexes` set.
+    """
+    buffer = bytearray((size + 7) >> 3)
+    for i in indexes:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def to_bytes(bits: int, size: int) -> bytes:
+    """
+    Packs a bitset of `size` bits into bytes, bit `i` being bit `i % 8`
+    of byte `i // 8`.
+    """
+    return bits.to_bytes((size + 7) >> 3, "little")
@@ -0,0 +1,55 @@
+from typing import Any, Optional, Union
+
+import flet as ft
+
+
+def cell_value(row: ft.DataRow, column_index: int) -> Any:
+    """
+    Returns the plain value displayed in a cell of `row`.
+
+    That is the cell's value given in [`DataRow2.values`][(p).], the cell's
+    text, or `None` if the cell has custom content.
+    """
+    values = getattr(row, "values", None)
+    if values is None:
+        content = row.cells[column_index].content
+    else:
+        value = values[column_index] if column_index < len(values) else None
+        if not isinstance(value, ft.DataCell):
+            return value
+        content = value.content
+    if isinstance(content, ft.Text):
+        return content.value
+    if isinstance(content, str):
+        return content
+    return None
+
+
+def sort_key(value: Any, numeric: bool) -> tuple:
+    """
+    Turns a cell value into a key that compares with keys of any other value
+    of the same column. Empty values and, in numeric columns, values that
+    are not numbers sort last.
+    """
+    if value is None:
+        return (1, 0)
+    if numeric:
+        try:
+            return (0, float(value))
+        except (TypeError, ValueError):
+            return (1, 0)
+    return (0, str(value))
+
+
+def number_value(value: Any) -> Optional[Union[int, float]]:
+    """
+    Returns the number a cell value stands for, or `None` if it is empty,
+    not a number or NaN. Integers are returned as they are, so that sums
+    of them stay exact.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    number = sort_key(value, numeric=True)
+    if number[0] != 0 or number[1] != number[1]:
+        return None
+    return number[1]
@@ -0,0 +1,84 @@
+from collections.abc import Sequence
+from typing import Optional
+
+# distance between positions of consecutive rows, leaving room for
+# rows inserted between them later
+POSITION_GAP = 1 << 16
+
+
+def longest_increasing_subsequence(values: Sequence[int]) -> list[int]:
+    """
+    Returns indexes of a longest strictly increasing subsequence of `values`.
+
+    Runs in `O(n log n)` time.
+    """
+    tails: list[int] = []  # index of the smallest tail of each length
+    tail_values: list[int] = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        # binary search for the first tail not less than value
+        lo, hi = 0, len(tail_values)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tail_values[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            previous[i] = tails[lo - 1]
+        if lo == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[lo] = i
+            tail_values[lo] = value
+    result = []
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        result.append(i)
+        i = previous[i]
+    result.reverse()
+    return result
+
+
+def assign_positions(positions: Sequence[Optional[int]]) -> list[int]:
+    """
+    Computes positions for rows to be displayed in the given order.
+
+    `positions` holds the current position of each row in the new display
+    order, or `None` for new rows. The rows forming a longest increasing
+    sequence of current positions keep them, and only the remaining rows,
+    which were moved or added, get new positions placed between those of
+    their neighbours. If there is not enough room between neighbours,
+    all rows are numbered again.
+    """
+    kept = [i for i, p in enumerate(positions) if p is not None]
+    anchors = {
+        kept[i] for i in longest_increasing_subsequence([positions[i] for i in kept])
+    }
+
+    result: list[Optional[int]] = [None] * len(positions)
+    for i in anchors:
+        result[i] = positions[i]
+
+    start = 0
+    while start < len(positions):
+        if start in anchors:
+            start += 1
+            continue
+        stop = start
+        while stop < len(positions) and stop not in anchors:
+            stop += 1
+        count = stop - start
+        lo = result[start - 1] if start > 0 else None
+        hi = result[stop] if stop < len(positions) else None
+        if lo is None:
+            lo = 0 if hi is None else hi - (count + 1) * POSITION_GAP
+        if hi is None:
+            hi = lo + (count + 1) * POSITION_GAP
+        if hi - lo <= count:
+            return [(i + 1) * POSITION_GAP for i in range(len(positions))]
+        for j in range(count):
+            result[start + j] = lo + (hi - lo) * (j + 1) // (count + 1)
+        start = stop
+    return result
@@ -0,0 +1,119 @@
+from typing import TYPE_CHECKING, Any
+
+import flet as ft
+from flet.controls.object_patch import ObjectPatch
+from flet.messaging.protocol import ClientAction, ClientMessage, PatchControlBody
+
+if TYPE_CHECKING:
+    from flet.messaging.session import Session
+
+
+def send_patch(session: "Session", control: ft.BaseControl) -> list:
+    """
+    Sends the changes of a control and of its descendants to the client as
+    `Session.patch_control()` does, and returns the patch message sent, so
+    that it can be measured without intercepting the connection, which
+    other controls share.
+
+    The session must have a connection.
+    """
+    patch, added, removed = ObjectPatch.from_diff(
+        control, control, control_cls=ft.BaseControl
+    )
+    message = patch.to_message()
+    added_ids = {c._i for c in added}
+    removed_ids = {c._i for c in removed}
+    for c in removed:
+        if c._i not in added_ids:
+            c.will_unmount()
+        session.index.pop(c._i, None)
+    if len(message) > 1:
+        session.connection.send_message(
+            ClientMessage(
+                ClientAction.PATCH_CONTROL, PatchControlBody(control._i, message)
+            )
+        )
+    for c in added:
+        session.index[c._i] = c
+        if c._i not in removed_ids:
+            c.did_mount()
+    return message if len(message) > 1 else []
+
+
+def count_patch(patch: list) -> tuple[int, int]:
+    """
+    Returns the number of rows and of cells of a table added or changed
+    by a patch message of the table.
+
+    A patch message is a tree of the paths of changed objects, numbering
+    them, followed by operations on them as `[operation, node, key, value]`.
+    """
+    if not patch:
+        return 0, 0
+    tree, *operations = patch
+    # what each node is: the rows list, a row, a list of cells or cell
+    # values of a row, or a cell, along with the indexes of its row and cell
+    nodes: dict[int, tuple[Any, ...]] = {}
+
+    def walk(path: list, owner: tuple[Any, ...]):
+        node = path[0]
+        nodes[node] = owner
+        for key, child in (path[1] if len(path) > 1 else {}).items():
+            kind = owner[0]
+            if kind == "table":
+                walk(child, ("rows",) if key == "rows" else ("other",))
+            elif kind == "rows":
+                walk(child, ("row", key))
+            elif kind == "row":
+                if key in ("cells", "cell_values"):
+                    walk(child, ("cells", owner[1]))
+                else:
+                    walk(child, owner)
+            elif kind == "cells":
+                walk(child, ("cell", owner[1], key))
+            else:
+                walk(child, owner)
+
+    walk(tree, ("table",))
+    rows: set[Any] = set()
+    cells: set[Any] = set()
+    added_rows = added_cells = 0
+    for operation in operations:
+        if len(operation) < 3 or _operation_code(operation[0]) in _SKIPPED:
+            continue
+        owner = nodes.get(operation[1], ("other",))
+        kind, key = owner[0], operation[2]
+        value = operation[3] if len(operation) > 3 else None
+        if kind == "table" and key == "rows" and isinstance(value, list):
+            added_rows += len(value)
+            added_cells += sum(_cell_count(row) for row in value)
+        elif kind == "rows":
+            added_rows += 1
+            added_cells += _cell_count(value)
+        elif kind == "row":
+            rows.add(owner[1])
+            if key in ("cells", "cell_values") and isinstance(value, list):
+                cells.update((owner[1], i) for i in range(len(value)))
+        elif kind == "cells":
+            rows.add(owner[1])
+            cells.add((owner[1], key))
+        elif kind == "cell":
+            rows.add(owner[1])
+            cells.add((owner[1], owner[2]))
+    return len(rows) + added_rows, len(cells) + added_cells
+
+
+# codes of removals and moves, which send no row data, among operations
+# of flet patches, see flet.controls.object_patch.Operation
+_SKIPPED = (2, 3)
+
+
+def _operation_code(operation: Any) -> int:
+    return getattr(operation, "value", operation)
+
+
+def _cell_count(row: Any) -> int:
+    values = getattr(row, "values", None)
+    if values is not None:
+        return len(values)
+    return len(getattr(row, "cells", None) or ())
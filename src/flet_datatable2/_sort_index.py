@@ -0,0 +1,188 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Any, Callable, Optional
+
+import flet as ft
+
+SortKey = Callable[[ft.DataRow], Any]
+
+# a sort column: (column index, ascending, custom key function or None)
+SortColumn = tuple[int, bool, Optional[SortKey]]
+
+# number of orders kept, oldest first out
+_MAX_ORDERS = 32
+
+
+class SortIndex:
+    """
+    Caches sort keys, orders and ranks of table columns.
+
+    Keys are obtained from `extract_keys` once per column and reused by every
+    sort involving that column until the column is invalidated. Sorts by
+    multiple columns combine the cached ranks of each column rather than
+    comparing keys again.
+
+    The same keys back filters: the ascending order of a column serves as a
+    sorted index for range lookups and rows grouped by key as a hash index
+    for lookups of values.
+
+    Keys of a column are cached for its default keys and for a single
+    custom key function, the last one used, and only the last few orders
+    are kept, so that sorting with new key functions again and again
+    doesn't grow the cache. With default keys, empty cells sort last in
+    both directions.
+    """
+
+    def __init__(self, extract_keys: Callable[[int, Optional[SortKey]], Sequence]):
+        """
+        Args:
+            extract_keys: A function returning the sort keys of a column,
+                in row order, given the column index and a custom key function.
+        """
+        self._extract_keys = extract_keys
+        self._keys: dict[tuple[int, Optional[SortKey]], Sequence] = {}
+        self._ranks: dict[tuple[int, Optional[SortKey]], tuple[list[int], int]] = {}
+        self._orders: dict[tuple[SortColumn, ...], list[int]] = {}
+        self._groups: dict[int, dict[Any, list[int]]] = {}
+
+    def clear(self):
+        """
+        Drops all cached keys, e.g. after rows were added or removed.
+        """
+        self._keys.clear()
+        self._ranks.clear()
+        self._orders.clear()
+        self._groups.clear()
+
+    def invalidate(self, column_index: int):
+        """
+        Drops cached keys of a single column and orders depending on it.
+        """
+        for cache in (self._keys, self._ranks):
+            for cache_key in [k for k in cache if k[0] == column_index]:
+                del cache[cache_key]
+        for spec in [s for s in self._orders if any(c[0] == column_index for c in s)]:
+            del self._orders[spec]
+        self._groups.pop(column_index, None)
+
+    def keys(self, column_index: int, key: Optional[SortKey] = None) -> Sequence:
+        """
+        Returns the sort keys of a column, in row order.
+        """
+        cache_key = (column_index, key)
+        keys = self._keys.get(cache_key)
+        if keys is None:
+            if key is not None:
+                self._forget_custom_keys(column_index)
+            keys = self._keys[cache_key] = self._extract_keys(column_index, key)
+        return keys
+
+    def _forget_custom_keys(self, column_index: int):
+        # drops what was cached for another key function of the column
+        for cache in (self._keys, self._ranks):
+            for cache_key in [
+                k for k in cache if k[0] == column_index and k[1] is not None
+            ]:
+                del cache[cache_key]
+        for spec in [
+            s
+            for s in self._orders
+            if any(c[0] == column_index and c[2] is not None for c in s)
+        ]:
+            del self._orders[spec]
+
+    def ranks(
+        self, column_index: int, key: Optional[SortKey] = None
+    ) -> tuple[list[int], int]:
+        """
+        Returns the dense rank of each row's key within a column, in row order,
+        and the number of distinct keys.
+        """
+        cache_key = (column_index, key)
+        ranks = self._ranks.get(cache_key)
+        if ranks is None:
+            keys = self.keys(column_index, key)
+            result = [0] * len(keys)
+            rank = -1
+            previous = None
+            for i in self.order(((column_index, True, key),)):
+                k = keys[i]
+                if rank < 0 or k != previous:
+                    rank += 1
+                    previous = k
+                result[i] = rank
+            ranks = self._ranks[cache_key] = (result, rank + 1)
+        return ranks
+
+    def order(self, spec: Sequence[SortColumn]) -> list[int]:
+        """
+        Returns row indexes sorted by one or more columns. The sort is stable.
+        """
+        spec = tuple(spec)
+        order = self._orders.get(spec)
+        if order is not None:
+            return order
+        if len(spec) == 1:
+            column_index, ascending, key = spec[0]
+            keys = self.keys(column_index, key)
+            order = sorted(
+                range(len(keys)), key=keys.__getitem__, reverse=not ascending
+            )
+            if not ascending and key is None:
+                # empty cells, sorted first by the reversed sort, go last
+                empty = _empty_count(keys)
+                order = order[empty:] + order[:empty]
+        else:
+            # ranks of all columns are packed into a single integer per row,
+            # so rows are compared once, as plain integers
+            combined = None
+            for column_index, ascending, key in spec:
+                ranks, count = self.ranks(column_index, key)
+                if not ascending:
+                    # empty cells have the last rank, which they keep
+                    last = count
+                    if key is None and _empty_count(self.keys(column_index)):
+                        last = count - 1
+                    ranks = [r if r == last else last - 1 - r for r in ranks]
+                combined = (
+                    ranks
+                    if combined is None
+                    else [c * count + r for c, r in zip(combined, ranks)]
+                )
+            order = sorted(range(len(combined)), key=combined.__getitem__)
+        self._orders[spec] = order
+        if len(self._orders) > _MAX_ORDERS:
+            del self._orders[next(iter(self._orders))]
+        return order
+
+    def range(self, column_index: int, low: Any = None, high: Any = None) -> list[int]:
+        """
+        Returns indexes of rows whose keys are between `low` and `high`,
+        inclusive, found by binary search in the column's sorted order.
+        `None` leaves a bound open.
+        """
+        order = self.order(((column_index, True, None),))
+        keys = self.keys(column_index).__getitem__
+        start = 0 if low is None else bisect_left(order, low, key=keys)
+        stop = len(order) if high is None else bisect_right(order, high, key=keys)
+        return order[start:stop]
+
+    def lookup(self, column_index: int, values: Sequence) -> list[int]:
+        """
+        Returns indexes of rows whose keys are among `values`.
+        """
+        groups = self._groups.get(column_index)
+        if groups is None:
+            groups = self._groups[column_index] = {}
+            for i, k in enumerate(self.keys(column_index)):
+                groups.setdefault(k, []).append(i)
+        rows = []
+        for value in dict.fromkeys(values):
+            rows.extend(groups.get(value, ()))
+        return rows
+
+
+def _empty_count(keys: Sequence) -> int:
+    # number of empty cells among keys made by `sort_key()`; other default
+    # keys, e.g. plain numbers, have none
+    return sum(1 for k in keys if isinstance(k, tuple) and k[0])
@@ -0,0 +1,190 @@
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Sequence
+from operator import is_
+from typing import Callable, Optional, Union
+
+import flet as ft
+
+from flet_datatable2._cells import cell_value, number_value
+from flet_datatable2.datacolumn2 import ColumnSummary
+
+Number = Union[int, float]
+
+# values per block of a `SortedValues`, which splits blocks twice as large
+_BLOCK_SIZE = 512
+
+
+class SortedValues:
+    """
+    A sorted list of numbers, split into blocks of up to
+    `2 * _BLOCK_SIZE` values.
+
+    Adding or removing a value is a binary search over the last value of
+    each block, then within a block, and moves the following values of
+    that block only, instead of those of the whole list.
+    """
+
+    __slots__ = ("_blocks", "_maxes")
+
+    def __init__(self):
+        self._blocks: list[list[Number]] = []
+        # last value of each block
+        self._maxes: list[Number] = []
+
+    def add(self, value: Number):
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+        i = min(bisect_left(self._maxes, value), len(self._maxes) - 1)
+        block = self._blocks[i]
+        insort(block, value)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * _BLOCK_SIZE:
+            self._blocks[i : i + 1] = [block[:_BLOCK_SIZE], block[_BLOCK_SIZE:]]
+            self._maxes[i : i + 1] = [block[_BLOCK_SIZE - 1], block[-1]]
+
+    def remove(self, value: Number):
+        i = bisect_left(self._maxes, value)
+        block = self._blocks[i]
+        del block[bisect_left(block, value)]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+
+    def min(self) -> Number:
+        return self._blocks[0][0]
+
+    def max(self) -> Number:
+        return self._blocks[-1][-1]
+
+
+class ColumnStats:
+    """
+    Running statistics of the values of a column.
+
+    Values are added and removed one at a time, each in constant time,
+    except for columns keeping their minimum and maximum, which keep their
+    values in a `SortedValues`: adding or removing a value is then
+    a binary search and a move of the following values of a block, so that
+    removing the current minimum or maximum never requires a scan of the
+    remaining values.
+    """
+
+    __slots__ = ("count", "total", "_sorted")
+
+    def __init__(self, ordered: bool):
+        """
+        Args:
+            ordered: Whether to keep values sorted, for the minimum and
+                maximum.
+        """
+        self.count = 0
+        self.total: Number = 0
+        self._sorted: Optional[SortedValues] = SortedValues() if ordered else None
+
+    def add(self, value: Number):
+        self.count += 1
+        self.total += value
+        if self._sorted is not None:
+            self._sorted.add(value)
+
+    def remove(self, value: Number):
+        self.count -= 1
+        self.total -= value
+        if self._sorted is not None:
+            self._sorted.remove(value)
+        if not self.count:
+            # drop the rounding errors accumulated by float sums
+            self.total = 0
+
+    def value(self, summary: ColumnSummary) -> Optional[Number]:
+        if summary == "sum":
+            return self.total
+        if summary == "count":
+            return self.count
+        if not self.count:
+            return None
+        if summary == "mean":
+            return self.total / self.count
+        return self._sorted.min() if summary == "min" else self._sorted.max()
+
+
+class Summaries:
+    """
+    Summaries of columns of a list of rows, maintained incrementally.
+
+    The values each row contributes to the summaries are remembered by row
+    id, so that added and removed rows, found by comparing the list with
+    the previous one, and rows whose values changed only adjust the
+    summaries by their own values.
+    """
+
+    def __init__(self, summaries: Sequence[tuple[int, ColumnSummary]]):
+        """
+        Args:
+            summaries: Summarized columns, as `(column_index, summary)` pairs.
+        """
+        self.summaries = tuple(summaries)
+        self._stats = [
+            ColumnStats(ordered=summary in ("min", "max"))
+            for _, summary in self.summaries
+        ]
+        self._rows: list[ft.DataRow] = []
+        # values each row contributes, by row id
+        self._contributions: dict[int, tuple[Optional[Number], ...]] = {}
+
+    def values(self) -> tuple[Optional[Number], ...]:
+        return tuple(
+            stats.value(summary)
+            for stats, (_, summary) in zip(self._stats, self.summaries)
+        )
+
+    def sync(self, rows: list[ft.DataRow]):
+        """
+        Adjusts summaries to rows added to or removed from `rows`.
+        """
+        previous = self._rows
+        if len(rows) == len(previous) and all(map(is_, rows, previous)):
+            return
+        self._rows = rows[:]
+        current = {id(row): row for row in rows}
+        for row_id in [i for i in self._contributions if i not in current]:
+            self._apply(self._contributions.pop(row_id), ColumnStats.remove)
+        for row_id, row in current.items():
+            if row_id not in self._contributions:
+                contribution = self._contribution(row)
+                self._contributions[row_id] = contribution
+                self._apply(contribution, ColumnStats.add)
+
+    def update_rows(self, rows: Iterable[ft.DataRow]):
+        """
+        Adjusts summaries to changed values of rows.
+        """
+        for row in rows:
+            previous = self._contributions.get(id(row))
+            if previous is None:
+                continue
+            contribution = self._contribution(row)
+            if contribution != previous:
+                self._apply(previous, ColumnStats.remove)
+                self._apply(contribution, ColumnStats.add)
+                self._contributions[id(row)] = contribution
+
+    def _contribution(self, row: ft.DataRow) -> tuple[Optional[Number], ...]:
+        # the number a row adds to each summary, or None if it adds nothing
+        contribution = []
+        for column_index, summary in self.summaries:
+            value = cell_value(row, column_index)
+            if summary == "count":
+                contribution.append(None if value is None or value == "" else 1)
+            else:
+                contribution.append(number_value(value))
+        return tuple(contribution)
+
+    def _apply(self, contribution: tuple, apply: Callable[[ColumnStats, Number], None]):
+        for stats, value in zip(self._stats, contribution):
+            if value is not None:
+                apply(stats, value)
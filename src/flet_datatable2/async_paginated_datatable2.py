@@ -0,0 +1,313 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+import flet as ft
+
+from flet_datatable2.datacolumn2 import DataColumn2
+
+__all__ = ["AsyncPaginatedDataTable2", "PageResult"]
+
+
+@dataclass
+class PageResult:
+    """
+    A page of rows returned by [`AsyncPaginatedDataTable2.fetch_page`][(p).].
+    """
+
+    rows: list[ft.DataRow]
+    """
+    Rows of the page, at most as many as were requested.
+    """
+
+    total: int
+    """
+    Total number of rows available across all pages.
+    """
+
+
+@ft.control("AsyncPage2")
+class _PageResponse(ft.Control):
+    # answer to page requests of the client, sent to it; requests served
+    # the same cached page share a response, so that its rows are only ever
+    # attached to one response
+    request_ids: list[int] = field(default_factory=list)
+    rows: list[ft.DataRow] = field(default_factory=list)
+    total: int = 0
+    error: Optional[str] = None
+
+
+@ft.control("AsyncPaginatedDataTable2")
+class AsyncPaginatedDataTable2(ft.LayoutControl):
+    """
+    A paginated table, like [`DataTable2`][(p).], whose pages are fetched
+    asynchronously.
+
+    Pages are requested from [`fetch_page`][(c).] as the user pages through
+    the table. Fetched pages are kept in a bounded LRU cache, so that paging
+    back and forth does not fetch them again, and the page following the
+    current one is prefetched in the background.
+    """
+
+    columns: list[Union[DataColumn2, ft.DataColumn]]
+    """
+    A list of table columns.
+    """
+
+    fetch_page: Optional[
+        Callable[[int, int, Optional[tuple[int, bool]], Any], Awaitable[PageResult]]
+    ] = field(default=None, metadata={"skip": True})
+    """
+    An async function fetching a page of rows.
+
+    It is called with the zero-based index of the first row of the page,
+    the number of rows to fetch, the current sorting as
+    `(sort_column_index, sort_ascending)` tuple (or `None` if the table isn't
+    sorted) and the current [`page_filter`][(c).]. Different pages
+    must not share row instances.
+    """
+
+    page_filter: Any = field(default=None, metadata={"skip": True})
+    """
+    An arbitrary hashable value passed to [`fetch_page`][(c).].
+
+    Call [`refresh()`][(c).] after changing it.
+    """
+
+    rows_per_page: int = 10
+    """
+    Number of rows shown on each page.
+    """
+
+    available_rows_per_page: list[int] = field(
+        default_factory=lambda: [10, 20, 50, 100]
+    )
+    """
+    Options offered for [`rows_per_page`][(c).] in the page size dropdown.
+    """
+
+    page_cache_size: int = 16
+    """
+    Maximum number of fetched pages kept in the cache.
+    """
+
+    prefetch_next_page: bool = True
+    """
+    Whether to fetch the page following the current one in the background.
+    """
+
+    show_first_last_buttons: bool = False
+    """
+    Whether to show buttons jumping to the first and last page.
+    """
+
+    wrap_in_card: bool = True
+    """
+    Whether the table and its paginator are wrapped in a `Card`.
+    """
+
+    sort_column_index: Optional[int] = None
+    """
+    Index of the column the table is sorted by, passed to
+    [`fetch_page`][(c).]. Changing it fetches the current page again.
+    """
+
+    sort_ascending: bool = False
+    """
+    Whether the column at [`sort_column_index`][(c).] is sorted in
+    ascending order.
+    """
+
+    show_checkbox_column: bool = False
+    """
+    Whether to show a checkbox at the beginning of selectable rows.
+    """
+
+    empty: Optional[ft.Control] = None
+    """
+    Placeholder control shown when there are no data rows.
+    """
+
+    min_width: Optional[ft.Number] = None
+    """
+    Minimum table width before horizontal scrolling kicks in.
+    """
+
+    data_row_height: Optional[ft.Number] = None
+    """
+    Height of each data row.
+    """
+
+    heading_row_height: Optional[ft.Number] = None
+    """
+    Height of the heading row.
+    """
+
+    heading_row_color: Optional[ft.ControlStateValue[ft.ColorValue]] = None
+    """
+    Background color of the heading row.
+    """
+
+    horizontal_margin: Optional[ft.Number] = None
+    """
+    Horizontal margin between the edges of the table and the content of
+    the first and last cells of each row.
+    """
+
+    column_spacing: Optional[ft.Number] = None
+    """
+    Horizontal margin between the contents of each data column.
+    """
+
+    checkbox_horizontal_margin: Optional[ft.Number] = None
+    """
+    Horizontal margin around the checkbox, if it is displayed.
+    """
+
+    fixed_left_columns: int = 0
+    """
+    Number of sticky columns on the left. Includes checkbox column, if present.
+    """
+
+    fixed_top_rows: int = 1
+    """
+    Number of sticky rows from the top. Includes heading row by default.
+    """
+
+    lm_ratio: ft.Number = 1.2
+    """
+    Ratio of Large column width to Medium.
+    """
+
+    sm_ratio: ft.Number = 0.67
+    """
+    Ratio of Small column width to Medium.
+    """
+
+    sort_arrow_icon: ft.IconValue = ft.Icons.ARROW_UPWARD
+    """
+    Icon shown when sorting is applied.
+    """
+
+    sort_arrow_animation_duration: ft.DurationValue = field(
+        default_factory=lambda: ft.Duration(milliseconds=150)
+    )
+    """
+    Duration of sort arrow animation.
+    """
+
+    visible_horizontal_scroll_bar: Optional[bool] = None
+    """
+    Determines visibility of the horizontal scrollbar.
+    """
+
+    visible_vertical_scroll_bar: Optional[bool] = None
+    """
+    Determines visibility of the vertical scrollbar.
+    """
+
+    on_page_change: Optional[ft.ControlEventHandler["AsyncPaginatedDataTable2"]] = None
+    """
+    Fires when the user switches to another page.
+
+    Event's `data` contains the index of the first row of the new page.
+    """
+
+    on_select_all: Optional[ft.ControlEventHandler["AsyncPaginatedDataTable2"]] = None
+    """
+    Fires when the user selects or unselects every row, using the checkbox
+    in the heading row.
+    """
+
+    # answers to the page requests the client awaits, sent to it, so that
+    # concurrent requests are all answered
+    pages: list[_PageResponse] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    def init(self):
+        super().init()
+        self._pages: OrderedDict[tuple, asyncio.Task] = OrderedDict()
+        # ids of the page requests the client awaits
+        self._awaited: set[int] = set()
+
+    async def refresh(self):
+        """
+        Drops all cached pages and fetches the current page again.
+        """
+        self._pages.clear()
+        await self._invoke_method("refresh")
+
+    async def _trigger_event(self, event_name: str, event_data: Any):
+        if event_name == "fetch_page":
+            # answers to requests the client no longer awaits can be dropped
+            self._awaited = {*event_data.get("pending", ()), event_data["id"]}
+            await self._serve_page(
+                event_data["id"], event_data["start"], event_data["count"]
+            )
+            return
+        await super()._trigger_event(event_name, event_data)
+
+    async def _serve_page(self, request_id: int, start: int, count: int):
+        response = _PageResponse(request_ids=[request_id])
+        page = None
+        try:
+            page = await self._get_page(start, count)
+        except Exception as e:
+            response.error = str(e) or type(e).__name__
+        else:
+            response.rows = page.rows
+            response.total = page.total
+            if self.prefetch_next_page and start + count < page.total:
+                self._get_page(start + count, count)
+
+        pages = []
+        for p in self.pages:
+            awaited = [i for i in p.request_ids if i in self._awaited]
+            if not awaited:
+                continue
+            if page is not None and p.rows is page.rows:
+                # the page is already sent: its rows mustn't get a second parent
+                awaited.append(request_id)
+                response = None
+            if awaited != p.request_ids:
+                p.request_ids = awaited
+            pages.append(p)
+        if response is not None:
+            pages.append(response)
+        self.pages = pages
+        self.update()
+
+    def _get_page(self, start: int, count: int) -> asyncio.Task:
+        if self.fetch_page is None:
+            raise ValueError("fetch_page must be set")
+        sort = (
+            (self.sort_column_index, self.sort_ascending)
+            if self.sort_column_index is not None
+            else None
+        )
+        key = (start, count, sort, self.page_filter)
+
+        task = self._pages.get(key)
+        if task is not None and not _failed(task):
+            self._pages.move_to_end(key)
+            return task
+
+        # in-flight fetches are cached too, so that a page being prefetched
+        # is awaited rather than fetched again when it gets requested
+        task = asyncio.create_task(
+            self.fetch_page(start, count, sort, self.page_filter)
+        )
+        task.add_done_callback(_failed)
+        self._pages[key] = task
+        while len(self._pages) > self.page_cache_size:
+            self._pages.popitem(last=False)
+        return task
+
+
+def _failed(task: asyncio.Task) -> bool:
+    # retrieving the exception also keeps asyncio from reporting
+    # failed prefetches as never retrieved
+    return task.done() and (task.cancelled() or task.exception() is not None)
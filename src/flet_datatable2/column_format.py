@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+__all__ = ["ColumnFormat", "ColumnFormatType"]
+
+
+class ColumnFormatType(Enum):
+    """
+    Kind of values formatted by a [`ColumnFormat`][(p).].
+    """
+
+    NUMBER = "number"
+    """
+    Numbers, with grouping separators by default.
+    """
+
+    PERCENT = "percent"
+    """
+    Fractions shown as percentages, e.g. `0.25` as `25%`.
+    """
+
+    CURRENCY = "currency"
+    """
+    Amounts of money, with a currency symbol.
+    """
+
+    DATE = "date"
+    """
+    Dates and times, given as `datetime.date` or `datetime.datetime`
+    values, or as numbers of milliseconds since the Unix epoch.
+    """
+
+
+@dataclass
+class ColumnFormat:
+    """
+    Formats the plain values of a column on the client.
+
+    Assigned to [`DataColumn2.format`][(p).], it lets rows send raw numbers
+    and dates in [`DataRow2.values`][(p).] rather than text formatted in
+    Python: the client compiles the format once per column and applies it
+    to each value as its cell is built, following the conventions of the
+    given locale:
+
+    ```python
+    DataColumn2(label="Price", numeric=True, format=ColumnFormat(
+        ColumnFormatType.CURRENCY, currency_symbol="€", decimal_digits=2
+    ))
+    DataColumn2(label="Date", format=ColumnFormat(ColumnFormatType.DATE, "yyyy-MM-dd"))
+    ```
+
+    Values the format doesn't apply to, e.g. text in a numeric column,
+    are shown as they are.
+    """
+
+    type: ColumnFormatType = ColumnFormatType.NUMBER
+    """
+    Kind of values to format.
+    """
+
+    pattern: Optional[str] = None
+    """
+    An ICU pattern, e.g. `"#,##0.00"` for numbers or `"yyyy-MM-dd HH:mm"`
+    for dates. Defaults to the locale's standard pattern for the
+    [`type`][(c).].
+    """
+
+    decimal_digits: Optional[int] = None
+    """
+    Number of decimal digits of numbers, percentages and amounts.
+    Ignored if [`pattern`][(c).] is set.
+    """
+
+    currency_symbol: Optional[str] = None
+    """
+    Symbol of [`CURRENCY`][(p).ColumnFormatType.] amounts. Defaults to
+    the symbol of the locale's currency.
+    """
+
+    locale: Optional[str] = None
+    """
+    Locale whose conventions to follow, e.g. `"de_DE"`. Defaults to
+    the client's locale.
+    """
@@ -1,9 +1,13 @@
 from enum import Enum
-from typing import Optional
+from typing import Literal, Optional
 
 import flet as ft
 
-__all__ = ["DataColumn2", "DataColumnSize"]
+from flet_datatable2.column_format import ColumnFormat
+
+__all__ = ["ColumnSummary", "DataColumn2", "DataColumnSize"]
+
+ColumnSummary = Literal["sum", "min", "max", "mean", "count"]
 
 
 class DataColumnSize(Enum):
@@ -42,3 +46,24 @@ class DataColumn2(ft.DataColumn):
     Column sizes are determined based on available width by distributing
     it to individual columns accounting for their relative sizes.
     """
+
+    format: Optional[ColumnFormat] = None
+    """
+    Format of the column's plain values, given in
+    [`DataRow2.values`][(p).], applied by the client.
+
+    Rows can then send numbers and dates as they are, rather than text
+    formatted in Python. Also applies to the column's
+    [`summary`][(c).], unless it's a count.
+    """
+
+    summary: Optional[ColumnSummary] = None
+    """
+    Statistic of the column's values shown under the column, in a footer
+    row fixed at the bottom of a [`DataTable2`][(p).]: the `"sum"`,
+    `"min"`, `"max"` or `"mean"` of its numeric values, or the `"count"`
+    of its non-empty values.
+
+    Statistics are maintained incrementally as rows are added, removed or
+    updated. See [`DataTable2.update_summaries()`][(p).].
+    """
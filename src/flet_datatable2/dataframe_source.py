@@ -0,0 +1,220 @@
+import datetime
+from collections.abc import Hashable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+import flet as ft
+
+from flet_datatable2.datacolumn2 import DataColumn2, DataColumnSize
+from flet_datatable2.datarow2 import CellValue, DataRow2
+from flet_datatable2.datasource import DataTable2Source
+from flet_datatable2.filters import RangeFilter, RowFilter
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+__all__ = ["DataFrameSource"]
+
+# longest typical text length, in characters, of S and M columns
+_SIZE_HINTS = ((8, DataColumnSize.S), (24, DataColumnSize.M))
+
+# number of values sampled to estimate the width of a column
+_SIZE_SAMPLE = 100
+
+
+class DataFrameSource(DataTable2Source):
+    """
+    A data source reading rows from a [pandas](https://pandas.pydata.org)
+    `DataFrame`, including frames backed by Arrow data.
+
+    The source keeps a reference to the frame rather than copying its data:
+    [`DataRow2`][(p).]s are only created for the window of rows rendered
+    by the table, from the values of that window. Sorting and filtering
+    are delegated to vectorized operations of the frame and only produce
+    the resulting row positions.
+
+    Columns are derived from the frame's columns: columns with a numeric
+    dtype are [numeric][flet.DataColumn.numeric] and the
+    [`size`][(p).DataColumn2.] of each column is estimated from the length
+    of its name and of a sample of its values, unless given explicitly:
+
+    ```python
+    source = DataFrameSource(df, formatters={"price": lambda v: f"${v:,.2f}"})
+    table = DataTable2(columns=source.columns, source=source)
+    ```
+
+    See also [`DataTable2.from_dataframe()`][(p).].
+
+    Note:
+        Sorting and filtering are computed when applied. Apply them again
+        after modifying the frame in place, then call
+        [`DataTable2.refresh_source()`][(p).].
+    """
+
+    def __init__(
+        self,
+        df: "pd.DataFrame",
+        column_sizes: Optional[
+            Mapping[Hashable, Union[DataColumnSize, ft.Number]]
+        ] = None,
+        formatters: Optional[Mapping[Hashable, Callable[[Any], CellValue]]] = None,
+    ):
+        """
+        Args:
+            df: The frame to read rows from.
+            column_sizes: Sizes of columns, by column name, given either as
+                a [`DataColumnSize`][(p).] or as a fixed width in pixels.
+                Sizes of other columns are estimated.
+            formatters: Functions turning values into the text, or plain
+                value, shown in cells, by column name. Missing values are
+                passed to formatters as well. Values of other columns are
+                shown as they are, and missing values as empty cells.
+        """
+        self.df = df
+        self.formatters = dict(formatters or {})
+        column_sizes = column_sizes or {}
+        self.columns = [
+            _build_column(df.iloc[:, i], name, column_sizes.get(name))
+            for i, name in enumerate(df.columns)
+        ]
+        self._sort_order: Optional[np.ndarray] = None
+        self._visible: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+
+    @property
+    def row_count(self) -> int:
+        if self._order is not None:
+            return len(self._order)
+        return len(self.df)
+
+    def get_rows(self, start: int, count: int) -> list[DataRow2]:
+        if self._order is not None:
+            window = self.df.take(self._order[start : start + count])
+        else:
+            window = self.df.iloc[start : start + count]
+        columns = [
+            self._cell_values(name, window.iloc[:, i])
+            for i, name in enumerate(window.columns)
+        ]
+        return [DataRow2(values=list(values)) for values in zip(*columns)]
+
+    def _cell_values(self, name: Hashable, series: "pd.Series") -> list[CellValue]:
+        formatter = self.formatters.get(name)
+        if formatter is not None:
+            return [formatter(v) for v in series.tolist()]
+        return [
+            None if missing else _plain_value(v)
+            for v, missing in zip(series.tolist(), series.isna().tolist())
+        ]
+
+    def sort(self, column_index: int, ascending: bool):
+        """
+        Sorts the rows by a column with a stable, vectorized sort.
+        Missing values go last.
+        """
+        self.sort_by_columns([(column_index, ascending)])
+
+    def sort_by_columns(self, columns: Sequence[tuple[int, bool]]):
+        """
+        Sorts the rows by multiple columns with a stable, vectorized sort.
+        Missing values go last.
+        """
+        import pandas as pd
+
+        # the sorted columns, indexed by position rather than by label
+        keys = pd.DataFrame(
+            {
+                i: self.df.iloc[:, ci].reset_index(drop=True)
+                for i, (ci, _) in enumerate(columns)
+            }
+        )
+        self._sort_order = keys.sort_values(
+            list(keys.columns),
+            ascending=[ascending for _, ascending in columns],
+            kind="stable",
+            na_position="last",
+        ).index.to_numpy()
+        self._update_order()
+
+    def filter(self, filters: Sequence[RowFilter]):
+        """
+        Keeps rows matching all `filters`, evaluated as vectorized
+        comparisons of the filtered columns.
+        """
+        import numpy as np
+
+        if not filters:
+            self._visible = None
+            self._update_order()
+            return
+        mask = np.ones(len(self.df), dtype=bool)
+        for f in filters:
+            column = self.df.iloc[:, f.column_index]
+            if isinstance(f, RangeFilter):
+                matches = column.notna()
+                if f.min is not None:
+                    matches &= column >= f.min
+                if f.max is not None:
+                    matches &= column <= f.max
+            else:
+                values = list(f.values)
+                matches = column.isin([v for v in values if v is not None])
+                if None in values:
+                    matches |= column.isna()
+            # comparisons of nullable dtypes leave missing values undecided
+            mask &= matches.fillna(False).to_numpy(dtype=bool)
+        self._visible = mask
+        self._update_order()
+
+    def _update_order(self):
+        import numpy as np
+
+        if self._visible is None:
+            self._order = self._sort_order
+        elif self._sort_order is None:
+            self._order = np.flatnonzero(self._visible)
+        else:
+            self._order = self._sort_order[self._visible[self._sort_order]]
+
+
+def _build_column(
+    series: "pd.Series",
+    name: Hashable,
+    size: Optional[Union[DataColumnSize, ft.Number]],
+) -> DataColumn2:
+    from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+    dtype = series.dtype
+    column = DataColumn2(
+        label=str(name),
+        numeric=is_numeric_dtype(dtype) and not is_bool_dtype(dtype),
+    )
+    if isinstance(size, DataColumnSize):
+        column.size = size
+    elif size is not None:
+        column.fixed_width = size
+    else:
+        column.size = _estimate_size(series, str(name))
+    return column
+
+
+def _estimate_size(series: "pd.Series", label: str) -> DataColumnSize:
+    sample = series.head(_SIZE_SAMPLE).dropna()
+    width = len(label)
+    if len(sample):
+        width = max(width, int(sample.astype(str).str.len().quantile(0.9)))
+    for limit, size in _SIZE_HINTS:
+        if width <= limit:
+            return size
+    return DataColumnSize.L
+
+
+def _plain_value(value: Any) -> CellValue:
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime.date):
+        # pandas Timestamps are sent as the datetimes they extend, so that
+        # they can be formatted by the client
+        to_pydatetime = getattr(value, "to_pydatetime", None)
+        return to_pydatetime() if to_pydatetime is not None else value
+    return str(value)
@@ -1,8 +1,13 @@
-from typing import Optional
+import datetime
+from dataclasses import field
+from operator import is_
+from typing import Optional, Union
 
 import flet as ft
 
-__all__ = ["DataRow2"]
+__all__ = ["CellValue", "DataRow2"]
+
+CellValue = Union[str, int, float, bool, datetime.date, None]
 
 
 @ft.control("DataRow2")
@@ -23,6 +28,30 @@ class DataRow2(ft.DataRow):
         If provided, [`DataTable2.divider_thickness`][(p).] has no effect.
     """
 
+    values: Optional[list[Union[CellValue, ft.DataCell]]] = field(
+        default=None, metadata={"skip": True}
+    )
+    """
+    Values of the row's cells, a compact alternative to
+    [`cells`][flet.DataRow.cells].
+
+    Plain values (`str`, `int`, `float`, `bool`, `datetime.date`,
+    `datetime.datetime` or `None`) are sent as they are and rendered as text
+    by the client, formatted with the [`format`][(p).DataColumn2.] of their
+    column, if any, without a [`DataCell`][flet.DataCell] and
+    a [`Text`][flet.Text] control per cell, which makes rows several times
+    cheaper to send and to decode. Cells that need custom content are given
+    as `DataCell`s, at their position among the values:
+
+    ```python
+    DataRow2(values=["Alice", 42, ft.DataCell(ft.Icon(ft.Icons.CHECK))])
+    ```
+
+    Note:
+        When set, [`cells`][flet.DataRow.cells] is managed by the row and
+        holds the `DataCell`s found in `values`.
+    """
+
     specific_row_height: Optional[ft.Number] = None
     """
     Specific row height. 
@@ -82,3 +111,61 @@ class DataRow2(ft.DataRow):
         [`on_tap_down`][flet.DataCell.on_tap_down]) set.
     """
 
+    # plain cell values, with None in place of DataCells from `values`,
+    # and positions of those DataCells, sent to the client
+    cell_values: Optional[list[CellValue]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    cell_indexes: Optional[tuple[int, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # display position assigned by DataTable2.set_rows(), sent to the client
+    order_key: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def update(self):
+        # deferred while the table is in a DataTable2.batch()
+        table = self.parent
+        if getattr(table, "_batch_depth", 0) > 0:
+            table._batched_updates += 1
+            return
+        super().update()
+
+    def before_update(self):
+        # `values` is never sent, so its changes mustn't end up in patches
+        changes = getattr(self, "__changes", None)
+        if changes:
+            changes.pop("values", None)
+        if self.values is None:
+            self.cell_values = None
+            self.cell_indexes = None
+            super().before_update()
+            return
+
+        # DataRow's own check requires visible cells, which plain values aren't
+        super(ft.DataRow, self).before_update()
+        if not self.values:
+            raise ValueError("values must contain at least one value")
+        plain = []
+        cells = []
+        indexes = []
+        for i, value in enumerate(self.values):
+            if isinstance(value, ft.DataCell):
+                plain.append(None)
+                cells.append(value)
+                indexes.append(i)
+            elif value is None or isinstance(
+                value, (str, int, float, bool, datetime.date)
+            ):
+                plain.append(value)
+            else:
+                raise TypeError(
+                    f"invalid cell value {value!r}, expected str, int, float, "
+                    "bool, date, datetime, None or DataCell"
+                )
+        self.cell_values = plain
+        self.cell_indexes = tuple(indexes) or None
+        if len(cells) != len(self.cells) or not all(map(is_, cells, self.cells)):
+            self.cells = cells
@@ -0,0 +1,89 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from flet_datatable2.datarow2 import DataRow2
+from flet_datatable2.filters import RowFilter
+
+__all__ = ["DataTable2Source"]
+
+
+class DataTable2Source(ABC):
+    """
+    Base class for data sources that feed rows to a [`DataTable2`][(p).] on demand.
+
+    A table bound to a source via [`DataTable2.source`][(p).] only materializes
+    the window of rows around its viewport, requesting further windows as it
+    is scrolled. This keeps Python memory usage and the size of updates sent
+    to the client independent of the total number of rows.
+    """
+
+    @property
+    @abstractmethod
+    def row_count(self) -> int:
+        """
+        Total number of rows available in this source.
+        """
+
+    @abstractmethod
+    def get_rows(self, start: int, count: int) -> list[DataRow2]:
+        """
+        Returns up to `count` rows, starting at the zero-based index `start`.
+
+        Called by the table whenever the window of visible rows moves.
+        Rows that remain within the window are reused by the table, so
+        this method is only asked for rows that are not loaded yet.
+        """
+
+    def sort(self, column_index: int, ascending: bool):
+        """
+        Sorts the rows of this source by a column.
+
+        Called by [`DataTable2.sort_by()`][(p).]. Subsequent calls to
+        [`get_rows()`][(c).] must return rows in the new order.
+
+        Raises:
+            NotImplementedError: If the source doesn't support sorting.
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't support sorting")
+
+    def sort_by_columns(self, columns: Sequence[tuple[int, bool]]):
+        """
+        Sorts the rows of this source by multiple columns.
+
+        Called by [`DataTable2.sort_by_columns()`][(p).] with
+        `(column_index, ascending)` pairs, most significant first.
+        Defaults to calling [`sort()`][(c).] when sorting by a single column.
+
+        Raises:
+            NotImplementedError: If the source doesn't support sorting
+                by multiple columns.
+        """
+        if len(columns) == 1:
+            self.sort(*columns[0])
+            return
+        raise NotImplementedError(
+            f"{type(self).__name__} doesn't support sorting by multiple columns"
+        )
+
+    def refresh(self):
+        """
+        Drops whatever this source caches about its rows, such as their
+        number, so that it's read again.
+
+        Called by [`DataTable2.refresh_source()`][(p).] after the data of
+        the source has changed. Does nothing by default.
+        """
+        return
+
+    def filter(self, filters: Sequence[RowFilter]):
+        """
+        Restricts the rows of this source to those matching all `filters`.
+
+        Called by [`DataTable2.filter()`][(p).]. Subsequent calls to
+        [`get_rows()`][(c).] and [`row_count`][(c).] must only account for
+        matching rows. An empty sequence of filters removes filtering.
+
+        Raises:
+            NotImplementedError: If the source doesn't support filtering.
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't support filtering")
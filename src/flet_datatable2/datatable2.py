@@ -1,12 +1,143 @@
-from dataclasses import field
-from typing import Optional, Union
+import asyncio
+import dataclasses
+import functools
+import threading
+import time
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Generator,
+    Hashable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from operator import is_
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union, get_args
 
 import flet as ft
 
-from flet_datatable2.datacolumn2 import DataColumn2
-from flet_datatable2.datarow2 import DataRow2
+from flet_datatable2 import _bitset as bitset
+from flet_datatable2._cells import cell_value, sort_key
+from flet_datatable2._keyed_rows import assign_positions
+from flet_datatable2._patches import count_patch, send_patch
+from flet_datatable2._sort_index import SortColumn, SortIndex
+from flet_datatable2._summaries import Summaries
+from flet_datatable2.datacolumn2 import ColumnSummary, DataColumn2, DataColumnSize
+from flet_datatable2.dataframe_source import DataFrameSource
+from flet_datatable2.datarow2 import CellValue, DataRow2
+from flet_datatable2.datasource import DataTable2Source
+from flet_datatable2.filters import RangeFilter, RowFilter
+from flet_datatable2.grouping import Aggregate, RowGroups
+from flet_datatable2.metrics import TableMetrics
+from flet_datatable2.selection import SelectionModel
 
-__all__ = ["DataTable2"]
+if TYPE_CHECKING:
+    import pandas as pd
+
+__all__ = [
+    "DataTable2",
+    "LoadProgressEvent",
+    "MetricsEvent",
+    "RowEvent",
+    "TableScrollEvent",
+]
+
+
+@dataclass
+class LoadProgressEvent(ft.Event["DataTable2"]):
+    """
+    Event fired by [`DataTable2.load_stream()`][(p).].
+    """
+
+    loaded: int
+    """
+    Number of rows loaded so far by the stream.
+    """
+
+
+@dataclass
+class RowEvent(ft.Event["DataTable2"]):
+    """
+    Event fired by [`DataTable2`][(p).] when a row or a cell is tapped.
+    """
+
+    index: int
+    """
+    Index of the row, in [`DataTable2.rows`][(p).], or among the rows of
+    the [`DataTable2.source`][(p).] if the table has one. While
+    [`DataTable2.groups`][(p).] is set, `rows` holds the header rows of
+    groups too, which the index counts.
+    """
+
+    row: Optional[ft.DataRow] = None
+    """
+    The row, or `None` if it has been removed from the table since.
+    """
+
+    key: Optional[ft.KeyValue] = None
+    """
+    The [`key`][flet.Control.key] of the row, if any.
+    """
+
+    column_index: Optional[int] = None
+    """
+    Index of the column of the tapped cell, for
+    [`DataTable2.on_cell_tap`][(p).].
+    """
+
+
+@dataclass
+class TableScrollEvent(ft.Event["DataTable2"]):
+    """
+    Event fired by [`DataTable2.on_scroll`][(p).].
+
+    Rows are given by their position among the rows shown, in display
+    order, which is their index in [`DataTable2.source`][(p).] if the
+    table has one.
+    """
+
+    first: int
+    """
+    Position of the first visible row.
+    """
+
+    last: int
+    """
+    Position of the last visible row.
+    """
+
+    pixels: float
+    """
+    Scroll offset of the rows, in pixels.
+    """
+
+    first_row: Optional[ft.DataRow] = None
+    """
+    The first visible row, or `None` if it isn't loaded from the
+    [`DataTable2.source`][(p).] yet.
+    """
+
+    last_row: Optional[ft.DataRow] = None
+    """
+    The last visible row, or `None` if it isn't loaded from the
+    [`DataTable2.source`][(p).] yet.
+    """
+
+
+@dataclass
+class MetricsEvent(ft.Event["DataTable2"]):
+    """
+    Event fired by [`DataTable2`][(p).] when the client reports metrics.
+    """
+
+    metrics: TableMetrics
+    """
+    A snapshot of the table's metrics.
+    """
 
 
 @ft.control("DataTable2")
@@ -34,6 +165,231 @@ class DataTable2(ft.DataTable):
     rows: list[Union[ft.DataRow, DataRow2]] = field(default_factory=list)
     """
     A list of table rows.
+
+    Note:
+        When [`source`][(c).] is set, this list is managed by the table and
+        only holds the rows of the currently loaded window.
+    """
+
+    source: Optional[DataTable2Source] = field(default=None, metadata={"skip": True})
+    """
+    A data source to load rows from on demand.
+
+    When set, the table only materializes the window of
+    [`source_window_size`][(c).] rows around its viewport and requests
+    further rows from the source as it is scrolled, so that tables with
+    hundreds of thousands of rows stay cheap to build and update.
+
+    Note:
+        All rows are assumed to be [`data_row_height`][(c).] tall.
+    """
+
+    source_window_size: int = 100
+    """
+    Number of rows loaded from [`source`][(c).] at a time.
+
+    Should comfortably exceed the number of rows that fit in the viewport.
+    """
+
+    max_rows: Optional[int] = field(default=None, metadata={"skip": True})
+    """
+    Maximum number of rows kept by [`append_rows()`][(c).].
+
+    When set, [`rows`][(c).] works as a ring buffer: once it holds
+    `max_rows` rows, each appended row takes the place of the oldest one,
+    so that only appended rows are sent to the client and rows already
+    shown are neither moved nor rebuilt there. This suits logs and other
+    live feeds of moderate rate, appending rows in batches:
+
+    ```python
+    table = DataTable2(columns=columns, max_rows=10_000, tail=True)
+    ...
+    table.append_rows(new_rows)
+    table.update()
+    ```
+
+    Note:
+        Once rows start to be evicted, the oldest row is no longer the first
+        one in [`rows`][(c).], which is rotated on the client instead.
+        Rows are still selected by their index in [`rows`][(c).] with
+        [`selection`][(c).], and evicted rows are deselected.
+
+    Note:
+        While only appended rows are sent, each update still diffs all
+        `max_rows` rows on the Python side, whatever the number of appended
+        rows, and each evicted row costs another pass over the rows after
+        it. The cost of an update thus grows with `max_rows` rather than
+        with the number of appended rows: keep `max_rows` to a few thousand
+        rows, append rows in batches and update the table a few times per
+        second at most, rather than once per row, as
+        [`load_stream()`][(c).] does.
+    """
+
+    tail: bool = False
+    """
+    Whether to keep the table scrolled to its last row as rows are added,
+    unless the user has scrolled away from it.
+    """
+
+    selection: Optional[SelectionModel] = field(default=None, metadata={"skip": True})
+    """
+    A table-level selection of rows.
+
+    When set, rows are selected by their index in [`rows`][(c).], or in
+    [`source`][(c).], through the model rather than through their own
+    [`selected`][flet.DataRow.selected] property, and the client receives
+    the selection as a single bitset. Row checkboxes and the heading checkbox
+    update the model and fire [`on_selection_change`][(c).].
+
+    The selection follows rows moved to other indexes of [`rows`][(c).],
+    and is cleared when [`source`][(c).] is sorted or filtered.
+    """
+
+    coalesce_selection: bool = False
+    """
+    Whether the client merges bursts of selection changes into one event.
+
+    Only applies to tables with a [`selection`][(c).]. The first change
+    made with row checkboxes or the heading checkbox is sent right away,
+    and changes made during the following
+    [`event_throttle_ms`][(c).] milliseconds, or 100 milliseconds if not
+    set, e.g. by quickly clicking through rows, are sent together once it
+    has elapsed, with only the last change of each row. The model is then
+    updated and [`on_selection_change`][(c).] fired once for all of them.
+    """
+
+    event_throttle_ms: Optional[int] = None
+    """
+    Minimum interval, in milliseconds, between high-frequency events sent
+    by the client.
+
+    Applies to the [`on_secondary_tap_down`][flet.DataRow.on_secondary_tap_down]
+    events of rows and the [`on_tap_down`][flet.DataCell.on_tap_down]
+    events of their cells: the first event is sent right away, and of the
+    events fired during the following interval, only the last one of each
+    row or cell is sent once it has elapsed. Also sets the interval over
+    which selection changes are merged with [`coalesce_selection`][(c).].
+    """
+
+    scroll_interval: int = 100
+    """
+    Minimum interval, in milliseconds, between [`on_scroll`][(c).] events.
+    """
+
+    groups: Optional[RowGroups] = field(default=None, metadata={"skip": True})
+    """
+    Groups of rows shown under collapsible header rows.
+
+    When set, the table shows the header row of each group, followed by
+    the rows of the group if it's expanded, in place of [`rows`][(c).],
+    which it takes over. Set it back to `None` to show the grouped rows
+    ungrouped, group by group. Sorting and filtering apply within each
+    group. See [`group_by()`][(c).].
+    """
+
+    virtualize_columns: bool = False
+    """
+    Whether the client only builds the cells of columns in or near the
+    horizontal viewport.
+
+    Cells of columns more than half a viewport away on either side are
+    left empty, and built as they are scrolled into view, so that a table
+    with hundreds of columns, of which a few fit on screen, costs about
+    the same to build as a narrow one. Column widths and the layout of
+    the table are unchanged: columns keep their
+    [`fixed_width`][flet_datatable2.DataColumn2.fixed_width] or their
+    [`size`][flet_datatable2.DataColumn2.size], in proportion to
+    [`sm_ratio`][(c).] and [`lm_ratio`][(c).], and the
+    [`fixed_left_columns`][(c).] are always built. Suits wide tables
+    scrolled horizontally, e.g. with [`min_width`][(c).].
+
+    Note:
+        This only reduces the cost of building cell widgets on the client.
+        The cells of all columns are still sent, decoded and diffed, so
+        the size of updates and the time spent computing them don't
+        change. Sending only visible columns would resend every row on
+        each horizontal scroll.
+    """
+
+    collect_metrics: bool = False
+    """
+    Whether to collect performance counters of the table, available as
+    [`metrics`][(c).].
+
+    Each update of the table is then timed and its patch counted, one in
+    10 also measured in bytes, and
+    the client reports the duration of its builds and the number of rows
+    it built or reused, every second at most, firing
+    [`on_metrics`][(c).]:
+
+    ```python
+    table = DataTable2(columns=columns, collect_metrics=True)
+    table.on_metrics = lambda e: chart.add(e.metrics.client_max_build_time)
+    ```
+    """
+
+    on_selection_change: Optional[ft.ControlEventHandler["DataTable2"]] = None
+    """
+    Fires when the user changes the [`selection`][(c).] with row checkboxes
+    or the heading checkbox.
+    """
+
+    on_metrics: Optional[ft.EventHandler[MetricsEvent]] = None
+    """
+    Fires when the client reports metrics, if [`collect_metrics`][(c).]
+    is set.
+    """
+
+    on_row_tap: Optional[ft.EventHandler[RowEvent]] = None
+    """
+    Fires when any row is tapped.
+
+    Unlike the handlers of each row, a single handler set here serves all
+    rows, which can then be plain data: rows are identified by the
+    [`index`][(p).RowEvent.], [`key`][(p).RowEvent.] and
+    [`row`][(p).RowEvent.] of the event. Handlers of rows still run,
+    before this one. Taps of the header rows of [`groups`][(c).] don't
+    fire it.
+    """
+
+    on_row_double_tap: Optional[ft.EventHandler[RowEvent]] = None
+    """
+    Fires when any row is double-tapped. See [`on_row_tap`][(c).].
+    """
+
+    on_row_secondary_tap: Optional[ft.EventHandler[RowEvent]] = None
+    """
+    Fires when any row is tapped with a secondary button.
+    See [`on_row_tap`][(c).].
+    """
+
+    on_cell_tap: Optional[ft.EventHandler[RowEvent]] = None
+    """
+    Fires when any cell without its own tap handler is tapped, with the
+    [`column_index`][(p).RowEvent.] of the cell. Tapping a cell then
+    doesn't fire [`on_row_tap`][(c).], but still runs the tap handler of
+    its row. See [`on_row_tap`][(c).].
+    """
+
+    on_scroll: Optional[ft.EventHandler[TableScrollEvent]] = None
+    """
+    Fires when the first or last visible row changes as the table is
+    scrolled, every [`scroll_interval`][(c).] milliseconds at most.
+
+    Visible rows are found from the scroll offset in `O(log n)` by the
+    client, which keeps an index of the heights of rows, including their
+    [`specific_row_height`][flet_datatable2.DataRow2.specific_row_height].
+    """
+
+    on_load_progress: Optional[ft.EventHandler[LoadProgressEvent]] = None
+    """
+    Fires each time [`load_stream()`][(c).] has sent a chunk of rows.
+    """
+
+    on_load_complete: Optional[ft.EventHandler[LoadProgressEvent]] = None
+    """
+    Fires when [`load_stream()`][(c).] has loaded all rows and the client
+    has shown them.
     """
 
     empty: Optional[ft.Control] = None
@@ -113,6 +469,20 @@ class DataTable2(ft.DataTable):
     Duration of sort arrow animation.
     """
 
+    cell_flash_color: Optional[ft.ColorValue] = None
+    """
+    Color cells changed by [`update_cells()`][(c).] are highlighted with,
+    fading out over [`cell_flash_duration`][(c).]. Changed cells aren't
+    highlighted if not set.
+    """
+
+    cell_flash_duration: ft.DurationValue = field(
+        default_factory=lambda: ft.Duration(milliseconds=500)
+    )
+    """
+    Duration of the highlight of cells changed by [`update_cells()`][(c).].
+    """
+
     visible_horizontal_scroll_bar: Optional[bool] = None
     """
     Determines visibility of the horizontal scrollbar.
@@ -142,3 +512,1217 @@ class DataTable2(ft.DataTable):
     data_row_max_height: None = field(
         init=False, repr=False, compare=False, metadata={"skip": True}
     )
+
+    # virtual scrolling state of the loaded source window, sent to the client
+    source_row_count: int = field(default=0, init=False, repr=False, compare=False)
+    source_offset: int = field(default=0, init=False, repr=False, compare=False)
+
+    # display order of rows as row control ids; a tuple, so that a new order
+    # is sent as a single value rather than diffed item by item
+    row_order: Optional[tuple[int, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # columns the table is sorted by, as (column index, ascending) pairs,
+    # shown on the client as sort rank indicators
+    sort_columns: Optional[tuple[tuple[int, bool], ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # index of the oldest row in `rows` when it is used as a ring buffer
+    # by append_rows(); rows are displayed starting from it
+    ring_start: int = field(default=0, init=False, repr=False, compare=False)
+
+    # whether rows are displayed by DataRow2.order_key, set by set_rows()
+    keyed_order: bool = field(default=False, init=False, repr=False, compare=False)
+
+    # visibility of rows set by filter(), as a bitmap with a bit per row
+    row_visibility: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # state of the selection model, sent to the client
+    selection_bits: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    selection_inverted: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
+
+    # values of the footer row, by visible column, when columns have a summary
+    footer_values: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def init(self):
+        super().init()
+        self._source_rows: dict[int, ft.DataRow] = {}
+        self._indexed_rows: list[ft.DataRow] = []
+        self._sort_index = SortIndex(self._extract_sort_keys)
+        self._sort_spec: Optional[tuple[SortColumn, ...]] = None
+        self._filters: tuple[RowFilter, ...] = ()
+        self._keyed_rows: Optional[list[ft.DataRow]] = None
+        self._ring_rows: Optional[list[ft.DataRow]] = None
+        self._selection_state: Optional[tuple[SelectionModel, int]] = None
+        # rows the selection was last synced with, to follow rows that move
+        self._selection_rows: Optional[tuple[SelectionModel, list[ft.DataRow]]] = None
+        self._groups_state: Optional[tuple[RowGroups, int]] = None
+        self._summaries: Optional[Summaries] = None
+        self._metrics = TableMetrics()
+        self._sync_time = 0.0
+        self._batch_depth = 0
+        self._batched_updates = 0
+        self._saved_updates = 0
+        self._rows_by_key: dict[ft.KeyValue, ft.DataRow] = {}
+        # cell changes of update_cells() not sent yet, by (row id, column)
+        self._pending_cells: dict[tuple[int, int], CellValue] = {}
+        self._sending_cells = False
+        self._cells_lock = threading.Lock()
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: "pd.DataFrame",
+        column_sizes: Optional[
+            Mapping[Hashable, Union[DataColumnSize, ft.Number]]
+        ] = None,
+        formatters: Optional[Mapping[Hashable, Callable[[Any], CellValue]]] = None,
+        **kwargs: Any,
+    ) -> "DataTable2":
+        """
+        Creates a table showing the rows of a pandas `DataFrame`.
+
+        Columns are derived from the frame and rows are read from it on
+        demand through a [`DataFrameSource`][(p).], which references the
+        frame's data without copying it, only creates rows for the rendered
+        window and sorts and filters with vectorized operations:
+
+        ```python
+        table = DataTable2.from_dataframe(df, formatters={"price": "{:.2f}".format})
+        ```
+
+        Args:
+            df: The frame to show.
+            column_sizes: Sizes of columns, by column name. See
+                [`DataFrameSource`][(p).].
+            formatters: Functions formatting the values of columns, by column
+                name. See [`DataFrameSource`][(p).].
+            **kwargs: Other properties of the table.
+        """
+        source = DataFrameSource(df, column_sizes=column_sizes, formatters=formatters)
+        return cls(columns=source.columns, source=source, **kwargs)
+
+    def before_update(self):
+        start = time.perf_counter()
+        _discard_skipped_changes(self)
+        if self.keyed_order and self.rows is not self._keyed_rows:
+            # rows were assigned directly and are displayed in list order
+            self.keyed_order = False
+        if not self.keyed_order:
+            self._seed_order_keys()
+        if self.ring_start and self.rows is not self._ring_rows:
+            self.ring_start = 0
+        if self.source is not None and self.source_row_count == 0:
+            self._load_source_window(0)
+        self._sync_groups()
+        self._sync_summaries()
+        self._sync_selection()
+        if (self._sort_spec is not None or self._filters) and self._sync_sort_index():
+            # keep rows sorted and filtered when rows are added or removed
+            if self._sort_spec is not None:
+                self._sort_rows()
+            if self._filters:
+                self._filter_rows()
+        self._sync_time = time.perf_counter() - start
+        # DataTable's own checks count cells of rows, but not their values
+        super(ft.DataTable, self).before_update()
+        self._check_rows()
+
+    def _seed_order_keys(self):
+        # rows displayed in list order get positions as they are first sent,
+        # so that the first set_rows() keeps them rather than patching every
+        # row; only rows without one, or out of list order, get a new one
+        if (
+            self.source is not None
+            or self.groups is not None
+            or self.rows is self._ring_rows
+        ):
+            return
+        rows = [row for row in self.rows if isinstance(row, DataRow2)]
+        if all(row.order_key is not None for row in rows):
+            return
+        positions = assign_positions([row.order_key for row in rows])
+        for row, position in zip(rows, positions):
+            if row.order_key != position:
+                row.order_key = position
+
+    def _check_rows(self):
+        visible_columns = sum(1 for column in self.columns if column.visible)
+        if visible_columns == 0:
+            raise ValueError("columns must contain at minimum one visible DataColumn")
+        for row in self.rows:
+            if row.visible and _visible_cell_count(row) != visible_columns:
+                raise ValueError(
+                    "each visible DataRow must contain exactly as many visible "
+                    f"DataCells or values as there are visible DataColumns "
+                    f"({visible_columns})"
+                )
+        if self.divider_thickness is not None and self.divider_thickness < 0:
+            raise ValueError(
+                f"divider_thickness must be greater than or equal to 0, "
+                f"got {self.divider_thickness}"
+            )
+        if self.sort_column_index is not None and not (
+            0 <= self.sort_column_index < visible_columns
+        ):
+            raise ValueError(
+                f"sort_column_index ({self.sort_column_index}) must be greater than "
+                f"or equal to 0 and less than the number of visible columns "
+                f"({visible_columns})"
+            )
+
+    def sort_by(
+        self,
+        column_index: int,
+        ascending: bool = True,
+        key: Optional[Callable[[ft.DataRow], Any]] = None,
+    ):
+        """
+        Sorts the table by a column.
+
+        Rather than rebuilding [`rows`][(c).], the existing rows are
+        reordered on the client: only the new order of row ids is sent.
+        Sort keys are extracted from the cells of a column once and reused
+        by subsequent sorts of that column. The sort is stable and
+        kept up to date as rows are added or removed.
+
+        [`sort_column_index`][(c).] and [`sort_ascending`][(c).] are updated
+        accordingly. Note that [`rows`][(c).] itself keeps its order.
+
+        Args:
+            column_index: Index of the column to sort by.
+            ascending: Whether to sort in ascending order.
+            key: A function returning the sort key of a row. By default,
+                rows are sorted by the text of their cells in the column,
+                compared as numbers in [numeric][flet.DataColumn.numeric]
+                columns. Not supported with [`source`][(c).], which
+                sorts its rows itself, nor while [`groups`][(c).] is set.
+        """
+        self.sort_by_columns(
+            [(column_index, ascending)], keys={column_index: key} if key else None
+        )
+
+    def sort_by_columns(
+        self,
+        columns: Sequence[tuple[int, bool]],
+        keys: Optional[dict[int, Callable[[ft.DataRow], Any]]] = None,
+    ):
+        """
+        Sorts the table by multiple columns.
+
+        Rows are sorted by the first column, rows with equal values in it
+        by the second column, and so on:
+
+        ```python
+        table.sort_by_columns([(2, False), (0, True)])
+        ```
+
+        Works like [`sort_by()`][(c).], with each column's sort keys and
+        order cached separately, so that changing the columns sorted by
+        later on reuses the cached orders instead of reading cells again.
+        The first column is reflected in [`sort_column_index`][(c).] and
+        [`sort_ascending`][(c).], and every column gets a sort rank
+        indicator in its heading.
+
+        Args:
+            columns: Columns to sort by, as `(column_index, ascending)` pairs,
+                most significant first.
+            keys: Custom sort key functions, by column index. See the `key`
+                argument of [`sort_by()`][(c).]. Not supported while
+                [`groups`][(c).] is set.
+        """
+        columns = [(ci, bool(asc)) for ci, asc in columns]
+        if not columns:
+            raise ValueError("at least one column to sort by is required")
+        for column_index, _ in columns:
+            if not 0 <= column_index < len(self.columns):
+                raise IndexError(f"column index {column_index} is out of range")
+        if len({ci for ci, _ in columns}) != len(columns):
+            raise ValueError("each column can be sorted by only once")
+        if keys and self.source is not None:
+            raise ValueError("keys are not supported when source is set")
+        if keys and self.groups is not None:
+            raise ValueError("keys are not supported while rows are grouped")
+        self.sort_column_index, self.sort_ascending = columns[0]
+        self.sort_columns = tuple(columns) if len(columns) > 1 else None
+        if self.source is not None:
+            self.source.sort_by_columns(columns)
+            self._clear_source_selection()
+            self._source_rows.clear()
+            self._load_source_window(self.source_offset)
+            return
+        keys = keys or {}
+        self._sync_sort_index()
+        self._sort_spec = tuple((ci, asc, keys.get(ci)) for ci, asc in columns)
+        self._sort_rows()
+
+    def filter(self, filters: Sequence[RowFilter]):
+        """
+        Shows only rows matching all given filters.
+
+        Rows are not removed from [`rows`][(c).] nor rebuilt: the client is
+        sent a bitmap with a bit per row telling which rows are visible.
+        Filters are answered from per-column indexes built from the same
+        cached keys as [`sort_by()`][(c).]: a sorted index searched with
+        binary search for [`RangeFilter`][(p).]s and a hash index for
+        [`ValuesFilter`][(p).]s. The filter is kept up to date as rows are
+        added or removed.
+
+        ```python
+        table.filter([RangeFilter(2, min=18, max=65), ValuesFilter(0, ["A", "B"])])
+        ```
+
+        With [`source`][(c).] set, filtering is delegated to
+        [`DataTable2Source.filter()`][(p).]. While [`groups`][(c).] is set,
+        header rows are always shown.
+
+        Args:
+            filters: Filters to apply. An empty list shows all rows.
+        """
+        filters = tuple(filters)
+        for f in filters:
+            if not 0 <= f.column_index < len(self.columns):
+                raise IndexError(f"column index {f.column_index} is out of range")
+        if self.source is not None:
+            self.source.filter(filters)
+            self._clear_source_selection()
+            self._source_rows.clear()
+            self._load_source_window(0)
+            return
+        self._sync_sort_index()
+        self._filters = filters
+        self._filter_rows()
+
+    def invalidate_sort_keys(self, column_index: Optional[int] = None):
+        """
+        Drops keys cached by [`sort_by()`][(c).] and [`filter()`][(c).] and
+        re-applies the current sort and filter.
+
+        Call it after changing the values of cells in place, passing the
+        index of the changed column, so that only that column's keys
+        are extracted again. Adding or removing rows is detected
+        automatically.
+
+        Args:
+            column_index: Index of the changed column, or `None` if cells
+                of several columns were changed.
+        """
+        if column_index is None:
+            self._sort_index.clear()
+        else:
+            self._sort_index.invalidate(column_index)
+        if self._sort_spec is not None:
+            self._sort_rows()
+        if self._filters:
+            self._filter_rows()
+
+    def _sync_sort_index(self) -> bool:
+        rows = self.rows
+        if len(rows) == len(self._indexed_rows) and all(
+            map(is_, rows, self._indexed_rows)
+        ):
+            return False
+        self._indexed_rows = rows[:]
+        self._sort_index.clear()
+        return True
+
+    def _extract_sort_keys(
+        self, column_index: int, key: Optional[Callable[[ft.DataRow], Any]]
+    ) -> list:
+        if key is not None:
+            return [key(row) for row in self._indexed_rows]
+        numeric = self.columns[column_index].numeric
+        return [
+            sort_key(cell_value(row, column_index), numeric)
+            for row in self._indexed_rows
+        ]
+
+    def _sort_rows(self):
+        order = self._sort_index.order(self._sort_spec)
+        rows = self._indexed_rows
+        if self.groups is not None:
+            order = self.groups._order_within_groups(rows, order)
+        self.row_order = tuple(rows[i]._i for i in order)
+
+    def _clear_source_selection(self):
+        # rows of a source are selected by index, which sorting or
+        # filtering it gives to other rows
+        if self.selection is not None:
+            self.selection.clear()
+
+    def _sync_selection(self):
+        selection = self.selection
+        if selection is None:
+            self.selection_bits = None
+            self._selection_state = None
+            self._selection_rows = None
+            return
+        if self.source is None:
+            rows = self.rows
+            synced = self._selection_rows
+            if synced is None or synced[0] is not selection:
+                self._selection_rows = (selection, rows[:])
+            elif len(rows) != len(synced[1]) or not all(map(is_, rows, synced[1])):
+                selection._remap(synced[1], rows)
+                self._selection_rows = (selection, rows[:])
+        row_count = self.source_row_count if self.source is not None else len(self.rows)
+        if selection.row_count != row_count:
+            selection._resize(row_count)
+        state = (selection, selection._version)
+        if state != self._selection_state:
+            self._selection_state = state
+            bits = selection._bits
+            self.selection_bits = bitset.to_bytes(bits, bits.bit_length())
+            self.selection_inverted = selection._inverted
+
+    def group_by(
+        self,
+        column_index: int,
+        aggregates: Optional[Mapping[int, Aggregate]] = None,
+        expanded: bool = True,
+    ) -> RowGroups:
+        """
+        Groups rows by the values of a column.
+
+        Each group gets a header row showing the group's value, number of
+        rows and aggregates of other columns, which are maintained
+        incrementally as rows are added to, removed from or updated in
+        the returned [`RowGroups`][(p).]. Tapping a header row expands or
+        collapses the group; rows of collapsed groups are not sent to
+        the client.
+
+        The current sort and filter are kept, and applied within each
+        group: a group's rows are sorted below its header row, and header
+        rows are always shown. They keep applying once the table is
+        ungrouped again by setting [`groups`][(c).] to `None`.
+
+        ```python
+        groups = table.group_by(0, aggregates={2: "sum", 3: "avg"})
+        table.update()
+        ```
+
+        Args:
+            column_index: Index of the column to group rows by.
+            aggregates: Aggregates shown in header rows, by column index.
+                See [`RowGroups`][(p).].
+            expanded: Whether groups are initially expanded.
+
+        Returns:
+            The groups, also assigned to [`groups`][(c).].
+
+        Raises:
+            ValueError: If [`source`][(c).] is set, or if the table is
+                sorted with custom sort keys.
+        """
+        if not 0 <= column_index < len(self.columns):
+            raise IndexError(f"column index {column_index} is out of range")
+        if self.source is not None:
+            raise ValueError("group_by() is not supported when source is set")
+        if self._sort_spec is not None and any(k for _, _, k in self._sort_spec):
+            raise ValueError(
+                "group_by() is not supported while sorted with custom keys"
+            )
+        rows = self.groups._all_rows() if self.groups is not None else self.rows
+        groups = RowGroups(column_index, aggregates, expanded=expanded)
+        groups.add(rows)
+        self.groups = groups
+        return groups
+
+    def _sync_groups(self):
+        groups = self.groups
+        state = None if groups is None else (groups, groups._version)
+        if state == self._groups_state:
+            return
+        previous = self._groups_state
+        self._groups_state = state
+        if groups is not None:
+            self.rows = groups._display_rows(len(self.columns))
+        elif previous is not None:
+            self.rows = previous[0]._all_rows()
+
+    def update_summaries(self, rows: Optional[Iterable[ft.DataRow]] = None):
+        """
+        Updates the [summaries][(p).DataColumn2.summary] of columns shown
+        in the footer after values of rows were changed in place.
+
+        Summaries are kept up to date as rows are added or removed, each
+        added or removed row adjusting them by its own values. Only rows
+        changed in place have to be passed here, so that updating a few
+        rows of a large table doesn't read the values of all rows:
+
+        ```python
+        row.values[2] = 42
+        table.update_summaries([row])
+        table.update()
+        ```
+
+        Args:
+            rows: Changed rows, or `None` to read the values of all rows
+                again.
+        """
+        if self._summaries is None:
+            return
+        if rows is None:
+            self._summaries = None
+            self._sync_summaries()
+            return
+        self._summaries.update_rows(rows)
+        self._sync_summaries()
+
+    def _sync_summaries(self):
+        summaries = tuple(
+            (ci, column.summary)
+            for ci, column in enumerate(self.columns)
+            if getattr(column, "summary", None) is not None
+        )
+        if not summaries or self.source is not None:
+            self._summaries = None
+            self.footer_values = None
+            return
+        for _, summary in summaries:
+            if summary not in get_args(ColumnSummary):
+                raise ValueError(
+                    f"invalid summary {summary!r}, "
+                    f"expected one of {get_args(ColumnSummary)}"
+                )
+        if self._summaries is None or self._summaries.summaries != summaries:
+            self._summaries = Summaries(summaries)
+        # header rows of groups are not summarized
+        groups = self.groups
+        self._summaries.sync(self.rows if groups is None else groups._all_rows())
+        values = dict(zip((ci for ci, _ in summaries), self._summaries.values()))
+        # the client only lays out visible columns
+        self.footer_values = tuple(
+            values.get(ci) for ci, column in enumerate(self.columns) if column.visible
+        )
+
+    def _filter_rows(self):
+        if not self._filters:
+            self.row_visibility = None
+            return
+        size = len(self._indexed_rows)
+        visible = -1
+        for f in self._filters:
+            numeric = self.columns[f.column_index].numeric
+            if isinstance(f, RangeFilter):
+                matches = self._sort_index.range(
+                    f.column_index,
+                    None if f.min is None else sort_key(f.min, numeric),
+                    # (1,) sorts after all values, but before empty ones
+                    (1,) if f.max is None else sort_key(f.max, numeric),
+                )
+            else:
+                matches = self._sort_index.lookup(
+                    f.column_index, [sort_key(v, numeric) for v in f.values]
+                )
+            visible &= bitset.from_indexes(matches, size)
+        if self.groups is not None:
+            # header rows stay visible, whatever their cells
+            visible |= bitset.from_indexes(
+                self.groups._header_indexes(self._indexed_rows), size
+            )
+        self.row_visibility = bitset.to_bytes(visible, size)
+
+    def set_rows(
+        self,
+        rows: list[DataRow2],
+        key: Optional[Callable[[DataRow2], Hashable]] = None,
+    ):
+        """
+        Replaces the rows of the table, sending only what has changed.
+
+        New rows are matched with existing ones by key. Rows whose key is
+        already present are merged into the existing row, which is kept and
+        only updated with the properties that differ, so that unchanged rows
+        cost nothing. Rows with new keys are added and rows whose keys
+        are gone are removed.
+
+        Rather than reordering [`rows`][(c).], which holds rows in the order
+        they were first added, the display order is kept in per-row positions.
+        Rows forming the longest subsequence that kept its relative order
+        (found in `O(n log n)`) keep their positions, so only rows that
+        actually moved get a new one. Updating a large table where few rows
+        changed thus sends an update proportional to the change, rather than
+        to the size of the table:
+
+        ```python
+        table.set_rows([make_row(item) for item in query()], key=lambda r: r.data)
+        table.update()
+        ```
+
+        Args:
+            rows: New rows, in display order.
+            key: A function returning the unique key of a row.
+                Defaults to the [`key`][flet.Control.key] of rows.
+
+        Raises:
+            ValueError: If keys are not unique or missing, or if
+                [`source`][(c).] is set.
+            TypeError: If a row is not a [`DataRow2`][(p).].
+        """
+        if self.source is not None:
+            raise ValueError("set_rows() is not supported when source is set")
+        if self.groups is not None:
+            raise ValueError("set_rows() is not supported while rows are grouped")
+        key = key or _row_key
+        new_rows: dict[Hashable, DataRow2] = {}
+        for row in rows:
+            if not isinstance(row, DataRow2):
+                raise TypeError(f"set_rows() requires DataRow2 rows, got {row}")
+            k = key(row)
+            if k is None or k in new_rows:
+                raise ValueError(f"row key {k!r} is missing or not unique")
+            new_rows[k] = row
+
+        # existing rows stay in place, new ones are appended
+        current = {}
+        kept = []
+        for row in self.rows:
+            k = key(row) if isinstance(row, DataRow2) else None
+            new_row = new_rows.get(k)
+            if new_row is not None and type(new_row) is type(row) and k not in current:
+                _merge_row(row, new_row)
+                current[k] = row
+                kept.append(row)
+        added = [row for k, row in new_rows.items() if k not in current]
+        merged = kept + added
+
+        display = [current.get(k, row) for k, row in new_rows.items()]
+        positions = assign_positions([row.order_key for row in display])
+        for row, position in zip(display, positions):
+            if row.order_key != position:
+                row.order_key = position
+
+        self.rows = self._keyed_rows = merged
+        self.keyed_order = True
+
+    def append_rows(self, rows: Iterable[ft.DataRow]):
+        """
+        Appends rows to [`rows`][(c).], evicting the oldest rows once
+        there are [`max_rows`][(c).] of them.
+
+        Args:
+            rows: Rows to append.
+
+        Raises:
+            ValueError: If [`source`][(c).] is set, or if
+                [`max_rows`][(c).] is less than 1.
+        """
+        if self.source is not None:
+            raise ValueError("append_rows() is not supported when source is set")
+        if self.groups is not None:
+            raise ValueError("append_rows() is not supported while rows are grouped")
+        max_rows = self.max_rows
+        if max_rows is None:
+            self.rows.extend(rows)
+            return
+        if max_rows < 1:
+            raise ValueError(f"max_rows must be at least 1, got {max_rows}")
+        ring = self.rows
+        start = self.ring_start if ring is self._ring_rows else 0
+        if len(ring) > max_rows:
+            # max_rows was lowered: keep the newest rows
+            ring[:] = (ring[start:] + ring[:start])[-max_rows:]
+            start = 0
+        selection = self.selection
+        for row in rows:
+            if len(ring) < max_rows:
+                if start == 0:
+                    ring.append(row)
+                else:
+                    # max_rows was raised: the newest row goes before
+                    # the oldest one
+                    ring.insert(start, row)
+                    start += 1
+                continue
+            ring[start] = row
+            if selection is not None and start < selection.row_count:
+                selection.deselect(start)
+            start = (start + 1) % max_rows
+        self._ring_rows = ring
+        self.ring_start = start
+
+    async def load_stream(
+        self,
+        rows: Union[Iterable[ft.DataRow], AsyncIterable[ft.DataRow]],
+        chunk_size: int = 500,
+        max_in_flight: int = 2,
+    ) -> int:
+        """
+        Appends rows with [`append_rows()`][(c).] as they are produced by
+        an iterable or an async iterable, in chunks.
+
+        Each chunk is sent to the client as soon as it is complete, so the
+        first rows are shown without waiting for the whole stream, e.g.
+        a slow query or a large file:
+
+        ```python
+        async def read_rows():
+            async for record in query():
+                yield DataRow2(values=[record.id, record.name])
+
+        await table.load_stream(read_rows(), chunk_size=1000)
+        ```
+
+        Backpressure keeps the stream from running ahead of the client:
+        at most `max_in_flight` chunks are sent but not yet shown by the
+        client, and the iterable is not consumed any further until the client
+        catches up. [`on_load_progress`][(c).] fires after each chunk and
+        [`on_load_complete`][(c).] once all rows are shown.
+
+        Each chunk is sent by an update of the table, which diffs all of its
+        rows, so chunks grow with the rows loaded: a chunk holds at least
+        half as many rows as were loaded before it, capped at
+        [`max_rows`][(c).]. Loading `n` rows then takes a number of updates
+        growing with `log(n)` rather than with `n`.
+
+        Synchronous iterables are consumed on the event loop, which is given
+        the chance to run between chunks. Use an async iterable for sources
+        that block.
+
+        Args:
+            rows: Rows to append.
+            chunk_size: Number of rows sent at a time, at least.
+            max_in_flight: Maximum number of chunks sent to the client but
+                not yet shown by it.
+
+        Returns:
+            Number of rows loaded.
+
+        Raises:
+            ValueError: If [`source`][(c).] is set, or if `chunk_size` or
+                `max_in_flight` is less than 1.
+        """
+        if self.source is not None:
+            raise ValueError("load_stream() is not supported when source is set")
+        if chunk_size < 1 or max_in_flight < 1:
+            raise ValueError("chunk_size and max_in_flight must be at least 1")
+        in_flight: deque[asyncio.Task] = deque()
+        loaded = 0
+        pending: list[ft.DataRow] = []
+
+        async def send():
+            nonlocal loaded, pending
+            self.append_rows(pending)
+            loaded += len(pending)
+            pending = []
+            self.update()
+            # the client answers once it has built the rows sent before
+            in_flight.append(asyncio.create_task(self._invoke_method("rows_shown")))
+            if self.on_load_progress is not None:
+                await self._trigger_event("load_progress", {"loaded": loaded})
+            while len(in_flight) >= max_in_flight:
+                await in_flight.popleft()
+
+        try:
+            async for chunk in _chunks(rows, chunk_size):
+                pending.extend(chunk)
+                # an update diffs all rows, so fewer, larger chunks are sent
+                # as the table grows
+                growth = loaded // 2
+                if self.max_rows is not None:
+                    growth = min(growth, self.max_rows)
+                if len(pending) >= growth:
+                    await send()
+            if pending:
+                await send()
+            while in_flight:
+                await in_flight.popleft()
+        finally:
+            for task in in_flight:
+                task.cancel()
+        if self.on_load_complete is not None:
+            await self._trigger_event("load_complete", {"loaded": loaded})
+        return loaded
+
+    @contextmanager
+    def batch(self) -> Generator[None, None, None]:
+        """
+        Coalesces updates of the table and its rows into one.
+
+        Calls to `update()` of the table, or of any of its
+        [`DataRow2`][(p).] rows, made within the block are not sent right
+        away. Instead, the table is updated once when the block exits,
+        sending all changes made within the block, to the table, its rows,
+        cells and their contents, with repeated changes of the same property
+        sent only once:
+
+        ```python
+        with table.batch():
+            for row in table.rows:
+                row.selected = True
+                row.update()  # deferred
+        ```
+
+        Batches can be nested; changes are sent when the outermost
+        batch exits. See [`saved_updates`][(c).].
+
+        Note:
+            Only updates of the table and of its rows are deferred:
+            updating a cell or its content within the block still sends
+            it right away. Rather change them without updating them,
+            they are sent when the block exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            updates = self._batched_updates
+            if self._batch_depth == 0:
+                self._batched_updates = 0
+        if self._batch_depth > 0:
+            return
+        self._saved_updates += max(0, updates - 1)
+        try:
+            mounted = self.page is not None
+        except RuntimeError:
+            # not mounted yet: there is nothing to send
+            mounted = False
+        if mounted:
+            self.update()
+
+    @property
+    def saved_updates(self) -> int:
+        """
+        Number of update messages saved so far by [`batch()`][(c).].
+
+        That is the number of `update()` calls deferred within batches,
+        less the one update sent by each batch.
+        """
+        return self._saved_updates
+
+    def update(self):
+        if self._batch_depth > 0:
+            self._batched_updates += 1
+            return
+        if not self.collect_metrics:
+            super().update()
+            return
+        session = self.page.session
+        if session.connection is None:
+            # the session keeps messages until the client reconnects
+            super().update()
+            return
+        # the table's patch is computed and sent here, rather than by the
+        # session, so that it's measured
+        start = time.perf_counter()
+        patch = send_patch(session, self)
+        self._record_update(time.perf_counter() - start, patch)
+
+    def _record_update(self, elapsed: float, patch: list):
+        rows, cells = count_patch(patch)
+        metrics = self._metrics
+        # patches are encoded again to be measured, so only some are
+        if metrics.updates % _BYTES_SAMPLE_INTERVAL == 0:
+            size = _patch_size(patch) if patch else 0
+            metrics.bytes_sent = size
+            metrics.measured_updates += 1
+            metrics.measured_bytes += size
+        metrics.updates += 1
+        metrics.update_time = elapsed
+        metrics.sync_time = self._sync_time
+        metrics.rows_sent = rows
+        metrics.cells_sent = cells
+        metrics.total_update_time += elapsed
+        metrics.total_rows_sent += rows
+        metrics.total_cells_sent += cells
+        metrics.total_bytes_sent = (
+            metrics.measured_bytes * metrics.updates // metrics.measured_updates
+        )
+
+    @property
+    def metrics(self) -> TableMetrics:
+        """
+        A snapshot of the performance counters collected since the table
+        was created, or since [`reset_metrics()`][(c).], when
+        [`collect_metrics`][(c).] is set.
+        """
+        return dataclasses.replace(self._metrics)
+
+    def reset_metrics(self):
+        """
+        Resets all performance counters of [`metrics`][(c).].
+        """
+        self._metrics = TableMetrics()
+
+    async def scroll_to_row(
+        self,
+        row: Union[int, ft.KeyValue, ft.DataRow],
+        duration: ft.DurationValue = 0,
+        curve: ft.AnimationCurve = ft.AnimationCurve.EASE,
+    ):
+        """
+        Scrolls the table so that a row is at the top of the viewport,
+        or as close to it as possible.
+
+        The client finds the scroll offset of the row from an index of the
+        heights of rows, in `O(log n)`, without building the rows before
+        it, so that jumping to any row of a large table, or of a
+        [`source`][(c).], takes the same time:
+
+        ```python
+        await table.scroll_to_row(900_000)
+        await table.scroll_to_row("order-42", duration=300)
+        ```
+
+        Rows hidden by [`filter()`][(c).] or in collapsed groups are not
+        scrolled to.
+
+        Args:
+            row: The index of the row in [`rows`][(c).], or in
+                [`source`][(c).], the [`key`][flet.Control.key] of the row,
+                or the row itself. Integer keys are taken as indexes, so
+                rows with such keys are passed themselves.
+            duration: The duration of the scroll animation. The table
+                jumps to the row if it's zero.
+            curve: The curve of the scroll animation.
+
+        Raises:
+            IndexError: If there is no row at the given index.
+            ValueError: If no row has the given key.
+        """
+        if isinstance(row, int) and not isinstance(row, bool):
+            if self.source is not None:
+                if not 0 <= row < self.source_row_count:
+                    raise IndexError(f"row index {row} is out of range")
+                target = {"index": row}
+            else:
+                target = {"id": self.rows[row]._i}
+        else:
+            if not isinstance(row, ft.DataRow):
+                row = self._row_by_key(row)
+            target = {"id": row._i}
+        await self._invoke_method(
+            "scroll_to_row", {**target, "duration": duration, "curve": curve}
+        )
+
+    def _row_by_key(self, key: ft.KeyValue) -> ft.DataRow:
+        row = self._rows_by_key.get(key)
+        if row is None or row.key != key:
+            # rows changed since keys were indexed
+            self._rows_by_key = {r.key: r for r in self.rows if r.key is not None}
+            row = self._rows_by_key.get(key)
+            if row is None:
+                raise ValueError(f"no row has key {key!r}")
+        return row
+
+    def update_cells(
+        self,
+        changes: Iterable[tuple[Union[int, ft.KeyValue, ft.DataRow], int, CellValue]],
+    ):
+        """
+        Changes the values of cells and sends them to the client right away,
+        without updating the table.
+
+        Meant for values ticking many times per second, e.g. prices: rather
+        than diffing rows and cells, changes are sent as a packed list of
+        `(row, column, value)` entries, and the client only rebuilds the text
+        of the changed cells, highlighting them with
+        [`cell_flash_color`][(c).]. Changes made while previous ones are
+        still being sent are merged, keeping the last value of each cell,
+        so that a slow client receives fewer, larger messages rather than
+        falling behind:
+
+        ```python
+        def on_ticks(ticks):  # may be called from any thread
+            table.update_cells([(t.symbol, PRICE, t.price) for t in ticks])
+        ```
+
+        Calls from several threads are serialized, and changes are sent from
+        the page's event loop. Rows are looked up when called, so rows must
+        not be added or removed by other threads meanwhile.
+
+        Changed cells are stored in the rows'
+        [`values`][flet_datatable2.DataRow2.values], and sent again with the
+        rows by the next update of the table. Sorting, filters, groups and
+        [`DataColumn2.summary`][(p).] values aren't updated; see
+        [`invalidate_sort_keys()`][(c).] and [`update_summaries()`][(c).].
+
+        Args:
+            changes: Changed cells, as `(row, column_index, value)` tuples,
+                where `row` is the index of the row in [`rows`][(c).], or in
+                [`source`][(c).], its [`key`][flet.Control.key], or the row
+                itself. Rows of a source that aren't loaded are skipped.
+
+        Raises:
+            ValueError: If no row has a given key, or if a row has no
+                [`values`][flet_datatable2.DataRow2.values].
+            TypeError: If a value isn't a plain cell value, or a cell is a
+                `DataCell`.
+            RuntimeError: If the table isn't added to a page.
+        """
+        changes = list(changes)
+        # changes are sent from the page's event loop, whichever thread this
+        # is called from; it's looked up first, so that nothing is changed
+        # if the table isn't mounted
+        page = self.page
+        loop = page.session.connection.loop
+        updates: dict[tuple[int, int], CellValue] = {}
+        # rows are looked up and changed under the lock, so that calls from
+        # several threads don't interleave
+        with self._cells_lock:
+            for row, column_index, value in changes:
+                if isinstance(row, int) and not isinstance(row, bool):
+                    if self.source is not None:
+                        row = self._source_rows.get(row)
+                        if row is None:
+                            continue
+                    else:
+                        row = self.rows[row]
+                elif not isinstance(row, ft.DataRow):
+                    row = self._row_by_key(row)
+                values = getattr(row, "values", None)
+                if values is None:
+                    raise ValueError("update_cells() requires rows with values")
+                if isinstance(values[column_index], ft.DataCell):
+                    raise TypeError(f"cell {column_index} of {row} is a DataCell")
+                if not isinstance(value, get_args(CellValue)):
+                    raise TypeError(
+                        f"invalid cell value {value!r}, expected str, int, float, "
+                        "bool, date, datetime or None"
+                    )
+                values[column_index] = value
+                updates[row._i, column_index] = value
+            if not updates:
+                return
+            self._pending_cells.update(updates)
+            if self._sending_cells:
+                return
+            self._sending_cells = True
+        try:
+            loop.call_soon_threadsafe(page.run_task, self._send_cells)
+        except BaseException:
+            # e.g. the loop is closed: later calls must try again
+            with self._cells_lock:
+                self._sending_cells = False
+            raise
+
+    async def _send_cells(self):
+        # sends pending cell changes, one message at a time
+        try:
+            while True:
+                with self._cells_lock:
+                    pending = self._pending_cells
+                    if not pending:
+                        self._sending_cells = False
+                        return
+                    self._pending_cells = {}
+                await self._invoke_method(
+                    "update_cells",
+                    {
+                        "ids": [row_id for row_id, _ in pending],
+                        "columns": [column_index for _, column_index in pending],
+                        "values": list(pending.values()),
+                    },
+                )
+        except BaseException:
+            with self._cells_lock:
+                self._sending_cells = False
+            raise
+
+    def refresh_source(self):
+        """
+        Reloads the current window of rows from [`source`][(c).], after
+        calling [`DataTable2Source.refresh()`][(p).] to drop what the source
+        caches.
+
+        Call it after the source's data or [`row_count`][(p).DataTable2Source.]
+        has changed.
+        """
+        if self.source is None:
+            raise ValueError("source must be set to refresh it")
+        self.source.refresh()
+        self._source_rows.clear()
+        self._load_source_window(self.source_offset)
+        self.update()
+
+    def _load_source_window(self, start: int):
+        row_count = self.source.row_count
+        start = max(0, min(start, row_count - self.source_window_size))
+        stop = min(start + self.source_window_size, row_count)
+
+        # reuse rows that are already loaded, so that only the rows entering
+        # the window are built and sent to the client
+        rows = []
+        i = start
+        while i < stop:
+            row = self._source_rows.get(i)
+            if row is not None:
+                rows.append(row)
+                i += 1
+                continue
+            j = i + 1
+            while j < stop and j not in self._source_rows:
+                j += 1
+            rows.extend(self.source.get_rows(i, j - i))
+            i = j
+
+        self._source_rows = {start + i: row for i, row in enumerate(rows)}
+        self.rows = rows
+        self.source_offset = start
+        self.source_row_count = row_count
+
+    async def _trigger_event(self, event_name: str, event_data: Any):
+        if event_name in ("selection_row", "selection_all", "selection_rows"):
+            if self.selection is not None:
+                if event_name == "selection_row":
+                    self.selection.select(event_data["index"], event_data["selected"])
+                elif event_name == "selection_rows":
+                    if event_data.get("all") is True:
+                        self.selection.select_all()
+                    elif event_data.get("all") is False:
+                        self.selection.clear()
+                    for index in event_data["selected"]:
+                        self.selection.select(index)
+                    for index in event_data["deselected"]:
+                        self.selection.deselect(index)
+                elif event_data:
+                    self.selection.select_all()
+                else:
+                    self.selection.clear()
+                self.update()
+                await super()._trigger_event("selection_change", None)
+            return
+        if event_name == "metrics":
+            metrics = self._metrics
+            metrics.client_builds += event_data["builds"]
+            # build times are reported in microseconds
+            metrics.client_build_time += event_data["build_time"] / 1e6
+            metrics.client_max_build_time = max(
+                metrics.client_max_build_time, event_data["max_build_time"] / 1e6
+            )
+            metrics.client_rows_built += event_data["rows_built"]
+            metrics.client_row_cache_hits += event_data["cache_hits"]
+            if self.on_metrics is not None:
+                await super()._trigger_event("metrics", {"metrics": self.metrics})
+            return
+        if event_name in ("row_tap", "row_double_tap", "row_secondary_tap", "cell_tap"):
+            index = event_data["index"]
+            if self.source is not None:
+                row = self._source_rows.get(index)
+            else:
+                row = self.rows[index] if index < len(self.rows) else None
+                if self.groups is not None and self.groups._is_header(row):
+                    # header rows aren't data rows, and handle their own taps
+                    return
+            event_data = {
+                "index": index,
+                "row": row,
+                "key": row.key if row is not None else None,
+                "column_index": event_data.get("ci"),
+            }
+        elif event_name == "scroll":
+            index = self.page.session.index
+            event_data = {
+                "first": event_data["first"],
+                "last": event_data["last"],
+                "pixels": event_data["pixels"],
+                "first_row": index.get(event_data.get("first_id")),
+                "last_row": index.get(event_data.get("last_id")),
+            }
+        elif event_name == "request_rows":
+            if self.source is not None:
+                first, last = event_data["first"], event_data["last"]
+                margin = max(0, self.source_window_size - (last - first + 1)) // 2
+                self._load_source_window(first - margin)
+                self.update()
+            return
+        await super()._trigger_event(event_name, event_data)
+
+
+async def _chunks(
+    rows: Union[Iterable[ft.DataRow], AsyncIterable[ft.DataRow]], size: int
+) -> AsyncGenerator[list[ft.DataRow], None]:
+    chunk = []
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+                # let other tasks run between chunks
+                await asyncio.sleep(0)
+    if chunk:
+        yield chunk
+
+
+@functools.cache
+def _msgpack_encoder() -> Callable[[Any], Any]:
+    from flet.messaging.protocol import configure_encode_object_for_msgpack
+
+    return configure_encode_object_for_msgpack(ft.BaseControl)
+
+
+# one update in this many is measured by `_patch_size()`
+_BYTES_SAMPLE_INTERVAL = 10
+
+
+def _patch_size(patch: list) -> int:
+    # the size of a patch as encoded by flet's own protocol
+    import msgpack
+
+    return len(msgpack.packb(patch, default=_msgpack_encoder()))
+
+
+def _visible_cell_count(row: ft.DataRow) -> int:
+    values = getattr(row, "values", None)
+    if values is None:
+        return sum(1 for cell in row.cells if cell.visible)
+    return sum(1 for v in values if not isinstance(v, ft.DataCell) or v.visible)
+
+
+def _row_key(row: DataRow2) -> Hashable:
+    return row.key
+
+
+def _merge_row(row: DataRow2, new_row: DataRow2):
+    # copy only differing properties, so that only they are sent
+    for name in _merged_fields(type(new_row)):
+        value = getattr(new_row, name)
+        if getattr(row, name) != value:
+            setattr(row, name, value)
+    # `values` isn't sent itself, so it's skipped above, but the cell values
+    # sent for it are recomputed from it by the row
+    if new_row.values != row.values:
+        row.values = new_row.values
+
+
+@functools.cache
+def _merged_fields(cls: type) -> tuple[str, ...]:
+    return tuple(
+        f.name
+        for f in dataclasses.fields(cls)
+        if f.compare and "skip" not in f.metadata and not f.name.startswith("_")
+    )
+
+
+def _discard_skipped_changes(control: ft.BaseControl):
+    """
+    Drops tracked changes of fields marked with `skip` metadata.
+
+    Such fields hold Python-side objects, like [`DataTable2.source`][(p).],
+    which are never sent to the client and must not end up in update patches
+    when re-assigned.
+    """
+    changes = getattr(control, "__changes", None)
+    if changes:
+        for f in dataclasses.fields(control):
+            if "skip" in f.metadata:
+                changes.pop(f.name, None)
@@ -0,0 +1,56 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+__all__ = ["RangeFilter", "RowFilter", "ValuesFilter"]
+
+
+@dataclass
+class RangeFilter:
+    """
+    Keeps rows whose value in a column lies within a range.
+
+    Meant to be passed to [`DataTable2.filter()`][(p).]. Values of
+    [numeric][flet.DataColumn.numeric] columns are compared as numbers,
+    other values as text. Rows with empty cells never match.
+    """
+
+    column_index: int
+    """
+    Index of the filtered column.
+    """
+
+    min: Optional[Any] = None
+    """
+    Smallest value to keep, inclusive, or `None` for no lower bound.
+    """
+
+    max: Optional[Any] = None
+    """
+    Largest value to keep, inclusive, or `None` for no upper bound.
+    """
+
+
+@dataclass
+class ValuesFilter:
+    """
+    Keeps rows whose value in a column is one of the given values.
+
+    Meant to be passed to [`DataTable2.filter()`][(p).]. Values of
+    [numeric][flet.DataColumn.numeric] columns are compared as numbers,
+    other values as text. Include `None` in [`values`][(c).] to keep
+    rows with empty cells.
+    """
+
+    column_index: int
+    """
+    Index of the filtered column.
+    """
+
+    values: Iterable[Any]
+    """
+    Values to keep.
+    """
+
+
+RowFilter = Union[RangeFilter, ValuesFilter]
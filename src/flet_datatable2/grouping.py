@@ -0,0 +1,330 @@
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Any, Literal, Optional, Union
+
+import flet as ft
+
+from flet_datatable2._cells import cell_value, number_value
+from flet_datatable2.datarow2 import CellValue, DataRow2
+
+__all__ = ["Aggregate", "RowGroups"]
+
+Aggregate = Literal["sum", "avg", "count"]
+
+_AGGREGATES = ("sum", "avg", "count")
+
+
+class _Group:
+    __slots__ = ("counts", "expanded", "header", "key", "label", "rows", "sums")
+
+    def __init__(self, key: Hashable, aggregate_count: int, expanded: bool):
+        self.key = key
+        # rows by id, in the order they were added
+        self.rows: dict[int, ft.DataRow] = {}
+        # sums and counts of non-empty numeric values of aggregated columns
+        self.sums: list[Union[int, float]] = [0] * aggregate_count
+        self.counts = [0] * aggregate_count
+        self.expanded = expanded
+        self.header: Optional[DataRow2] = None
+        self.label: Optional[ft.Text] = None
+
+
+class RowGroups:
+    """
+    Rows of a [`DataTable2`][(p).] grouped by the values of a column, with
+    a collapsible header row per group showing aggregates of its rows.
+
+    Assigned to [`DataTable2.groups`][(p).], usually by
+    [`DataTable2.group_by()`][(p).], it takes over [`DataTable2.rows`][(p).],
+    which then holds the header row of each group followed by the rows of
+    the group if it's expanded. Rows of collapsed groups are not sent to
+    the client at all. Tapping a header row expands or collapses its group.
+
+    Aggregates are maintained incrementally: adding, removing or updating
+    a row adjusts the sums and counts of its group by the row's own values,
+    whatever the size of the group or of the table:
+
+    ```python
+    groups = table.group_by(1, aggregates={2: "sum", 3: "avg"})
+    ...
+    groups.add([new_row])
+    row.values[2] = 42
+    groups.update_rows([row])
+    table.update()
+    ```
+
+    Groups are shown in the order their first row was added.
+    """
+
+    def __init__(
+        self,
+        column_index: int,
+        aggregates: Optional[Mapping[int, Aggregate]] = None,
+        expanded: bool = True,
+    ):
+        """
+        Args:
+            column_index: Index of the column whose values group rows.
+            aggregates: Aggregates shown in header rows, by column index:
+                `"sum"` or `"avg"` of the numeric values of a column, or
+                `"count"` of its non-empty values.
+            expanded: Whether new groups are expanded.
+        """
+        aggregates = dict(aggregates or {})
+        for ci, aggregate in aggregates.items():
+            if aggregate not in _AGGREGATES:
+                raise ValueError(
+                    f"invalid aggregate {aggregate!r}, expected one of {_AGGREGATES}"
+                )
+            if ci == column_index:
+                raise ValueError("the grouping column can't be aggregated")
+        self.column_index = column_index
+        self.aggregates = aggregates
+        self.expanded = expanded
+        self._aggregate_columns = tuple(aggregates)
+        self._groups: dict[Hashable, _Group] = {}
+        # group and aggregated values of each row, by row id
+        self._members: dict[int, tuple[_Group, tuple]] = {}
+        self._changed: set[Hashable] = set()
+        self._version = 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of groups.
+        """
+        return len(self._groups)
+
+    def keys(self) -> list[Any]:
+        """
+        Returns the values of the grouping column identifying groups,
+        in display order.
+        """
+        return list(self._groups)
+
+    @property
+    def row_count(self) -> int:
+        """
+        Number of grouped rows, not counting header rows.
+        """
+        return len(self._members)
+
+    def rows(self, key: Any) -> list[ft.DataRow]:
+        """
+        Returns the rows of a group, in the order they were added.
+        """
+        return list(self._groups[key].rows.values())
+
+    def count(self, key: Any) -> int:
+        """
+        Returns the number of rows in a group.
+        """
+        return len(self._groups[key].rows)
+
+    def aggregate(self, key: Any, column_index: int) -> Optional[CellValue]:
+        """
+        Returns the value of an aggregate of a group, or `None` for the
+        average of a column without numeric values.
+        """
+        group = self._groups[key]
+        i = self._aggregate_columns.index(column_index)
+        return self._aggregate_value(group, i)
+
+    def _aggregate_value(self, group: _Group, i: int) -> Optional[CellValue]:
+        aggregate = self.aggregates[self._aggregate_columns[i]]
+        if aggregate == "sum":
+            return group.sums[i]
+        if aggregate == "count":
+            return group.counts[i]
+        return group.sums[i] / group.counts[i] if group.counts[i] else None
+
+    def add(self, rows: Iterable[ft.DataRow]):
+        """
+        Adds rows to the groups matching their values, creating new groups
+        as needed.
+        """
+        for row in rows:
+            if id(row) in self._members:
+                raise ValueError(f"{row} is already grouped")
+            self._add(row)
+        self._version += 1
+
+    def remove(self, rows: Iterable[ft.DataRow]):
+        """
+        Removes rows from their groups, dropping groups left empty.
+        """
+        for row in rows:
+            self._remove(row)
+        self._version += 1
+
+    def update_rows(self, rows: Iterable[ft.DataRow]):
+        """
+        Updates aggregates, and groups, of rows whose values have changed.
+        """
+        for row in rows:
+            group, values = self._members.get(id(row), (None, None))
+            if group is None or cell_value(row, self.column_index) != group.key:
+                # the row moves to another group
+                self._remove(row)
+                self._add(row)
+                continue
+            new_values = tuple(
+                self._aggregated_value(row, ci) for ci in self._aggregate_columns
+            )
+            if new_values != values:
+                _apply(group, values, -1)
+                _apply(group, new_values, 1)
+                self._members[id(row)] = (group, new_values)
+                self._changed.add(group.key)
+        self._version += 1
+
+    def _add(self, row: ft.DataRow):
+        key = cell_value(row, self.column_index)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group(
+                key, len(self._aggregate_columns), self.expanded
+            )
+        values = tuple(
+            self._aggregated_value(row, ci) for ci in self._aggregate_columns
+        )
+        _apply(group, values, 1)
+        group.rows[id(row)] = row
+        self._members[id(row)] = (group, values)
+        self._changed.add(key)
+
+    def _aggregated_value(self, row: ft.DataRow, column_index: int):
+        # the number a row adds to an aggregate, or None if it adds nothing
+        value = cell_value(row, column_index)
+        if self.aggregates[column_index] == "count":
+            return None if value is None or value == "" else 1
+        return number_value(value)
+
+    def _remove(self, row: ft.DataRow):
+        member = self._members.pop(id(row), None)
+        if member is None:
+            raise ValueError(f"{row} is not grouped")
+        group, values = member
+        _apply(group, values, -1)
+        del group.rows[id(row)]
+        if not group.rows:
+            del self._groups[group.key]
+        self._changed.add(group.key)
+
+    def expand(self, key: Any, expanded: bool = True):
+        """
+        Expands, or collapses, a group.
+        """
+        group = self._groups[key]
+        if group.expanded != expanded:
+            group.expanded = expanded
+            self._changed.add(key)
+            self._version += 1
+
+    def collapse(self, key: Any):
+        """
+        Collapses a group.
+        """
+        self.expand(key, False)
+
+    def toggle(self, key: Any):
+        """
+        Expands a collapsed group or collapses an expanded one.
+        """
+        self.expand(key, not self._groups[key].expanded)
+
+    def expand_all(self, expanded: bool = True):
+        """
+        Expands, or collapses, all groups.
+        """
+        for key in self._groups:
+            self.expand(key, expanded)
+
+    def collapse_all(self):
+        """
+        Collapses all groups.
+        """
+        self.expand_all(False)
+
+    def _all_rows(self) -> list[ft.DataRow]:
+        return [row for group in self._groups.values() for row in group.rows.values()]
+
+    def _display_rows(self, column_count: int) -> list[ft.DataRow]:
+        # only header rows of changed groups are refreshed
+        for key in self._changed:
+            group = self._groups.get(key)
+            if group is not None:
+                self._refresh_header(group, column_count)
+        self._changed.clear()
+        rows = []
+        for group in self._groups.values():
+            if group.header is None:
+                self._refresh_header(group, column_count)
+            rows.append(group.header)
+            if group.expanded:
+                rows.extend(group.rows.values())
+        return rows
+
+    def _order_within_groups(
+        self, rows: list[ft.DataRow], order: Iterable[int]
+    ) -> list[int]:
+        # `order` sorts indexes of `rows` across groups; it is applied within
+        # each group instead, keeping each header row first
+        headers = {}
+        group_rows = {}
+        for group in self._groups.values():
+            if group.header is not None:
+                headers[id(group.header)] = group
+            group_rows[group] = []
+        header_indexes = {}
+        for i in order:
+            row = rows[i]
+            member = self._members.get(id(row))
+            if member is not None:
+                group_rows[member[0]].append(i)
+            elif id(row) in headers:
+                header_indexes[headers[id(row)]] = i
+        result = []
+        for group, indexes in group_rows.items():
+            if group in header_indexes:
+                result.append(header_indexes[group])
+            result.extend(indexes)
+        return result
+
+    def _is_header(self, row: ft.DataRow) -> bool:
+        return any(g.header is row for g in self._groups.values())
+
+    def _header_indexes(self, rows: list[ft.DataRow]) -> list[int]:
+        headers = {id(g.header) for g in self._groups.values() if g.header is not None}
+        return [i for i, row in enumerate(rows) if id(row) in headers]
+
+    def _refresh_header(self, group: _Group, column_count: int):
+        label = (
+            f"{'▾' if group.expanded else '▸'} "
+            f"{'' if group.key is None else group.key} ({len(group.rows)})"
+        )
+        if group.header is None:
+            group.label = ft.Text(label, weight=ft.FontWeight.BOLD)
+            group.header = DataRow2(
+                values=[None] * column_count,
+                on_tap=lambda e, key=group.key: self._on_header_tap(e, key),
+            )
+        elif group.label.value != label:
+            group.label.value = label
+        values = [None] * column_count
+        if self.column_index < column_count:
+            values[self.column_index] = ft.DataCell(group.label)
+        for i, ci in enumerate(self._aggregate_columns):
+            if ci < column_count:
+                values[ci] = self._aggregate_value(group, i)
+        group.header.values = values
+
+    def _on_header_tap(self, e: ft.ControlEvent, key: Any):
+        self.toggle(key)
+        e.control.parent.update()
+
+
+def _apply(group: _Group, values: tuple, sign: int):
+    # adds, or subtracts, the values of a row to the aggregates of its group
+    for i, value in enumerate(values):
+        if value is not None:
+            group.sums[i] += sign * value
+            group.counts[i] += sign
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+
+__all__ = ["TableMetrics"]
+
+
+@dataclass
+class TableMetrics:
+    """
+    Performance counters of a [`DataTable2`][(p).], collected when
+    [`DataTable2.collect_metrics`][(p).] is set.
+
+    Counters of updates are measured on the Python side for each update
+    of the table itself, including the updates sent by
+    [`DataTable2.batch()`][(p).], while counters prefixed with `client_`
+    are reported by the client every second at most.
+    See [`DataTable2.metrics`][(p).].
+    """
+
+    updates: int = 0
+    """
+    Number of updates of the table measured.
+    """
+
+    update_time: float = 0.0
+    """
+    Seconds spent by the last update, from syncing the table's state to
+    sending its patch.
+    """
+
+    sync_time: float = 0.0
+    """
+    Seconds spent by the last update syncing sorting, filters, groups,
+    selection and summaries before computing its patch.
+    """
+
+    rows_sent: int = 0
+    """
+    Number of rows added or changed by the last update.
+    """
+
+    cells_sent: int = 0
+    """
+    Number of cells of the rows added or changed by the last update.
+    """
+
+    bytes_sent: int = 0
+    """
+    Size of the patch of the last measured update, encoded as sent to
+    the client.
+
+    Measuring an update encodes its patch a second time, so only the
+    first of every 10 updates is measured.
+    """
+
+    total_update_time: float = 0.0
+    """
+    Seconds spent by all updates.
+    """
+
+    total_rows_sent: int = 0
+    """
+    Number of rows added or changed by all updates.
+    """
+
+    total_cells_sent: int = 0
+    """
+    Number of cells sent by all updates.
+    """
+
+    total_bytes_sent: int = 0
+    """
+    Estimated size of all updates: the average size of measured updates
+    times the number of updates.
+    """
+
+    measured_updates: int = 0
+    """
+    Number of updates whose size was measured, see [`bytes_sent`][(c).].
+    """
+
+    measured_bytes: int = 0
+    """
+    Size of the measured updates.
+    """
+
+    client_builds: int = 0
+    """
+    Number of builds of the table reported by the client.
+    """
+
+    client_build_time: float = 0.0
+    """
+    Seconds spent by the client in those builds.
+    """
+
+    client_max_build_time: float = 0.0
+    """
+    Seconds spent by the client in its longest build.
+    """
+
+    client_rows_built: int = 0
+    """
+    Number of rows built by the client.
+    """
+
+    client_row_cache_hits: int = 0
+    """
+    Number of rows the client reused from previous builds rather than
+    building them again.
+    """
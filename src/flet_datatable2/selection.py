@@ -0,0 +1,177 @@
+from collections.abc import Iterator, Sequence
+
+from flet_datatable2 import _bitset as bitset
+
+__all__ = ["SelectionModel"]
+
+
+class SelectionModel:
+    """
+    Selected rows of a [`DataTable2`][(p).], stored as a compact bitset.
+
+    Assigned to [`DataTable2.selection`][(p).], it replaces the
+    [`selected`][flet.DataRow.selected] property of individual rows:
+    rows are referred to by their index in [`DataTable2.rows`][(p).], or
+    in [`DataTable2.source`][(p).], and the client renders row checkboxes
+    from the bitset, so that changing the selection of any number of rows
+    costs a single update.
+
+    When rows of [`DataTable2.rows`][(p).] move to other indexes, e.g.
+    with [`DataTable2.set_rows()`][(p).], the selection follows them on
+    the next update; rows added to the table are not selected. Sorting or
+    filtering a [`DataTable2.source`][(p).] clears the selection, since
+    rows are then only known by their index.
+
+    Selecting all rows and inverting the selection take constant time,
+    selecting a range of rows takes a single operation on the bitset,
+    and [`selected_count`][(c).] is maintained as rows are selected,
+    so it never requires a scan:
+
+    ```python
+    table.selection = SelectionModel()
+    ...
+    table.selection.select_all()
+    table.update()
+    ```
+    """
+
+    def __init__(self, row_count: int = 0):
+        """
+        Args:
+            row_count: Number of selectable rows. Kept in sync with the number
+                of rows by the table the model is assigned to.
+        """
+        # bit i is set if the selection state of row i is the opposite
+        # of `_inverted`, so that inverting doesn't touch the bits
+        self._bits = 0
+        self._inverted = False
+        self._set_bits = 0
+        self._row_count = row_count
+        self._version = 0
+
+    @property
+    def row_count(self) -> int:
+        """
+        Number of selectable rows.
+        """
+        return self._row_count
+
+    @property
+    def selected_count(self) -> int:
+        """
+        Number of selected rows.
+        """
+        if self._inverted:
+            return self._row_count - self._set_bits
+        return self._set_bits
+
+    def __len__(self) -> int:
+        return self.selected_count
+
+    def is_selected(self, index: int) -> bool:
+        """
+        Returns whether the row at `index` is selected.
+        """
+        return bool(self._bits >> index & 1) != self._inverted
+
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self._row_count and self.is_selected(index)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterates over indexes of selected rows, in ascending order.
+        """
+        data = self._bits.to_bytes((self._row_count + 7) >> 3, "little")
+        for byte_index, byte in enumerate(data):
+            if self._inverted:
+                byte ^= 0xFF
+            if byte:
+                start = byte_index << 3
+                for bit in range(min(8, self._row_count - start)):
+                    if byte >> bit & 1:
+                        yield start + bit
+
+    def select(self, index: int, selected: bool = True):
+        """
+        Selects, or deselects, the row at `index`.
+        """
+        self.select_range(index, index + 1, selected)
+
+    def deselect(self, index: int):
+        """
+        Deselects the row at `index`.
+        """
+        self.select_range(index, index + 1, False)
+
+    def toggle(self, index: int):
+        """
+        Toggles the selection of the row at `index`.
+        """
+        self.select(index, not self.is_selected(index))
+
+    def select_range(self, start: int, stop: int, selected: bool = True):
+        """
+        Selects, or deselects, rows from `start` to `stop`, exclusive.
+        """
+        if not 0 <= start <= stop <= self._row_count:
+            raise IndexError(
+                f"row range {start}:{stop} is out of range of {self._row_count} rows"
+            )
+        mask = ((1 << (stop - start)) - 1) << start
+        if selected != self._inverted:
+            self._set_bits += (mask & ~self._bits).bit_count()
+            self._bits |= mask
+        else:
+            self._set_bits -= (mask & self._bits).bit_count()
+            self._bits &= ~mask
+        self._version += 1
+
+    def select_all(self):
+        """
+        Selects all rows. Rows added afterwards are not selected.
+        """
+        self._bits = 0
+        self._set_bits = 0
+        self._inverted = True
+        self._version += 1
+
+    def clear(self):
+        """
+        Deselects all rows.
+        """
+        self._bits = 0
+        self._set_bits = 0
+        self._inverted = False
+        self._version += 1
+
+    def invert(self):
+        """
+        Selects unselected rows and deselects selected ones.
+        """
+        self._inverted = not self._inverted
+        self._version += 1
+
+    def _resize(self, row_count: int):
+        # drop the selection of rows that are gone
+        if row_count < self._row_count and self._bits >> row_count:
+            self._bits &= (1 << row_count) - 1
+            self._set_bits = self._bits.bit_count()
+        elif row_count > self._row_count and self._inverted:
+            # added rows are not selected, even after select_all()
+            self._bits |= ((1 << (row_count - self._row_count)) - 1) << self._row_count
+            self._set_bits += row_count - self._row_count
+        self._row_count = row_count
+        self._version += 1
+
+    def _remap(self, old_rows: Sequence, new_rows: Sequence):
+        # moves the selection of rows from their index in `old_rows` to
+        # their index in `new_rows`, by identity
+        selected = {id(old_rows[i]) for i in self if i < len(old_rows)}
+        self._bits = bitset.from_indexes(
+            (i for i, row in enumerate(new_rows) if id(row) in selected),
+            len(new_rows),
+        )
+        self._set_bits = self._bits.bit_count()
+        self._inverted = False
+        self._row_count = len(new_rows)
+        self._version += 1
@@ -0,0 +1,364 @@
+import sqlite3
+import threading
+from bisect import bisect_right
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from os import PathLike
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from flet_datatable2.datacolumn2 import DataColumn2
+from flet_datatable2.datarow2 import DataRow2
+from flet_datatable2.datasource import DataTable2Source
+from flet_datatable2.filters import RangeFilter, RowFilter
+
+__all__ = ["SqliteDataSource"]
+
+# declared column types with a numeric affinity, see
+# https://www.sqlite.org/datatype3.html#determination_of_column_affinity
+_NUMERIC_TYPES = ("INT", "REAL", "FLOA", "DOUB", "NUM", "DEC")
+
+
+class SqliteDataSource(DataTable2Source):
+    """
+    A data source reading rows from an SQLite table or query.
+
+    Sorting, filtering and paging are all done by SQLite: sorts become
+    `ORDER BY` clauses, [`RangeFilter`][(p).]s and [`ValuesFilter`][(p).]s
+    become `WHERE` clauses, and only the rows of the window rendered by
+    the table are read, so memory usage doesn't depend on the size of
+    the table:
+
+    ```python
+    source = SqliteDataSource("app.db", "events")
+    table = DataTable2(columns=source.columns, source=source)
+    for column in table.columns:
+        column.on_sort = lambda e: (table.sort_by(e.column_index, e.ascending),
+                                    table.update())
+    ```
+
+    Rows are paged with keyset pagination rather than with `OFFSET`: the
+    sort keys of rows at regular positions, bookmarks, are remembered and
+    a window of rows is read by seeking to the nearest bookmark before it,
+    which is a single index lookup when the sort columns are indexed.
+    Bookmarks are collected while scrolling; a jump far away from all of
+    them places bookmarks over the whole table first, in a single pass
+    reading only the sort keys. Scrolling to any row then costs one seek
+    and skipping at most `bookmark_interval` rows.
+
+    Connections are opened read-only and kept in a small pool, each with
+    its own cache of prepared statements.
+
+    Note:
+        `NULL`s are sorted the way SQLite does, as the smallest values.
+
+    Note:
+        The number of rows and bookmarks are cached: call
+        [`DataTable2.refresh_source()`][(p).], or [`refresh()`][(c).],
+        after the database has changed.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, PathLike],
+        table_or_query: str,
+        key: Optional[str] = None,
+        pool_size: int = 2,
+        bookmark_interval: int = 1000,
+    ):
+        """
+        Args:
+            path: Path of the database file.
+            table_or_query: Name of a table, or a `SELECT` query.
+            key: A column uniquely identifying rows, used to order rows with
+                equal sort keys. Defaults to the `rowid` of the table.
+                Required for queries.
+            pool_size: Maximum number of idle connections kept open.
+            bookmark_interval: Number of rows between bookmarks.
+        """
+        source = table_or_query.strip()
+        self.is_query = source.split(None, 1)[0].upper() in ("SELECT", "WITH")
+        if self.is_query:
+            if key is None:
+                raise ValueError("key is required when reading rows of a query")
+            self._from = f"({source})"
+        else:
+            self._from = _quote(source)
+        self.path = Path(path)
+        self.key = key or "rowid"
+        self.pool_size = pool_size
+        self.bookmark_interval = bookmark_interval
+        self._pool: list[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+
+        self.columns = self._read_columns(source)
+        self._names = [_quote(column.label) for column in self.columns]
+        # sort terms as (SQL expression, ascending), always ending with the key
+        self._order: list[tuple[str, bool]] = [(_quote(self.key), True)]
+        # filter conditions, joined with AND
+        self._conditions: list[str] = []
+        self._condition_params: list[Any] = []
+        self._row_count: Optional[int] = None
+        # sort keys of rows by position, at multiples of bookmark_interval
+        self._bookmarks: dict[int, tuple] = {}
+        self._bookmark_positions: list[int] = []
+        self._all_bookmarks = False
+        # sort keys of the last row read, for scrolling without a bookmark
+        self._last: Optional[tuple[int, tuple]] = None
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for connection in pool:
+            connection.close()
+
+    @contextmanager
+    def _connection(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._pool_lock:
+            connection = self._pool.pop() if self._pool else None
+        if connection is None:
+            connection = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+        try:
+            yield connection
+        finally:
+            with self._pool_lock:
+                if len(self._pool) < self.pool_size:
+                    self._pool.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def _read_columns(self, source: str) -> list[DataColumn2]:
+        with self._connection() as connection:
+            if not self.is_query:
+                info = connection.execute(
+                    f"PRAGMA table_info({_quote(source)})"
+                ).fetchall()
+                if not info:
+                    raise ValueError(f"table {source!r} doesn't exist")
+                return [
+                    DataColumn2(
+                        label=name,
+                        numeric=any(t in (decl or "").upper() for t in _NUMERIC_TYPES),
+                    )
+                    for _, name, decl, *_ in info
+                ]
+            # queries don't declare types: look at the values of the first row
+            cursor = connection.execute(f"SELECT * FROM {self._from} LIMIT 1")
+            row = cursor.fetchone() or ()
+            return [
+                DataColumn2(
+                    label=description[0],
+                    numeric=i < len(row)
+                    and isinstance(row[i], (int, float))
+                    and not isinstance(row[i], bool),
+                )
+                for i, description in enumerate(cursor.description)
+            ]
+
+    @property
+    def row_count(self) -> int:
+        if self._row_count is None:
+            with self._connection() as connection:
+                (self._row_count,) = connection.execute(
+                    f"SELECT count(*) FROM {self._from}{_where(self._conditions)}",
+                    self._condition_params,
+                ).fetchone()
+        return self._row_count
+
+    def get_rows(self, start: int, count: int) -> list[DataRow2]:
+        position, boundary = self._seek_position(start)
+        if (
+            start - position > self.bookmark_interval
+            and not self._all_bookmarks
+            and self.bookmark_interval > 0
+        ):
+            self._place_bookmarks()
+            position, boundary = self._seek_position(start)
+
+        order_size = len(self._order)
+        sql = (
+            f"SELECT {', '.join(e for e, _ in self._order)}, {', '.join(self._names)} "
+            f"FROM {self._from}"
+        )
+        conditions = list(self._conditions)
+        params = list(self._condition_params)
+        if boundary is not None:
+            seek, seek_params = _seek_condition(self._order, boundary)
+            conditions.append(seek)
+            params.extend(seek_params)
+        sql += _where(conditions)
+        sql += f" ORDER BY {_order_by(self._order)} LIMIT ? OFFSET ?"
+        params.extend((count, start - position))
+
+        with self._connection() as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        interval = self.bookmark_interval
+        for i, row in enumerate(rows, start):
+            if interval > 0 and i % interval == 0 and i not in self._bookmarks:
+                self._add_bookmark(i, row[:order_size])
+        if rows:
+            self._last = (start + len(rows) - 1, rows[-1][:order_size])
+        return [
+            DataRow2(values=[_cell_value(v) for v in row[order_size:]]) for row in rows
+        ]
+
+    def _seek_position(self, start: int) -> tuple[int, Optional[tuple]]:
+        # the closest row at or before `start` whose sort keys are known
+        position, boundary = 0, None
+        i = bisect_right(self._bookmark_positions, start)
+        if i:
+            position = self._bookmark_positions[i - 1]
+            boundary = self._bookmarks[position]
+        if self._last is not None and position < self._last[0] <= start:
+            position, boundary = self._last
+        return position, boundary
+
+    def _add_bookmark(self, position: int, keys: tuple):
+        self._bookmarks[position] = keys
+        i = bisect_right(self._bookmark_positions, position)
+        self._bookmark_positions.insert(i, position)
+
+    def _place_bookmarks(self):
+        keys = ", ".join(e for e, _ in self._order)
+        sql = (
+            f"SELECT * FROM (SELECT {keys}, "
+            f"row_number() OVER (ORDER BY {_order_by(self._order)}) - 1 AS _position "
+            f"FROM {self._from}{_where(self._conditions)}) "
+            "WHERE _position % ? = 0"
+        )
+        with self._connection() as connection:
+            rows = connection.execute(
+                sql, [*self._condition_params, self.bookmark_interval]
+            ).fetchall()
+        self._bookmarks = {row[-1]: tuple(row[:-1]) for row in rows}
+        self._bookmark_positions = sorted(self._bookmarks)
+        self._all_bookmarks = True
+
+    def refresh(self):
+        """
+        Drops the cached number of rows and bookmarks, read again from
+        the database as needed.
+        """
+        self._row_count = None
+        self._reset_positions()
+
+    def _reset_positions(self):
+        self._bookmarks = {}
+        self._bookmark_positions = []
+        self._all_bookmarks = False
+        self._last = None
+
+    def sort(self, column_index: int, ascending: bool):
+        """
+        Sorts the rows by a column with `ORDER BY`.
+        """
+        self.sort_by_columns([(column_index, ascending)])
+
+    def sort_by_columns(self, columns: Sequence[tuple[int, bool]]):
+        """
+        Sorts the rows by multiple columns with `ORDER BY`.
+        """
+        self._order = [(self._names[ci], bool(asc)) for ci, asc in columns]
+        self._order.append((_quote(self.key), True))
+        self._reset_positions()
+
+    def filter(self, filters: Sequence[RowFilter]):
+        """
+        Keeps rows matching all `filters` with `WHERE`.
+        """
+        conditions = []
+        params: list[Any] = []
+        for f in filters:
+            name = self._names[f.column_index]
+            if isinstance(f, RangeFilter):
+                condition = f"{name} IS NOT NULL"
+                if f.min is not None:
+                    condition += f" AND {name} >= ?"
+                    params.append(f.min)
+                if f.max is not None:
+                    condition += f" AND {name} <= ?"
+                    params.append(f.max)
+            else:
+                values = list(dict.fromkeys(f.values))
+                present = [v for v in values if v is not None]
+                condition = f"{name} IN ({', '.join('?' * len(present))})"
+                params.extend(present)
+                if len(present) < len(values):
+                    condition += f" OR {name} IS NULL"
+            conditions.append(condition)
+        self._conditions = conditions
+        self._condition_params = params
+        self._row_count = None
+        self._reset_positions()
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _where(conditions: Sequence[str]) -> str:
+    if not conditions:
+        return ""
+    return " WHERE " + " AND ".join(f"({c})" for c in conditions)
+
+
+def _order_by(order: Sequence[tuple[str, bool]]) -> str:
+    return ", ".join(f"{e} {'ASC' if asc else 'DESC'}" for e, asc in order)
+
+
+def _seek_condition(
+    order: Sequence[tuple[str, bool]], boundary: tuple
+) -> tuple[str, list[Any]]:
+    """
+    Returns a condition matching rows at or after the row with the given
+    sort keys, in the given order, where `NULL` is the smallest value.
+    """
+    alternatives = []
+    params: list[Any] = []
+    equal = []
+    equal_params: list[Any] = []
+    for expression, ascending in order[: len(boundary)]:
+        value = boundary[len(equal)]
+        if value is None:
+            after = f"{expression} IS NOT NULL" if ascending else None
+            after_params = []
+        else:
+            after = (
+                f"{expression} > ?"
+                if ascending
+                else f"({expression} < ? OR {expression} IS NULL)"
+            )
+            after_params = [value]
+        if after is not None:
+            alternatives.append(" AND ".join([*equal, after]))
+            params.extend(equal_params + after_params)
+        equal.append(f"{expression} IS ?")
+        equal_params.append(value)
+    alternatives.append(" AND ".join(equal))
+    params.extend(equal_params)
+    condition = " OR ".join(f"({a})" for a in alternatives)
+
+    # a range on the first sort column lets SQLite seek in its index
+    expression, ascending = order[0]
+    if boundary[0] is not None:
+        if ascending:
+            condition = f"{expression} >= ? AND ({condition})"
+        else:
+            condition = f"({expression} <= ? OR {expression} IS NULL) AND ({condition})"
+        params.insert(0, boundary[0])
+    return condition, params
+
+
+def _cell_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
@@ -0,0 +1,393 @@
+import datetime
+import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Callable, Optional, Union
+
+from flet_datatable2._cells import sort_key
+from flet_datatable2._sort_index import SortColumn, SortIndex
+from flet_datatable2.datacolumn2 import DataColumn2
+from flet_datatable2.datarow2 import DataRow2
+from flet_datatable2.datasource import DataTable2Source
+from flet_datatable2.filters import RangeFilter, RowFilter
+
+__all__ = ["TableModel"]
+
+ColumnKey = Union[DataColumn2, int]
+
+
+class TableModel(DataTable2Source):
+    """
+    A column-oriented store of table data, generating rows lazily.
+
+    Values of [numeric][flet.DataColumn.numeric] columns are kept in compact
+    [`array`][array.array] buffers of 64-bit integers, or floats once a
+    column holds a non-integer value, and values of other columns in plain lists,
+    so that the model costs about as much memory as the raw data. Missing
+    values (`None`) of numeric columns are stored as NaN in float buffers,
+    and as 0 flagged in a bitmask in integer buffers, which thus stay
+    integers, and are read back as `None`.
+    [`DataRow2`][(p).]s are only created for the rows that are actually
+    rendered, when the model is bound to a table via
+    [`DataTable2.source`][(p).]:
+
+    ```python
+    model = TableModel(columns, {name_column: names, age_column: ages})
+    table = DataTable2(columns=model.columns, source=model)
+    ```
+
+    Columns are referred to either by their [`DataColumn2`][(p).] instance
+    or by their index in [`columns`][(c).].
+
+    Note:
+        Call [`DataTable2.refresh_source()`][(p).] after modifying
+        the data of a model bound to a table.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[DataColumn2],
+        data: Optional[Mapping[ColumnKey, Iterable[Any]]] = None,
+        row_builder: Optional[Callable[[int, list[Any]], DataRow2]] = None,
+    ):
+        """
+        Args:
+            columns: Columns of the model.
+            data: Initial values of the columns, by column. All columns
+                must have the same number of values. Columns missing here
+                are filled with `None`.
+            row_builder: A function creating a row from its index and values.
+                Defaults to rows showing the values as text, given as
+                [`DataRow2.values`][(p).].
+        """
+        self.columns = list(columns)
+        self.row_builder = row_builder
+        self._column_indexes = {id(c): i for i, c in enumerate(self.columns)}
+        self._buffers: list[Union[array, list]] = [
+            array("q") if column.numeric else [] for column in self.columns
+        ]
+        # missing values of integer buffers, as a bitmask with a bit per row
+        self._missing = [bytearray() for _ in self.columns]
+        self._row_count = 0
+        self._sort_index = SortIndex(self._extract_sort_keys)
+        self._sort_spec: Optional[tuple[SortColumn, ...]] = None
+        self._filters: tuple[RowFilter, ...] = ()
+        self._visible: Optional[list[int]] = None
+        if data:
+            self._load(data)
+
+    def _load(self, data: Mapping[ColumnKey, Iterable[Any]]):
+        counts = set()
+        for key, values in data.items():
+            i = self.column_index(key)
+            if self.columns[i].numeric:
+                # numeric sequences exposing the buffer protocol (arrays,
+                # NumPy arrays) are copied in bulk instead of value by value
+                buffer, self._missing[i] = _numeric_buffer(values)
+            else:
+                buffer = list(values)
+            self._buffers[i] = buffer
+            counts.add(len(buffer))
+        if len(counts) > 1:
+            raise ValueError("all columns must have the same number of values")
+        self._row_count = counts.pop()
+        for i, buffer in enumerate(self._buffers):
+            if len(buffer) < self._row_count:
+                if self.columns[i].numeric:
+                    for row_index in range(len(buffer), self._row_count):
+                        _mark(self._missing[i], row_index, True)
+                    buffer.extend([0] * (self._row_count - len(buffer)))
+                else:
+                    buffer.extend([None] * (self._row_count - len(buffer)))
+
+    @property
+    def row_count(self) -> int:
+        if self._filters:
+            return len(self._visible_rows())
+        return self._row_count
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def column_index(self, column: ColumnKey) -> int:
+        """
+        Returns the index of the given column in [`columns`][(c).].
+        """
+        if isinstance(column, int):
+            if not 0 <= column < len(self.columns):
+                raise IndexError(f"column index {column} is out of range")
+            return column
+        try:
+            return self._column_indexes[id(column)]
+        except KeyError:
+            raise ValueError(f"{column} is not a column of this model") from None
+
+    def column_values(self, column: ColumnKey) -> Union[array, list]:
+        """
+        Returns the buffer holding the values of the given column.
+
+        The buffer is returned as is, without copying. A numeric column's
+        buffer supports the buffer protocol and can be wrapped into a NumPy
+        array with `numpy.frombuffer()` without copying as well. Its missing
+        values are NaN in float buffers and 0 in integer ones, see
+        [`value()`][(c).].
+        """
+        return self._buffers[self.column_index(column)]
+
+    def value(self, row_index: int, column: ColumnKey) -> Any:
+        """
+        Returns the value of a single cell.
+        """
+        i = self.column_index(column)
+        return self._read(i, range(self._row_count)[row_index])
+
+    def set_value(self, row_index: int, column: ColumnKey, value: Any):
+        """
+        Sets the value of a single cell.
+        """
+        i = self.column_index(column)
+        row_index = range(self._row_count)[row_index]
+        value = self._stored(i, row_index, value)
+        try:
+            self._buffers[i][row_index] = value
+        except TypeError:
+            self._widen(i)[row_index] = value
+        self._sort_index.invalidate(i)
+        self._visible = None
+
+    def row_values(self, row_index: int) -> list[Any]:
+        """
+        Returns the values of a single row, in column order.
+        """
+        if not -self._row_count <= row_index < self._row_count:
+            raise IndexError(f"row index {row_index} is out of range")
+        row_index = range(self._row_count)[row_index]
+        return [self._read(i, row_index) for i in range(len(self._buffers))]
+
+    def append(self, values: Sequence[Any]):
+        """
+        Appends a row with the given values, in column order.
+        """
+        if len(values) != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} values, got {len(values)}")
+        for i, value in enumerate(values):
+            try:
+                value = self._stored(i, self._row_count, value)
+                try:
+                    self._buffers[i].append(value)
+                except TypeError:
+                    self._widen(i).append(value)
+            except (TypeError, OverflowError):
+                # keep columns aligned if the row is rejected half-way
+                for buffer in self._buffers[:i]:
+                    buffer.pop()
+                raise
+        self._row_count += 1
+        self._sort_index.clear()
+        self._visible = None
+
+    def extend(self, rows: Iterable[Sequence[Any]]):
+        """
+        Appends multiple rows, each given as values in column order.
+        """
+        for values in rows:
+            self.append(values)
+
+    def _stored(self, column_index: int, row_index: int, value: Any) -> Any:
+        # numeric columns store missing values as NaN in float buffers, and
+        # as 0 flagged in the column's mask in integer ones
+        buffer = self._buffers[column_index]
+        if not isinstance(buffer, array):
+            return value
+        if buffer.typecode == "d":
+            return math.nan if value is None else value
+        _mark(self._missing[column_index], row_index, value is None)
+        return 0 if value is None else value
+
+    def _read(self, column_index: int, row_index: int) -> Any:
+        value = self._buffers[column_index][row_index]
+        if isinstance(value, float):
+            return None if value != value else value
+        if _marked(self._missing[column_index], row_index):
+            return None
+        return value
+
+    def _widen(self, column_index: int) -> array:
+        # integer buffers turn into float ones on the first float value,
+        # their missing values into NaN
+        buffer = self._buffers[column_index]
+        if not isinstance(buffer, array) or buffer.typecode != "q":
+            raise TypeError(f"invalid value for column {self.columns[column_index]}")
+        widened = array("d", buffer)
+        missing = self._missing[column_index]
+        if any(missing):
+            for row_index in range(len(widened)):
+                if _marked(missing, row_index):
+                    widened[row_index] = math.nan
+        self._buffers[column_index] = widened
+        self._missing[column_index] = bytearray()
+        return widened
+
+    def refresh(self):
+        """
+        Drops cached sort orders and filter results, e.g. after buffers
+        returned by [`column_values()`][(c).] were modified in place.
+        """
+        self._sort_index.clear()
+        self._visible = None
+
+    def sort(self, column_index: int, ascending: bool):
+        """
+        Sorts the rows returned by [`get_rows()`][(c).] by a column.
+
+        The sort is stable and is kept up to date as the model's data
+        changes. The order of each column is computed once and cached
+        until the column's values change.
+        """
+        self.sort_by_columns([(column_index, ascending)])
+
+    def sort_by_columns(self, columns: Sequence[tuple[int, bool]]):
+        """
+        Sorts the rows returned by [`get_rows()`][(c).] by multiple columns,
+        given as `(column_index, ascending)` pairs, most significant first.
+
+        Sorts by multiple columns reuse the cached orders of each column.
+        """
+        self._sort_spec = tuple(
+            (self.column_index(ci), ascending, None) for ci, ascending in columns
+        )
+        self._visible = None
+
+    def filter(self, filters: Sequence[RowFilter]):
+        """
+        Restricts the rows returned by [`get_rows()`][(c).] and counted by
+        [`row_count`][(c).] to those matching all `filters`.
+
+        Numeric columns are searched by binary search in their cached sorted
+        order, and values looked up in a hash index of the column, so that
+        filtering doesn't scan the values of every row.
+        """
+        for f in filters:
+            self.column_index(f.column_index)
+        self._filters = tuple(filters)
+        self._visible = None
+
+    def _visible_rows(self) -> list[int]:
+        if self._visible is None:
+            matches = None
+            for f in self._filters:
+                rows = set(self._filter_matches(f))
+                matches = rows if matches is None else matches & rows
+            if self._sort_spec is None:
+                self._visible = sorted(matches)
+            else:
+                order = self._sort_index.order(self._sort_spec)
+                self._visible = [i for i in order if i in matches]
+        return self._visible
+
+    def _filter_matches(self, f: RowFilter) -> list[int]:
+        column_index = f.column_index
+        # keys of numeric buffers without missing values are the numbers
+        # themselves, which are never empty
+        raw = isinstance(self._sort_index.keys(column_index), array)
+        numeric = self.columns[column_index].numeric
+
+        def key(value):
+            return float(value) if raw else sort_key(value, numeric)
+
+        if isinstance(f, RangeFilter):
+            # (1,) sorts after all values, but before empty ones
+            no_max = None if raw else (1,)
+            return self._sort_index.range(
+                column_index,
+                None if f.min is None else key(f.min),
+                no_max if f.max is None else key(f.max),
+            )
+        return self._sort_index.lookup(
+            column_index, [key(v) for v in f.values if not (raw and v is None)]
+        )
+
+    def _extract_sort_keys(self, column_index: int, key: None) -> Sequence:
+        buffer = self._buffers[column_index]
+        if isinstance(buffer, array):
+            missing = self._missing[column_index]
+            if buffer.typecode == "q":
+                if not any(missing):
+                    # numbers compare as they are
+                    return buffer
+                # missing values sort last, like empty cells
+                return [
+                    (1, 0) if _marked(missing, i) else (0, v)
+                    for i, v in enumerate(buffer)
+                ]
+            if not any(v != v for v in buffer):
+                return buffer
+            return [(1, 0) if v != v else (0, v) for v in buffer]
+        numeric = self.columns[column_index].numeric
+        return [sort_key(v, numeric) for v in buffer]
+
+    def get_rows(self, start: int, count: int) -> list[DataRow2]:
+        stop = min(start + count, self._row_count)
+        build = self.row_builder or _build_text_row
+        if self._filters:
+            order = self._visible_rows()
+            stop = min(stop, len(order))
+        elif self._sort_spec is not None:
+            order = self._sort_index.order(self._sort_spec)
+        else:
+            return [build(i, self.row_values(i)) for i in range(start, stop)]
+        return [build(i, self.row_values(i)) for i in order[start:stop]]
+
+
+def _numeric_buffer(values: Iterable[Any]) -> tuple[array, bytearray]:
+    # returns the buffer holding values and the mask of its missing values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+    if view is not None and view.ndim == 1 and view.itemsize == 8:
+        typecode = {"d": "d", "q": "q", "l": "q"}.get(view.format)
+        if typecode is not None:
+            buffer = array(typecode)
+            buffer.frombytes(view.tobytes())
+            return buffer, bytearray()
+    values = list(values)
+    missing = bytearray()
+    try:
+        buffer = array("q", [0 if v is None else v for v in values])
+    except TypeError:
+        return array("d", [math.nan if v is None else v for v in values]), missing
+    for i, v in enumerate(values):
+        if v is None:
+            _mark(missing, i, True)
+    return buffer, missing
+
+
+def _mark(mask: bytearray, index: int, missing: bool):
+    # sets, or clears, the bit of a row in a mask of missing values, which
+    # only grows as far as its last set bit
+    byte = index >> 3
+    if byte >= len(mask):
+        if not missing:
+            return
+        mask.extend(bytes(byte + 1 - len(mask)))
+    if missing:
+        mask[byte] |= 1 << (index & 7)
+    else:
+        mask[byte] &= ~(1 << (index & 7))
+
+
+def _marked(mask: bytearray, index: int) -> bool:
+    byte = index >> 3
+    return byte < len(mask) and bool(mask[byte] >> (index & 7) & 1)
+
+
+def _build_text_row(index: int, values: list[Any]) -> DataRow2:
+    return DataRow2(
+        values=[
+            v
+            if v is None or isinstance(v, (str, int, float, bool, datetime.date))
+            else str(v)
+            for v in values
+        ]
+    )
@@ -0,0 +1,188 @@
+import 'dart:async';
+
+import 'package:data_table_2/data_table_2.dart';
+import 'package:flet/flet.dart';
+import 'package:flutter/material.dart';
+
+import 'utils/datatable.dart';
+
+class AsyncPaginatedDataTable2Control extends StatefulWidget {
+  final Control control;
+
+  const AsyncPaginatedDataTable2Control({
+    super.key,
+    required this.control,
+  });
+
+  @override
+  State<AsyncPaginatedDataTable2Control> createState() =>
+      _AsyncPaginatedDataTable2ControlState();
+}
+
+// Requests pages from Python and resolves them once Python has
+// published the answer to the matching request.
+class _PythonDataSource extends AsyncDataTableSource {
+  _PythonDataSource(this.fetchPage);
+
+  final Future<AsyncRowsResponse> Function(int startIndex, int count)
+      fetchPage;
+
+  @override
+  Future<AsyncRowsResponse> getRows(int startIndex, int count) =>
+      fetchPage(startIndex, count);
+}
+
+class _AsyncPaginatedDataTable2ControlState
+    extends State<AsyncPaginatedDataTable2Control> {
+  late final _PythonDataSource _source = _PythonDataSource(_fetchPage);
+  final Map<int, Completer<AsyncRowsResponse>> _pendingPages = {};
+  int _lastRequestId = 0;
+  String? _sortSignature;
+
+  @override
+  void initState() {
+    super.initState();
+    widget.control.addInvokeMethodListener(_invokeMethod);
+  }
+
+  @override
+  void dispose() {
+    widget.control.removeInvokeMethodListener(_invokeMethod);
+    _source.dispose();
+    super.dispose();
+  }
+
+  Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    switch (name) {
+      case "refresh":
+        _source.refreshDatasource();
+        break;
+      default:
+        throw Exception("Unknown AsyncPaginatedDataTable2 method: $name");
+    }
+  }
+
+  Future<AsyncRowsResponse> _fetchPage(int startIndex, int count) {
+    var requestId = ++_lastRequestId;
+    var completer = Completer<AsyncRowsResponse>();
+    // Python keeps the answers to the requests still pending only
+    var pending = _pendingPages.keys.toList();
+    _pendingPages[requestId] = completer;
+    widget.control.triggerEvent("fetch_page", {
+      "id": requestId,
+      "start": startIndex,
+      "count": count,
+      "pending": pending
+    });
+    return completer.future;
+  }
+
+  // Completes the pending requests Python has published an answer to.
+  void _completePendingPages() {
+    if (!mounted) {
+      return;
+    }
+    List<CellFormatter?>? formatters;
+    for (var page in widget.control.children("pages")) {
+      // requests served the same page share its answer
+      var completers = (page.get<List>("request_ids") ?? const [])
+          .map((id) => _pendingPages.remove(id))
+          .whereType<Completer<AsyncRowsResponse>>()
+          .toList();
+      if (completers.isEmpty) {
+        continue;
+      }
+      var error = page.getString("error");
+      if (error != null) {
+        for (var completer in completers) {
+          completer.completeError(error);
+        }
+        continue;
+      }
+      formatters ??=
+          widget.control.children("columns").map(columnFormatter).toList();
+      var rows = page
+          .children("rows")
+          .map((row) => buildDataRow(context, row, formatters: formatters))
+          .toList();
+      for (var completer in completers) {
+        completer.complete(AsyncRowsResponse(page.getInt("total", 0)!, rows));
+      }
+    }
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    WidgetsBinding.instance.addPostFrameCallback((_) => _completePendingPages());
+
+    // pages are fetched with the current sorting, so they must be
+    // re-requested whenever it changes
+    var sortColumnIndex = widget.control.getInt("sort_column_index");
+    var sortAscending = widget.control.getBool("sort_ascending", false)!;
+    var sortSignature = "$sortColumnIndex:$sortAscending";
+    if (_sortSignature != null && _sortSignature != sortSignature) {
+      WidgetsBinding.instance
+          .addPostFrameCallback((_) => _source.refreshDatasource());
+    }
+    _sortSignature = sortSignature;
+
+    var table = AsyncPaginatedDataTable2(
+      source: _source,
+      columns: widget.control
+          .children("columns")
+          .map((column) => buildDataColumn(context, column))
+          .toList(),
+      sortColumnIndex: sortColumnIndex,
+      sortAscending: sortAscending,
+      rowsPerPage: widget.control.getInt("rows_per_page", 10)!,
+      availableRowsPerPage: widget.control
+              .get<List>("available_rows_per_page")
+              ?.map((value) => parseInt(value, 10)!)
+              .toList() ??
+          const [10, 20, 50, 100],
+      onRowsPerPageChanged: (value) {
+        if (value != null) {
+          widget.control
+              .updateProperties({"rows_per_page": value}, notify: true);
+        }
+      },
+      onPageChanged: widget.control.getBool("on_page_change", false)!
+          ? (rowIndex) => widget.control.triggerEvent("page_change", rowIndex)
+          : null,
+      showFirstLastButtons:
+          widget.control.getBool("show_first_last_buttons", false)!,
+      wrapInCard: widget.control.getBool("wrap_in_card", true)!,
+      showCheckboxColumn:
+          widget.control.getBool("show_checkbox_column", false)!,
+      onSelectAll: widget.control.getBool("on_select_all", false)!
+          ? (bool? selected) =>
+              widget.control.triggerEvent("select_all", selected)
+          : null,
+      minWidth: widget.control.getDouble("min_width"),
+      empty: widget.control.buildWidget("empty"),
+      dataRowHeight: widget.control.getDouble("data_row_height"),
+      headingRowHeight: widget.control.getDouble("heading_row_height", 56)!,
+      headingRowColor: widget.control
+          .getWidgetStateColor("heading_row_color", Theme.of(context)),
+      horizontalMargin: widget.control.getDouble("horizontal_margin", 24)!,
+      columnSpacing: widget.control.getDouble("column_spacing", 56)!,
+      checkboxHorizontalMargin:
+          widget.control.getDouble("checkbox_horizontal_margin"),
+      fixedLeftColumns: widget.control.getInt("fixed_left_columns", 0)!,
+      fixedTopRows: widget.control.getInt("fixed_top_rows", 1)!,
+      smRatio: widget.control.getDouble("sm_ratio", 0.67)!,
+      lmRatio: widget.control.getDouble("lm_ratio", 1.2)!,
+      sortArrowIcon:
+          widget.control.getIconData("sort_arrow_icon") ?? Icons.arrow_upward,
+      sortArrowAnimationDuration: widget.control.getDuration(
+          "sort_arrow_animation_duration", Duration(microseconds: 150))!,
+      isHorizontalScrollBarVisible:
+          widget.control.getBool("visible_horizontal_scroll_bar"),
+      isVerticalScrollBarVisible:
+          widget.control.getBool("visible_vertical_scroll_bar"),
+      errorBuilder: (error) => Center(child: Text(error.toString())),
+    );
+
+    return ConstrainedControl(control: widget.control, child: table);
+  }
+}
@@ -1,9 +1,15 @@
+import 'dart:async';
+import 'dart:math';
+
+import 'package:collection/collection.dart';
 import 'package:data_table_2/data_table_2.dart';
 import 'package:flet/flet.dart' as ft;
 import 'package:flet/flet.dart';
 import 'package:flutter/material.dart';
 
 import 'utils/datatable.dart';
+import 'utils/events.dart';
+import 'utils/row_heights.dart';
 
 class DataTable2Control extends StatefulWidget {
   final Control control;
@@ -17,20 +23,717 @@ class DataTable2Control extends StatefulWidget {
   State<DataTable2Control> createState() => _DataTable2ControlState();
 }
 
+// A built row along with the inputs it was built from.
+class _CachedRow {
+  final Control control;
+  final int index;
+  final bool? selected;
+  final DataRow row;
+
+  _CachedRow(this.control, this.index, this.selected, this.row);
+}
+
 class _DataTable2ControlState extends State<DataTable2Control> {
-  //final ScrollController _horizontalController = ScrollController();
-  //final ScrollController _controller = ScrollController();
+  final ScrollController _horizontalController = ScrollController();
+  final ScrollController _footerHorizontalController = ScrollController();
+  final ScrollController _controller = ScrollController();
+  int? _requestedFirstRow;
+
+  // Heights of the rows shown, in display order, mapping rows to scroll
+  // offsets and back, with the rows they were indexed from and their
+  // positions by row id. Heights of rows changed since the last build are
+  // updated in place, and the index is only rebuilt when rows change.
+  RowHeights _rowHeights = RowHeights(const []);
+  List<Control> _heightRows = const [];
+  Map<int, int> _rowPositions = const {};
+  final Set<int> _changedRows = {};
+  double? _defaultRowHeight;
+
+  // Throttle of "scroll" events, over "scroll_interval", and the first and
+  // last visible rows last reported.
+  final EventThrottle _scrollThrottle = EventThrottle();
+  (int, int)? _reportedScroll;
+
+  // Columns whose cells are built when "virtualize_columns" is set: fixed
+  // left columns and those in or near the horizontal viewport. All rows
+  // are rebuilt when it changes.
+  List<bool>? _shownColumns;
+
+  // Values of cells changed by update_cells(), by row id and column, which
+  // cells listen to so that a change only rebuilds its cell. Dropped when
+  // their row changes. Rows are rebuilt when the highlight of changed
+  // cells, a color and a duration, changes.
+  final Map<int, Map<int, ValueNotifier<Object?>>> _hotCells = {};
+  (Color?, Duration)? _cellFlash;
 
-  // @override
-  // void dispose() {
-  //   _horizontalController.dispose();
-  //   _controller.dispose();
-  //   super.dispose();
-  // }
+  // Whether the table is scrolled to its last row and should stay there
+  // as rows are added, when "tail" is set.
+  bool _followTail = true;
+
+  // Rows built by previous builds, by row id. An entry is dropped as soon
+  // as its row control, or any of its cells, changes, so that a build only
+  // rebuilds changed rows.
+  final Map<int, _CachedRow> _rowCache = {};
+  final Map<int, (Control, VoidCallback)> _rowListeners = {};
+
+  // Metrics of builds since they were last reported, when
+  // "collect_metrics" is set. Reports are sent every second at most.
+  bool _collectMetrics = false;
+  int _builds = 0;
+  int _buildTime = 0;
+  int _maxBuildTime = 0;
+  int _rowsBuilt = 0;
+  int _cacheHits = 0;
+  Timer? _metricsTimer;
+
+  // Formatters of columns rows were cached with; all rows are rebuilt
+  // when the format of a column changes.
+  List<CellFormatter?> _formatters = const [];
+
+  // Table-level row and cell events handled, as (tap, double tap,
+  // secondary tap, cell tap); all rows are rebuilt when they change.
+  (bool, bool, bool, bool) _rowEvents = (false, false, false, false);
+
+  // Throttle of tap down events of rows and cells, over "event_throttle_ms".
+  final EventThrottle _eventThrottle = EventThrottle();
+
+  // Selection changes not sent yet, merged over "event_throttle_ms", or
+  // 100 milliseconds, when "coalesce_selection" is set: whether all rows
+  // were selected or deselected, then changes of rows by index.
+  final EventThrottle _selectionThrottle = EventThrottle();
+  bool? _pendingSelectAll;
+  final Map<int, bool> _pendingSelection = {};
+
+  @override
+  void initState() {
+    super.initState();
+    _controller.addListener(_onScroll);
+    _horizontalController.addListener(_onHorizontalScroll);
+    widget.control.addInvokeMethodListener(_invokeMethod);
+  }
+
+  @override
+  void dispose() {
+    _horizontalController.removeListener(_onHorizontalScroll);
+    _horizontalController.dispose();
+    _footerHorizontalController.dispose();
+    _metricsTimer?.cancel();
+    _eventThrottle.dispose();
+    _selectionThrottle.dispose();
+    _scrollThrottle.dispose();
+    widget.control.removeInvokeMethodListener(_invokeMethod);
+    _controller.removeListener(_onScroll);
+    _controller.dispose();
+    for (var (row, listener) in _rowListeners.values) {
+      row.removeListener(listener);
+    }
+    super.dispose();
+  }
+
+  @override
+  void didChangeDependencies() {
+    super.didChangeDependencies();
+    // cached rows depend on the theme
+    _rowCache.clear();
+  }
+
+  Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    switch (name) {
+      case "rows_shown":
+        // rows sent before this call are already applied to the control,
+        // so they are shown once the next frame is drawn
+        var completer = Completer<void>();
+        WidgetsBinding.instance
+            .addPostFrameCallback((_) => completer.complete());
+        WidgetsBinding.instance.ensureVisualUpdate();
+        return completer.future;
+      case "scroll_to_row":
+        var position = args["index"] as int?;
+        var id = args["id"];
+        if (id != null) {
+          var index = _rowPositions[id];
+          position = index != null
+              ? widget.control.getInt("source_offset", 0)! + index
+              : null;
+        }
+        if (position == null || !_controller.hasClients) {
+          return null;
+        }
+        var scrollPosition = _controller.position;
+        var offset = _offsetOfRow(position).clamp(
+            scrollPosition.minScrollExtent, scrollPosition.maxScrollExtent);
+        var duration = parseDuration(args["duration"], Duration.zero)!;
+        if (duration == Duration.zero) {
+          _controller.jumpTo(offset);
+        } else {
+          await _controller.animateTo(offset,
+              duration: duration,
+              curve: parseCurve(args["curve"], Curves.ease)!);
+        }
+        return null;
+      case "update_cells":
+        _updateCells(args["ids"], args["columns"], args["values"]);
+        return null;
+      default:
+        throw Exception("Unknown DataTable2 method: $name");
+    }
+  }
+
+  double get _dataRowHeight =>
+      widget.control.getDouble("data_row_height") ?? kMinInteractiveDimension;
+
+  // Tracks whether the table is scrolled to its last row, reports the
+  // visible rows if "on_scroll" is set, and asks Python for a new window
+  // of source rows once the viewport leaves the currently loaded one.
+  void _onScroll() {
+    if (!_controller.hasClients) {
+      return;
+    }
+    var position = _controller.position;
+    _followTail = position.pixels >= position.maxScrollExtent - _dataRowHeight;
+    var rowCount = widget.control.getInt("source_row_count", 0)!;
+    var shownCount = rowCount > 0 ? rowCount : _rowHeights.length;
+    if (shownCount == 0) {
+      return;
+    }
+    var first = _rowAtOffset(position.pixels).clamp(0, shownCount - 1);
+    var last = _rowAtOffset(position.pixels + position.viewportDimension)
+        .clamp(0, shownCount - 1);
+    if (widget.control.getBool("on_scroll", false)!) {
+      var pixels = position.pixels;
+      _scrollThrottle.run("scroll", () => _reportScroll(first, last, pixels));
+    }
+    if (rowCount == 0) {
+      return;
+    }
+    var offset = widget.control.getInt("source_offset", 0)!;
+    var loaded = widget.control.children("rows").length;
+    if ((first >= offset && last < offset + loaded) ||
+        first == _requestedFirstRow) {
+      return;
+    }
+    _requestedFirstRow = first;
+    widget.control.triggerEvent("request_rows", {"first": first, "last": last});
+  }
+
+  void _reportScroll(int first, int last, double pixels) {
+    if (!mounted || _reportedScroll == (first, last)) {
+      return;
+    }
+    _reportedScroll = (first, last);
+    widget.control.triggerEvent("scroll", {
+      "first": first,
+      "last": last,
+      "pixels": pixels,
+      "first_id": _shownRow(first)?.id,
+      "last_id": _shownRow(last)?.id,
+    });
+  }
+
+  // Indexes the heights of [rows], the rows shown in display order.
+  void _syncRowHeights(List<Control> rows) {
+    var defaultHeight = _dataRowHeight;
+    double heightOf(Control row) =>
+        row.getDouble("specific_row_height") ?? defaultHeight;
+    var sameRows = rows.length == _heightRows.length &&
+        Iterable.generate(rows.length)
+            .every((i) => identical(rows[i], _heightRows[i]));
+    if (!sameRows || defaultHeight != _defaultRowHeight) {
+      _rowHeights = RowHeights([for (var row in rows) heightOf(row)]);
+      _heightRows = rows;
+      _rowPositions = {for (var (i, row) in rows.indexed) row.id: i};
+      _defaultRowHeight = defaultHeight;
+    } else {
+      for (var id in _changedRows) {
+        var index = _rowPositions[id];
+        if (index != null) {
+          _rowHeights.setHeight(index, heightOf(rows[index]));
+        }
+      }
+    }
+    _changedRows.clear();
+  }
+
+  // Scroll offset of the row at [position] among all rows shown, which
+  // in a source counts the rows before and after the loaded window.
+  double _offsetOfRow(int position) {
+    var before = widget.control.getInt("source_offset", 0)!;
+    if (position < before) {
+      return position * _dataRowHeight;
+    }
+    var offset = before * _dataRowHeight;
+    position -= before;
+    if (position <= _rowHeights.length) {
+      return offset + _rowHeights.offsetOf(position);
+    }
+    return offset +
+        _rowHeights.total +
+        (position - _rowHeights.length) * _dataRowHeight;
+  }
+
+  // Position of the row at scroll offset [pixels]; the inverse of
+  // [_offsetOfRow].
+  int _rowAtOffset(double pixels) {
+    var before = widget.control.getInt("source_offset", 0)!;
+    var windowStart = before * _dataRowHeight;
+    if (pixels < windowStart) {
+      return (pixels / _dataRowHeight).floor();
+    }
+    pixels -= windowStart;
+    var windowHeight = _rowHeights.total;
+    if (pixels < windowHeight || _rowHeights.length == 0) {
+      return before + _rowHeights.indexAt(pixels);
+    }
+    return before +
+        _rowHeights.length +
+        ((pixels - windowHeight) / _dataRowHeight).floor();
+  }
+
+  // The row control at [position], unless it's outside the loaded window.
+  Control? _shownRow(int position) {
+    var index = position - widget.control.getInt("source_offset", 0)!;
+    return index >= 0 && index < _heightRows.length ? _heightRows[index] : null;
+  }
+
+  // Applies cell changes sent by update_cells(), as parallel lists of row
+  // ids, column indexes and values, to the cell values of shown rows.
+  // Cells changed before only get their new value; other rows are rebuilt
+  // with cells listening to their values.
+  void _updateCells(List ids, List columns, List values) {
+    var rebuild = false;
+    for (var i = 0; i < ids.length; i++) {
+      var position = _rowPositions[ids[i]];
+      if (position == null) {
+        continue;
+      }
+      var row = _heightRows[position];
+      var cellValues = row.get<List>("cell_values");
+      int column = columns[i];
+      if (cellValues == null || column >= cellValues.length) {
+        continue;
+      }
+      // keeps the value for later builds of the row
+      cellValues[column] = values[i];
+      var cells = _hotCells.putIfAbsent(row.id, () => {});
+      var cell = cells[column];
+      if (cell != null) {
+        cell.value = values[i];
+      } else {
+        cells[column] = ValueNotifier(values[i]);
+        _rowCache.remove(row.id);
+        rebuild = true;
+      }
+    }
+    if (rebuild) {
+      setState(() {});
+    }
+  }
+
+  // Keeps the footer scrolled along with the table's columns, and builds
+  // the cells of columns scrolled into view.
+  void _onHorizontalScroll() {
+    if (_footerHorizontalController.hasClients &&
+        _horizontalController.hasClients) {
+      var position = _footerHorizontalController.position;
+      _footerHorizontalController.jumpTo(_horizontalController.offset
+          .clamp(position.minScrollExtent, position.maxScrollExtent));
+    }
+    _updateShownColumns();
+  }
+
+  void _updateShownColumns() {
+    if (mounted &&
+        _shownColumns != null &&
+        !const ListEquality<bool>().equals(
+            _columnsInView(widget.control.children("columns")),
+            _shownColumns)) {
+      setState(() {});
+    }
+  }
+
+  // Columns in or near the horizontal viewport, within half a viewport
+  // on either side, and fixed left columns, which are always shown.
+  //
+  // Columns are placed the way DataTable2 lays them out: columns with a
+  // "fixed_width" take that width, and the others share the rest of the
+  // scrolled width in proportion to their size, S columns taking
+  // "sm_ratio" and L columns "lm_ratio" times the width of M columns.
+  // Before the first layout, the table is assumed to span the screen.
+  List<bool> _columnsInView(List<Control> columns) {
+    var fixedLeft = widget.control.getInt("fixed_left_columns", 0)!;
+    double viewport, offset, scrolledWidth;
+    if (_horizontalController.hasClients) {
+      var position = _horizontalController.position;
+      viewport = position.viewportDimension;
+      offset = position.pixels;
+      scrolledWidth = position.maxScrollExtent + viewport;
+    } else {
+      viewport = MediaQuery.sizeOf(context).width;
+      offset = 0;
+      scrolledWidth =
+          max(viewport, widget.control.getDouble("min_width", 0)!);
+    }
+    var smRatio = widget.control.getDouble("sm_ratio", 0.67)!;
+    var lmRatio = widget.control.getDouble("lm_ratio", 1.2)!;
+    double ratio(Control column) =>
+        switch (parseColumnSize(column.getString("size"), ColumnSize.S)!) {
+          ColumnSize.S => smRatio,
+          ColumnSize.M => 1,
+          ColumnSize.L => lmRatio,
+        };
+    var fixedWidths = 0.0;
+    var ratios = 0.0;
+    for (var column in columns.skip(fixedLeft)) {
+      var fixedWidth = column.getDouble("fixed_width");
+      if (fixedWidth != null) {
+        fixedWidths += fixedWidth;
+      } else {
+        ratios += ratio(column);
+      }
+    }
+    var unit =
+        ratios > 0 ? max(0.0, scrolledWidth - fixedWidths) / ratios : 0.0;
+    var start = offset - viewport / 2;
+    var end = offset + viewport * 1.5;
+    var shown = List.filled(columns.length, true);
+    var x = 0.0;
+    for (var i = fixedLeft; i < columns.length; i++) {
+      var width =
+          columns[i].getDouble("fixed_width") ?? unit * ratio(columns[i]);
+      shown[i] = x + width >= start && x <= end;
+      x += width;
+    }
+    return shown;
+  }
+
+  // Drops rows hidden by filter(), given as a bitmap with a bit per row
+  // in the order of "rows", and starts a ring buffer of rows filled by
+  // append_rows() at its oldest row.
+  List<Control> _visibleRows(List<Control> rows) {
+    var visibility = widget.control.get("row_visibility");
+    var start = widget.control.getInt("ring_start", 0)!;
+    if (start >= rows.length) {
+      start = 0;
+    }
+    if (visibility is! List<int>) {
+      return start == 0
+          ? rows
+          : [...rows.sublist(start), ...rows.sublist(0, start)];
+    }
+    var visibleRows = <Control>[];
+    for (var k = 0; k < rows.length; k++) {
+      var i = (start + k) % rows.length;
+      if ((i >> 3) < visibility.length &&
+          (visibility[i >> 3] >> (i & 7)) & 1 == 1) {
+        visibleRows.add(rows[i]);
+      }
+    }
+    return visibleRows;
+  }
+
+  // Arranges rows in the order given by Python as a list of row ids,
+  // which allows sorting rows without re-sending them.
+  List<Control> _orderedRows() {
+    var rows = _visibleRows(widget.control.children("rows"));
+    var order = widget.control.get<List>("row_order");
+    if (order == null || order.isEmpty) {
+      if (widget.control.getBool("keyed_order", false)!) {
+        // positions assigned by set_rows(); rows without one go last,
+        // in list order, as the sort is stable
+        var sorted = rows.toList();
+        mergeSort<Control>(sorted, compare: (a, b) {
+          var aKey = a.getInt("order_key");
+          var bKey = b.getInt("order_key");
+          if (aKey == null || bKey == null) {
+            return (aKey == null ? 1 : 0) - (bKey == null ? 1 : 0);
+          }
+          return aKey.compareTo(bKey);
+        });
+        return sorted;
+      }
+      return rows;
+    }
+    var rowsById = {for (var row in rows) row.id: row};
+    var orderedRows = <Control>[];
+    for (var id in order) {
+      var row = rowsById.remove(id);
+      if (row != null) {
+        orderedRows.add(row);
+      }
+    }
+    // rows added after the order was computed go last
+    orderedRows.addAll(rowsById.values);
+    return orderedRows;
+  }
+
+  // Surrounds the loaded window of source rows with empty rows taking up
+  // the height of all rows before and after it.
+  List<DataRow> _withSourceSpacers(List<DataRow> rows, int columnCount) {
+    var rowCount = widget.control.getInt("source_row_count", 0)!;
+    if (rowCount == 0) {
+      return rows;
+    }
+    var offset = widget.control.getInt("source_offset", 0)!;
+    var after = rowCount - offset - rows.length;
+    DataRow2 spacer(String key, int count) => DataRow2(
+        key: ValueKey(key),
+        specificRowHeight: count * _dataRowHeight,
+        cells: List.generate(
+            columnCount, (_) => const DataCell(SizedBox.shrink())));
+    return [
+      if (offset > 0) spacer("source_before", offset),
+      ...rows,
+      if (after > 0) spacer("source_after", after),
+    ];
+  }
+
+  // Selection state of rows by their index in "rows" (or in the source),
+  // or null if the table has no selection model.
+  bool Function(int)? _selection() {
+    var bits = widget.control.get("selection_bits");
+    if (bits is! List<int>) {
+      return null;
+    }
+    var inverted = widget.control.getBool("selection_inverted", false)!;
+    return (index) {
+      var set = (index >> 3) < bits.length &&
+          (bits[index >> 3] >> (index & 7)) & 1 == 1;
+      return set != inverted;
+    };
+  }
+
+  DataRow _buildRow(BuildContext context, Control row, int index,
+      bool Function(int)? selection) {
+    var (tap, doubleTap, secondaryTap, cellTap) = _rowEvents;
+    void trigger(String name, [int? columnIndex]) =>
+        widget.control.triggerEvent(
+            name, {"index": index, if (columnIndex != null) "ci": columnIndex});
+    return buildDataRow(context, row,
+        formatters: _formatters,
+        selected: selection?.call(index),
+        onSelectChanged: selection != null
+            ? (selected) => _select(index, selected ?? false)
+            : null,
+        onTap: tap ? () => trigger("row_tap") : null,
+        onDoubleTap: doubleTap ? () => trigger("row_double_tap") : null,
+        onSecondaryTap:
+            secondaryTap ? () => trigger("row_secondary_tap") : null,
+        onCellTap: cellTap
+            ? (columnIndex) => trigger("cell_tap", columnIndex)
+            : null,
+        triggerTapDown: _eventThrottle.trigger,
+        shownColumns: _shownColumns,
+        hotCells: _hotCells[row.id],
+        flashColor: _cellFlash!.$1,
+        flashDuration: _cellFlash!.$2);
+  }
+
+  // Sends a change of the selection of the row at [index], or of all rows
+  // if null, merging it with other changes if "coalesce_selection" is set.
+  void _select(int? index, bool selected) {
+    if (!widget.control.getBool("coalesce_selection", false)!) {
+      if (index == null) {
+        widget.control.triggerEvent("selection_all", selected);
+      } else {
+        widget.control.triggerEvent(
+            "selection_row", {"index": index, "selected": selected});
+      }
+      return;
+    }
+    if (index == null) {
+      _pendingSelectAll = selected;
+      _pendingSelection.clear();
+    } else {
+      _pendingSelection[index] = selected;
+    }
+    _selectionThrottle.run("selection", _sendSelection);
+  }
+
+  void _sendSelection() {
+    widget.control.triggerEvent("selection_rows", {
+      if (_pendingSelectAll != null) "all": _pendingSelectAll,
+      "selected": [
+        for (var MapEntry(:key, :value) in _pendingSelection.entries)
+          if (value) key
+      ],
+      "deselected": [
+        for (var MapEntry(:key, :value) in _pendingSelection.entries)
+          if (!value) key
+      ],
+    });
+    _pendingSelectAll = null;
+    _pendingSelection.clear();
+  }
+
+  DataRow _cachedRow(BuildContext context, Control row, int index,
+      bool Function(int)? selection) {
+    var selected = selection?.call(index);
+    var cached = _rowCache[row.id];
+    if (cached != null &&
+        identical(cached.control, row) &&
+        cached.index == index &&
+        cached.selected == selected) {
+      if (_collectMetrics) {
+        _cacheHits++;
+      }
+      return cached.row;
+    }
+    if (_collectMetrics) {
+      _rowsBuilt++;
+    }
+    var built = _buildRow(context, row, index, selection);
+    _rowCache[row.id] = _CachedRow(row, index, selected, built);
+    var listening = _rowListeners[row.id];
+    if (listening == null || !identical(listening.$1, row)) {
+      listening?.$1.removeListener(listening.$2);
+      void listener() {
+        _rowCache.remove(row.id);
+        _changedRows.add(row.id);
+        _hotCells.remove(row.id);
+      }
+      row.addListener(listener);
+      _rowListeners[row.id] = (row, listener);
+    }
+    return built;
+  }
+
+  // Forgets cached rows that are no longer in the table.
+  void _pruneRowCache(List<Control> rows) {
+    if (_rowListeners.isEmpty) {
+      return;
+    }
+    var ids = {for (var row in rows) row.id};
+    _rowListeners.removeWhere((id, listening) {
+      if (ids.contains(id)) {
+        return false;
+      }
+      listening.$1.removeListener(listening.$2);
+      _rowCache.remove(id);
+      _hotCells.remove(id);
+      return true;
+    });
+  }
+
+  // Sort ranks (starting at 1) and directions by column index, when
+  // the table is sorted by multiple columns.
+  Map<int, (int, bool)> _sortRanks() {
+    var sortColumns = widget.control.get<List>("sort_columns");
+    if (sortColumns == null) {
+      return const {};
+    }
+    return {
+      for (var (rank, column) in sortColumns.indexed)
+        column[0] as int: (rank + 1, column[1] as bool)
+    };
+  }
+
+  // Builds the row of column summaries fixed under the table, as the heading
+  // row of a table without rows sharing the layout of the table's columns.
+  // The checkbox column, if shown, is replaced with an empty column as wide.
+  Widget _buildFooter(BuildContext context, List<Control> columnControls,
+      List<DataColumn2> columns, List values, bool checkboxColumn) {
+    var theme = Theme.of(context);
+    var horizontalMargin = widget.control.getDouble("horizontal_margin") ??
+        theme.dataTableTheme.horizontalMargin ??
+        24.0;
+    var checkboxWidth = (widget.control
+                .getDouble("checkbox_horizontal_margin") ??
+            theme.dataTableTheme.checkboxHorizontalMargin ??
+            horizontalMargin) +
+        Checkbox.width +
+        horizontalMargin / 2;
+    var footerColumns = [
+      if (checkboxColumn)
+        DataColumn2(label: const SizedBox.shrink(), fixedWidth: checkboxWidth),
+      for (var (i, column) in columns.indexed)
+        DataColumn2(
+            label: Text(
+                _formatSummary(
+                    columnControls[i], i < values.length ? values[i] : null),
+                overflow: TextOverflow.ellipsis),
+            size: column.size,
+            fixedWidth: column.fixedWidth,
+            numeric: column.numeric,
+            headingRowAlignment: column.headingRowAlignment),
+    ];
+    var height = widget.control.getDouble("heading_row_height") ??
+        theme.dataTableTheme.headingRowHeight ??
+        56.0;
+    return SizedBox(
+        height: height,
+        child: DataTable2(
+          horizontalScrollController: _footerHorizontalController,
+          columnSpacing: widget.control.getDouble("column_spacing"),
+          horizontalMargin: horizontalMargin,
+          minWidth: widget.control.getDouble("min_width"),
+          smRatio: widget.control.getDouble("sm_ratio", 0.67)!,
+          lmRatio: widget.control.getDouble("lm_ratio", 1.2)!,
+          fixedLeftColumns: widget.control.getInt("fixed_left_columns", 0)!,
+          fixedColumnsColor:
+              widget.control.getColor("fixed_columns_color", context),
+          fixedCornerColor:
+              widget.control.getColor("fixed_corner_color", context),
+          headingRowHeight: height,
+          headingRowColor: widget.control
+              .getWidgetStateColor("heading_row_color", Theme.of(context)),
+          headingTextStyle: widget.control
+              .getTextStyle("heading_text_style", Theme.of(context)),
+          headingRowDecoration: widget.control
+              .getBoxDecoration("heading_row_decoration", context),
+          dividerThickness: 0,
+          isHorizontalScrollBarVisible: false,
+          isVerticalScrollBarVisible: false,
+          showCheckboxColumn: false,
+          empty: const SizedBox.shrink(),
+          columns: footerColumns,
+          rows: const [],
+        ));
+  }
+
+  // Formats a summary with the format of its column, except for counts.
+  String _formatSummary(Control column, dynamic value) {
+    var formatter = column.getString("summary") != "count"
+        ? columnFormatter(column)
+        : null;
+    return (formatter ?? formatCellValue)(value);
+  }
+
+  void _recordBuild(int microseconds) {
+    _builds++;
+    _buildTime += microseconds;
+    if (microseconds > _maxBuildTime) {
+      _maxBuildTime = microseconds;
+    }
+    _metricsTimer ??= Timer(const Duration(seconds: 1), _reportMetrics);
+  }
+
+  void _reportMetrics() {
+    _metricsTimer = null;
+    if (!mounted || !widget.control.getBool("collect_metrics", false)!) {
+      return;
+    }
+    widget.control.triggerEvent("metrics", {
+      "builds": _builds,
+      "build_time": _buildTime,
+      "max_build_time": _maxBuildTime,
+      "rows_built": _rowsBuilt,
+      "cache_hits": _cacheHits,
+    });
+    _builds = _buildTime = _maxBuildTime = _rowsBuilt = _cacheHits = 0;
+  }
 
   @override
   Widget build(BuildContext context) {
-    debugPrint("DataTable2Control build: ${widget.control.id}");
+    _collectMetrics = widget.control.getBool("collect_metrics", false)!;
+    var stopwatch = _collectMetrics ? (Stopwatch()..start()) : null;
+    _requestedFirstRow = null;
+    if (widget.control.getBool("tail", false)! && _followTail) {
+      WidgetsBinding.instance.addPostFrameCallback((_) {
+        if (mounted && _controller.hasClients) {
+          _controller.jumpTo(_controller.position.maxScrollExtent);
+        }
+      });
+    }
 
     var bgColor = widget.control.getString("bgcolor");
     var border = widget.control.getBorder("border", Theme.of(context));
@@ -40,6 +743,48 @@ class _DataTable2ControlState extends State<DataTable2Control> {
         widget.control.getBorderSide("horizontal_lines", Theme.of(context));
     var verticalLines =
         widget.control.getBorderSide("vertical_lines", Theme.of(context));
+    var sortRanks = _sortRanks();
+    var selection = _selection();
+    var offset = widget.control.getInt("source_offset", 0)!;
+    var rows = widget.control.children("rows");
+    var rowIndexes = {for (var (i, row) in rows.indexed) row.id: i};
+    _pruneRowCache(rows);
+    var columnControls = widget.control.children("columns");
+    var formatters = columnControls.map(columnFormatter).toList();
+    if (!const ListEquality<CellFormatter?>()
+        .equals(formatters, _formatters)) {
+      _formatters = formatters;
+      _rowCache.clear();
+    }
+    var throttleMs = widget.control.getInt("event_throttle_ms");
+    _eventThrottle.interval = Duration(milliseconds: throttleMs ?? 0);
+    _selectionThrottle.interval = Duration(milliseconds: throttleMs ?? 100);
+    var shownColumns = widget.control.getBool("virtualize_columns", false)!
+        ? _columnsInView(columnControls)
+        : null;
+    if (!const ListEquality<bool>().equals(shownColumns, _shownColumns)) {
+      _shownColumns = shownColumns;
+      _rowCache.clear();
+    }
+    var cellFlash = (
+      widget.control.getColor("cell_flash_color", context),
+      widget.control.getDuration(
+          "cell_flash_duration", const Duration(milliseconds: 500))!
+    );
+    if (cellFlash != _cellFlash) {
+      _cellFlash = cellFlash;
+      _rowCache.clear();
+    }
+    var rowEvents = (
+      widget.control.getBool("on_row_tap", false)!,
+      widget.control.getBool("on_row_double_tap", false)!,
+      widget.control.getBool("on_row_secondary_tap", false)!,
+      widget.control.getBool("on_cell_tap", false)!
+    );
+    if (rowEvents != _rowEvents) {
+      _rowEvents = rowEvents;
+      _rowCache.clear();
+    }
     var defaultDecoration =
         Theme.of(context).dataTableTheme.decoration ?? const BoxDecoration();
 
@@ -55,9 +800,25 @@ class _DataTable2ControlState extends State<DataTable2Control> {
           gradient: gradient);
     }
 
+    var columns = columnControls.indexed.map((e) {
+      var (index, column) = e;
+      var (rank, ascending) = sortRanks[index] ?? (null, true);
+      return buildDataColumn(context, column,
+          sortRank: rank, sortAscending: ascending);
+    }).toList();
+    var orderedRows = _orderedRows();
+    _syncRowHeights(orderedRows);
+    _scrollThrottle.interval =
+        Duration(milliseconds: widget.control.getInt("scroll_interval", 100)!);
+    var dataRows = orderedRows
+        .map((row) =>
+            _cachedRow(context, row, offset + rowIndexes[row.id]!, selection))
+        .toList();
+    var showCheckboxColumn =
+        widget.control.getBool("show_checkbox_column", false)!;
+
     var datatable2 = DataTable2(
-      // scrollController: _controller,
-      // horizontalScrollController: _horizontalController,
+      horizontalScrollController: _horizontalController,
       decoration: decoration,
       border: (horizontalLines != null || verticalLines != null)
           ? TableBorder(
@@ -111,85 +872,48 @@ class _DataTable2ControlState extends State<DataTable2Control> {
       dividerThickness: widget.control.getDouble("divider_thickness"),
       horizontalMargin: widget.control.getDouble("horizontal_margin"),
       showBottomBorder: widget.control.getBool("show_bottom_border", false)!,
-      showCheckboxColumn:
-          widget.control.getBool("show_checkbox_column", false)!,
+      showCheckboxColumn: showCheckboxColumn,
       sortAscending: widget.control.getBool("sort_ascending", false)!,
       sortColumnIndex: widget.control.getInt("sort_column_index"),
-      onSelectAll: widget.control.getBool("on_select_all", false)!
-          ? (bool? selected) =>
-              widget.control.triggerEvent("select_all", selected)
-          : null,
-      columns: widget.control.children("columns").map((column) {
-        column.notifyParent = true;
-        var tooltip =
-            parseTooltip(column.get("tooltip"), context, const Placeholder());
-        return DataColumn2(
-            size: parseColumnSize(column.getString("size"), ColumnSize.S)!,
-            fixedWidth: column.getDouble("fixed_width"),
-            numeric: column.getBool("numeric", false)!,
-            tooltip: tooltip?.message,
-            headingRowAlignment:
-                column.getMainAxisAlignment("heading_row_alignment"),
-            onSort: column.getBool("on_sort", false)!
-                ? (columnIndex, ascending) => column
-                    .triggerEvent("sort", {"ci": columnIndex, "asc": ascending})
-                : null,
-            label: column.buildTextOrWidget("label")!);
-      }).toList(),
-      rows: widget.control.children("rows").map((row) {
-        row.notifyParent = true;
-        return DataRow2(
-          key: ValueKey(row.id),
-          selected: row.getBool("selected", false)!,
-          color: row.getWidgetStateColor("color", Theme.of(context)),
-          specificRowHeight: row.getDouble("specific_row_height"),
-          decoration: row.getBoxDecoration("decoration", context),
-          onSelectChanged: row.getBool("on_select_change", false)!
-              ? (selected) => row.triggerEvent("select_change", selected)
-              : null,
-          onLongPress: row.getBool("on_long_press", false)!
-              ? () => row.triggerEvent("long_press")
-              : null,
-          onDoubleTap: row.getBool("on_double_tap", false)!
-              ? () => row.triggerEvent("double_tap")
-              : null,
-          onTap: row.getBool("on_tap", false)!
-              ? () => row.triggerEvent("tap")
+      onSelectAll: selection != null
+          ? (bool? selected) => _select(null, selected ?? false)
+          : widget.control.getBool("on_select_all", false)!
+              ? (bool? selected) =>
+                  widget.control.triggerEvent("select_all", selected)
               : null,
-          onSecondaryTap: row.getBool("on_secondary_tap", false)!
-              ? () => row.triggerEvent("secondary_tap")
-              : null,
-          onSecondaryTapDown: row.getBool("on_secondary_tap_down", false)!
-              ? (details) =>
-                  row.triggerEvent("secondary_tap_down", details.toMap())
-              : null,
-          cells: row.children("cells").map((cell) {
-            cell.notifyParent = true;
-            return DataCell(
-              cell.buildWidget("content")!,
-              placeholder: cell.getBool("placeholder", false)!,
-              showEditIcon: cell.getBool("show_edit_icon", false)!,
-              onDoubleTap: cell.getBool("on_double_tap", false)!
-                  ? () => cell.triggerEvent("double_tap")
-                  : null,
-              onLongPress: cell.getBool("on_long_press", false)!
-                  ? () => cell.triggerEvent("long_press")
-                  : null,
-              onTap: cell.getBool("on_tap", false)!
-                  ? () => cell.triggerEvent("tap")
-                  : null,
-              onTapCancel: cell.getBool("on_tap_cancel", false)!
-                  ? () => cell.triggerEvent("tap_cancel")
-                  : null,
-              onTapDown: cell.getBool("on_tap_down", false)!
-                  ? (details) => cell.triggerEvent("tap_down", details.toMap())
-                  : null,
-            );
-          }).toList(),
-        );
-      }).toList(),
+      scrollController: _controller,
+      columns: columns,
+      rows: _withSourceSpacers(dataRows, columns.length),
     );
 
-    return ConstrainedControl(control: widget.control, child: datatable2);
+    Widget table = datatable2;
+    var footerValues = widget.control.get<List>("footer_values");
+    if (footerValues != null) {
+      table = Column(children: [
+        Expanded(child: datatable2),
+        _buildFooter(context, columnControls, columns, footerValues,
+            showCheckboxColumn &&
+                dataRows.any((row) => row.onSelectChanged != null)),
+      ]);
+    }
+
+    if (stopwatch != null) {
+      _recordBuild(stopwatch.elapsedMicroseconds);
+    }
+
+    if (shownColumns != null) {
+      // the scrolled width is only known once the table is laid out, and
+      // changes as it's resized
+      table = NotificationListener<ScrollMetricsNotification>(
+          onNotification: (notification) {
+            if (notification.metrics.axis == Axis.horizontal) {
+              _updateShownColumns();
+            }
+            return false;
+          },
+          child: table);
+    }
+
+    return ConstrainedControl(control: widget.control, child: table);
   }
 }
@@ -1,6 +1,7 @@
 import 'package:flet/flet.dart';
 import 'package:flutter/widgets.dart';
 
+import 'async_paginated_datatable2.dart';
 import 'datatable2.dart';
 
 class Extension extends FletExtension {
@@ -9,6 +10,8 @@ class Extension extends FletExtension {
     switch (control.type) {
       case "DataTable2":
         return DataTable2Control(key: key, control: control);
+      case "AsyncPaginatedDataTable2":
+        return AsyncPaginatedDataTable2Control(key: key, control: control);
       default:
         return null;
     }
@@ -1,5 +1,11 @@
 import 'package:collection/collection.dart';
 import 'package:data_table_2/data_table_2.dart';
+import 'package:flet/flet.dart';
+import 'package:flutter/foundation.dart';
+import 'package:flutter/material.dart';
+import 'package:intl/intl.dart';
+
+import 'events.dart';
 
 ColumnSize? parseColumnSize(String? size, [ColumnSize? defValue]) {
   if (size == null) {
@@ -9,3 +15,354 @@ ColumnSize? parseColumnSize(String? size, [ColumnSize? defValue]) {
           (e) => e.name.toLowerCase() == size.toLowerCase()) ??
       defValue;
 }
+
+/// Builds a column, decorating its label with a sort rank indicator
+/// if the table is sorted by multiple columns and [sortRank] is set.
+DataColumn2 buildDataColumn(BuildContext context, Control column,
+    {int? sortRank, bool sortAscending = true}) {
+  column.notifyParent = true;
+  var tooltip =
+      parseTooltip(column.get("tooltip"), context, const Placeholder());
+  Widget label = column.buildTextOrWidget("label")!;
+  if (sortRank != null) {
+    var style = Theme.of(context).textTheme.labelSmall;
+    label = Row(mainAxisSize: MainAxisSize.min, children: [
+      Flexible(child: label),
+      const SizedBox(width: 4),
+      // the primary column already shows the table's sort arrow
+      if (sortRank > 1)
+        Icon(sortAscending ? Icons.arrow_upward : Icons.arrow_downward,
+            size: style?.fontSize, color: style?.color),
+      Text("$sortRank", style: style),
+    ]);
+  }
+  return DataColumn2(
+      size: parseColumnSize(column.getString("size"), ColumnSize.S)!,
+      fixedWidth: column.getDouble("fixed_width"),
+      numeric: column.getBool("numeric", false)!,
+      tooltip: tooltip?.message,
+      headingRowAlignment: column.getMainAxisAlignment("heading_row_alignment"),
+      onSort: column.getBool("on_sort", false)!
+          ? (columnIndex, ascending) => column
+              .triggerEvent("sort", {"ci": columnIndex, "asc": ascending})
+          : null,
+      label: label);
+}
+
+/// Builds a row. [selected] and [onSelectChanged], if given, override
+/// the row's own selection state and handler. The tap handlers, if given,
+/// are delegated to the table and run after the row's own handlers.
+/// [onCellTap], if given, handles taps of cells without their own tap
+/// handler, by cell index, after the row's own tap handler, which the
+/// cell tap would otherwise hide. Plain cell values are
+/// formatted with [formatters], by column, if given. Tap down events of
+/// the row and its cells are sent through [triggerTapDown], if given,
+/// e.g. to throttle them. Cells of columns not in [shownColumns], if
+/// given, are left empty rather than built. Plain values of cells in
+/// [hotCells], by column, are taken from their listenable instead, and
+/// rebuilt on their own when it changes, flashing [flashColor].
+DataRow2 buildDataRow(BuildContext context, Control row,
+    {bool? selected,
+    ValueChanged<bool?>? onSelectChanged,
+    List<CellFormatter?>? formatters,
+    VoidCallback? onTap,
+    VoidCallback? onDoubleTap,
+    VoidCallback? onSecondaryTap,
+    ValueChanged<int>? onCellTap,
+    EventTrigger? triggerTapDown,
+    List<bool>? shownColumns,
+    Map<int, ValueListenable<Object?>>? hotCells,
+    Color? flashColor,
+    Duration flashDuration = const Duration(milliseconds: 500)}) {
+  row.notifyParent = true;
+  var triggerDown = triggerTapDown ?? _trigger;
+  VoidCallback? handler(String name) => row.getBool("on_$name", false)!
+      ? () => row.triggerEvent(name)
+      : null;
+  var tap = handler("tap");
+  if (tap != null && onCellTap != null) {
+    var cellTap = onCellTap;
+    onCellTap = (i) {
+      tap();
+      cellTap(i);
+    };
+  }
+  return DataRow2(
+    key: ValueKey(row.id),
+    selected: selected ?? row.getBool("selected", false)!,
+    color: row.getWidgetStateColor("color", Theme.of(context)),
+    specificRowHeight: row.getDouble("specific_row_height"),
+    decoration: row.getBoxDecoration("decoration", context),
+    onSelectChanged: onSelectChanged ??
+        (row.getBool("on_select_change", false)!
+            ? (selected) => row.triggerEvent("select_change", selected)
+            : null),
+    onLongPress: row.getBool("on_long_press", false)!
+        ? () => row.triggerEvent("long_press")
+        : null,
+    onDoubleTap: _chain(handler("double_tap"), onDoubleTap),
+    onTap: _chain(tap, onTap),
+    onSecondaryTap: _chain(handler("secondary_tap"), onSecondaryTap),
+    onSecondaryTapDown: row.getBool("on_secondary_tap_down", false)!
+        ? (details) =>
+            triggerDown(row, "secondary_tap_down", details.toMap())
+        : null,
+    cells: _buildCells(row, formatters, onCellTap, triggerDown, shownColumns,
+        hotCells, flashColor, flashDuration),
+  );
+}
+
+// Builds the cells of a row, either from its cell controls or, if set, from
+// its plain "cell_values", with cell controls at "cell_indexes".
+List<DataCell> _buildCells(
+    Control row,
+    List<CellFormatter?>? formatters,
+    ValueChanged<int>? onCellTap,
+    EventTrigger triggerTapDown,
+    List<bool>? shownColumns,
+    Map<int, ValueListenable<Object?>>? hotCells,
+    Color? flashColor,
+    Duration flashDuration) {
+  var cells = row.children("cells");
+  var values = row.get<List>("cell_values");
+  VoidCallback? cellTap(int i) =>
+      onCellTap != null ? () => onCellTap(i) : null;
+  CellFormatter format(int i) =>
+      formatters != null && i < formatters.length
+          ? formatters[i] ?? formatCellValue
+          : formatCellValue;
+  bool hidden(int i) =>
+      shownColumns != null && i < shownColumns.length && !shownColumns[i];
+  if (values == null) {
+    return [
+      for (var (i, cell) in cells.indexed)
+        hidden(i)
+            ? DataCell.empty
+            : _buildCell(cell, triggerTapDown, cellTap(i))
+    ];
+  }
+  var indexes = row.get<List>("cell_indexes") ?? const [];
+  var cellsByIndex = {
+    for (var (i, index) in indexes.indexed)
+      if (i < cells.length) index as int: cells[i]
+  };
+  return [
+    for (var (i, value) in values.indexed)
+      hidden(i)
+          ? DataCell.empty
+          : cellsByIndex.containsKey(i)
+              ? _buildCell(cellsByIndex[i]!, triggerTapDown, cellTap(i))
+              : DataCell(
+                  hotCells?[i] != null
+                      ? _HotCellText(
+                          value: hotCells![i]!,
+                          format: format(i),
+                          flashColor: flashColor,
+                          flashDuration: flashDuration)
+                      : Text(format(i)(value)),
+                  onTap: cellTap(i))
+  ];
+}
+
+/// Formats a plain cell value the way Python's str() would.
+String formatCellValue(dynamic value) {
+  if (value == null) {
+    return "";
+  }
+  if (value is bool) {
+    return value ? "True" : "False";
+  }
+  if (value is DateTime) {
+    value = value.toLocal();
+    return value.hour == 0 && value.minute == 0 && value.second == 0
+        ? _defaultDateFormat.format(value)
+        : _defaultDateTimeFormat.format(value);
+  }
+  return value.toString();
+}
+
+final _defaultDateFormat = DateFormat("yyyy-MM-dd");
+final _defaultDateTimeFormat = DateFormat("yyyy-MM-dd HH:mm:ss");
+
+/// Formats a plain cell value for display.
+typedef CellFormatter = String Function(dynamic value);
+
+// Formatters compiled from the "format" of columns, along with the format
+// they were compiled from.
+final Expando<(Map?, CellFormatter?)> _columnFormatters = Expando();
+
+/// Returns the formatter of the plain values of a column, or null if it
+/// has no "format". Formatters are compiled once per column and cached
+/// until its format changes.
+CellFormatter? columnFormatter(Control column) {
+  var format = column.get("format");
+  var formatMap = format is Map ? format : null;
+  var cached = _columnFormatters[column];
+  if (cached != null && const MapEquality().equals(cached.$1, formatMap)) {
+    return cached.$2;
+  }
+  CellFormatter? formatter;
+  if (formatMap != null) {
+    try {
+      formatter = _compileFormat(formatMap, formatMap["locale"]);
+    } catch (_) {
+      // the locale isn't supported, or its data isn't loaded
+      formatter = _compileFormat(formatMap, null);
+    }
+  }
+  _columnFormatters[column] =
+      (formatMap == null ? null : {...formatMap}, formatter);
+  return formatter;
+}
+
+CellFormatter _compileFormat(Map format, String? locale) {
+  String? pattern = format["pattern"];
+  int? digits = parseInt(format["decimal_digits"]);
+  NumberFormat numberFormat;
+  switch (format["type"]) {
+    case "date":
+      var dateFormat = pattern != null
+          ? DateFormat(pattern, locale)
+          : DateFormat.yMd(locale);
+      return (value) {
+        if (value is num) {
+          // milliseconds since the Unix epoch
+          value = DateTime.fromMillisecondsSinceEpoch(value.toInt());
+        }
+        return value is DateTime
+            ? dateFormat.format(value.toLocal())
+            : formatCellValue(value);
+      };
+    case "percent":
+      numberFormat = pattern != null
+          ? NumberFormat(pattern, locale)
+          : NumberFormat.decimalPercentPattern(
+              locale: locale, decimalDigits: digits);
+    case "currency":
+      numberFormat = NumberFormat.currency(
+          locale: locale,
+          symbol: format["currency_symbol"],
+          decimalDigits: pattern != null ? null : digits,
+          customPattern: pattern);
+    default:
+      numberFormat = pattern != null
+          ? NumberFormat(pattern, locale)
+          : NumberFormat.decimalPattern(locale);
+      if (pattern == null && digits != null) {
+        numberFormat.minimumFractionDigits = digits;
+        numberFormat.maximumFractionDigits = digits;
+      }
+  }
+  return (value) =>
+      value is num ? numberFormat.format(value) : formatCellValue(value);
+}
+
+VoidCallback? _chain(VoidCallback? first, VoidCallback? second) {
+  if (first == null || second == null) {
+    return first ?? second;
+  }
+  return () {
+    first();
+    second();
+  };
+}
+
+void _trigger(Control control, String name, [dynamic data]) =>
+    control.triggerEvent(name, data);
+
+// Builds a cell; [onTap] handles its taps unless it has its own handler.
+DataCell _buildCell(Control cell, EventTrigger triggerTapDown,
+    [VoidCallback? onTap]) {
+  cell.notifyParent = true;
+  return DataCell(
+    cell.buildWidget("content")!,
+    placeholder: cell.getBool("placeholder", false)!,
+    showEditIcon: cell.getBool("show_edit_icon", false)!,
+    onDoubleTap: cell.getBool("on_double_tap", false)!
+        ? () => cell.triggerEvent("double_tap")
+        : null,
+    onLongPress: cell.getBool("on_long_press", false)!
+        ? () => cell.triggerEvent("long_press")
+        : null,
+    onTap: cell.getBool("on_tap", false)!
+        ? () => cell.triggerEvent("tap")
+        : onTap,
+    onTapCancel: cell.getBool("on_tap_cancel", false)!
+        ? () => cell.triggerEvent("tap_cancel")
+        : null,
+    onTapDown: cell.getBool("on_tap_down", false)!
+        ? (details) => triggerTapDown(cell, "tap_down", details.toMap())
+        : null,
+  );
+}
+
+// Text of a cell changed by update_cells(), rebuilt on its own as its value
+// changes, with a highlight fading out after each change.
+class _HotCellText extends StatefulWidget {
+  final ValueListenable<Object?> value;
+  final CellFormatter format;
+  final Color? flashColor;
+  final Duration flashDuration;
+
+  const _HotCellText(
+      {required this.value,
+      required this.format,
+      required this.flashColor,
+      required this.flashDuration});
+
+  @override
+  State<_HotCellText> createState() => _HotCellTextState();
+}
+
+class _HotCellTextState extends State<_HotCellText>
+    with SingleTickerProviderStateMixin {
+  late final AnimationController _flash =
+      AnimationController(vsync: this, duration: widget.flashDuration, value: 1);
+
+  @override
+  void initState() {
+    super.initState();
+    widget.value.addListener(_changed);
+  }
+
+  @override
+  void didUpdateWidget(_HotCellText oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (oldWidget.value != widget.value) {
+      oldWidget.value.removeListener(_changed);
+      widget.value.addListener(_changed);
+    }
+    _flash.duration = widget.flashDuration;
+  }
+
+  @override
+  void dispose() {
+    widget.value.removeListener(_changed);
+    _flash.dispose();
+    super.dispose();
+  }
+
+  void _changed() {
+    setState(() {});
+    if (widget.flashColor != null) {
+      _flash.forward(from: 0);
+    }
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    var text = Text(widget.format(widget.value.value));
+    var flashColor = widget.flashColor;
+    if (flashColor == null) {
+      return text;
+    }
+    return AnimatedBuilder(
+        animation: _flash,
+        builder: (context, child) => DecoratedBox(
+            decoration: BoxDecoration(
+                color: Color.lerp(
+                    flashColor, flashColor.withAlpha(0), _flash.value)),
+            child: child),
+        child: text);
+  }
+}
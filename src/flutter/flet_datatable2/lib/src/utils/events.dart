@@ -0,0 +1,62 @@
+import 'dart:async';
+
+import 'package:flet/flet.dart';
+import 'package:flutter/foundation.dart';
+
+/// Sends an event of [control], like [Control.triggerEvent].
+typedef EventTrigger = void Function(Control control, String name,
+    [dynamic data]);
+
+/// Sends events at most once per [interval].
+///
+/// The first event is sent right away and starts an interval; events
+/// run during the interval are held, and when it ends, the last event
+/// held for each key is sent, starting another interval. With a zero
+/// [interval], events are sent right away.
+class EventThrottle {
+  EventThrottle([this.interval = Duration.zero]);
+
+  Duration interval;
+  final Map<Object, VoidCallback> _held = {};
+  Timer? _timer;
+
+  /// Runs [send] now, or when the current interval ends, unless another
+  /// event with the same [key] is run before.
+  void run(Object key, VoidCallback send) {
+    if (_timer != null) {
+      _held[key] = send;
+      return;
+    }
+    send();
+    if (interval > Duration.zero) {
+      _timer = Timer(interval, _release);
+    }
+  }
+
+  /// Sends an event of [control] through [run], keyed by the control
+  /// and the name of the event.
+  void trigger(Control control, String name, [dynamic data]) =>
+      run((control.id, name), () => control.triggerEvent(name, data));
+
+  void _release() {
+    _timer = null;
+    if (_held.isEmpty) {
+      return;
+    }
+    var held = _held.values.toList();
+    _held.clear();
+    for (var send in held) {
+      send();
+    }
+    if (interval > Duration.zero) {
+      _timer = Timer(interval, _release);
+    }
+  }
+
+  /// Drops held events.
+  void dispose() {
+    _timer?.cancel();
+    _timer = null;
+    _held.clear();
+  }
+}
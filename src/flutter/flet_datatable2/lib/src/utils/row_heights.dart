@@ -0,0 +1,71 @@
+import 'dart:typed_data';
+
+/// Heights of a list of rows, indexed as a Fenwick tree, so that the
+/// offset of a row, the row at an offset and changing the height of a row
+/// all take O(log n), whatever the number of rows.
+class RowHeights {
+  /// Indexes [heights] in O(n).
+  RowHeights(List<double> heights)
+      : _heights = Float64List.fromList(heights),
+        _tree = Float64List(heights.length + 1) {
+    for (var i = 1; i < _tree.length; i++) {
+      _tree[i] += _heights[i - 1];
+      var parent = i + (i & -i);
+      if (parent < _tree.length) {
+        _tree[parent] += _tree[i];
+      }
+    }
+  }
+
+  final Float64List _heights;
+  // _tree[i] is the sum of the heights of rows (i - (i & -i)) to i - 1
+  final Float64List _tree;
+
+  int get length => _heights.length;
+
+  /// Sum of the heights of all rows.
+  double get total => offsetOf(length);
+
+  double heightOf(int index) => _heights[index];
+
+  void setHeight(int index, double height) {
+    var delta = height - _heights[index];
+    if (delta == 0) {
+      return;
+    }
+    _heights[index] = height;
+    for (var i = index + 1; i < _tree.length; i += i & -i) {
+      _tree[i] += delta;
+    }
+  }
+
+  /// Sum of the heights of rows before [index].
+  double offsetOf(int index) {
+    var offset = 0.0;
+    for (var i = index; i > 0; i -= i & -i) {
+      offset += _tree[i];
+    }
+    return offset;
+  }
+
+  /// Index of the row at [offset], clamped to the rows.
+  int indexAt(double offset) {
+    if (length == 0) {
+      return 0;
+    }
+    var index = 0;
+    var step = 1;
+    while (step * 2 < _tree.length) {
+      step *= 2;
+    }
+    // descends the tree, skipping the rows that end before [offset]
+    for (; step > 0; step >>= 1) {
+      var next = index + step;
+      if (next < _tree.length && _tree[next] <= offset) {
+        index = next;
+        offset -= _tree[next];
+      }
+    }
+    return index < length ? index : length - 1;
+  }
+}
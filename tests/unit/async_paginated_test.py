@@ -0,0 +1,57 @@
+import flet as ft
+
+import flet_datatable2 as ftd
+
+
+def make_table(fetched: list) -> ftd.AsyncPaginatedDataTable2:
+    async def fetch_page(start, count, sort, page_filter):
+        fetched.append(start)
+        return ftd.PageResult(
+            rows=[
+                ft.DataRow(cells=[ft.DataCell(ft.Text(str(i)))])
+                for i in range(start, start + count)
+            ],
+            total=100,
+        )
+
+    return ftd.AsyncPaginatedDataTable2(
+        columns=[ft.DataColumn(ft.Text("Index"))],
+        fetch_page=fetch_page,
+        prefetch_next_page=False,
+    )
+
+
+def request(loop, table, request_id, start, pending=()):
+    loop.run_until_complete(
+        table._trigger_event(
+            "fetch_page",
+            {"id": request_id, "start": start, "count": 5, "pending": list(pending)},
+        )
+    )
+
+
+def test_requests_of_a_cached_page_share_its_response(loop, page):
+    fetched = []
+    table = make_table(fetched)
+    page.add(table)
+
+    request(loop, table, 1, 0)
+    request(loop, table, 2, 5, pending=[1])
+    request(loop, table, 3, 0, pending=[1, 2])
+
+    assert fetched == [0, 5]
+    assert [p.request_ids for p in table.pages] == [[1, 3], [2]]
+    for response in table.pages:
+        assert all(row.parent is response for row in response.rows)
+
+
+def test_answered_requests_are_dropped(loop, page):
+    table = make_table([])
+    page.add(table)
+
+    request(loop, table, 1, 0)
+    request(loop, table, 2, 0, pending=[1])
+    request(loop, table, 3, 0)
+
+    assert [p.request_ids for p in table.pages] == [[3]]
+    assert all(row.parent is table.pages[0] for row in table.pages[0].rows)
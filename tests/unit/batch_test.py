@@ -0,0 +1,68 @@
+import pytest
+from tables import make_table
+
+
+def test_batch_sends_one_update(connection, page):
+    table = make_table(5)
+    page.add(table)
+    connection.messages.clear()
+
+    with table.batch():
+        for row in table.rows:
+            row.values[1] = -1
+            row.update()
+        table.update()
+        assert connection.messages == []
+
+    assert len(connection.messages) == 1
+    assert table.saved_updates == 5
+    assert all(row.cell_values[1] == -1 for row in table.rows)
+
+
+def test_nested_batches_of_two_tables(connection, page):
+    first, second = make_table(), make_table()
+    page.add(first, second)
+    session = page.session
+    connection.messages.clear()
+
+    with first.batch():
+        with second.batch():
+            first.rows[0].values[1] = 10
+            second.rows[0].values[1] = 20
+            first.update()
+            second.update()
+        # the inner batch only sends the second table
+        assert len(connection.messages) == 1
+        assert second.rows[0].cell_values[1] == 20
+        assert first.rows[0].cell_values[1] == 0
+        first.update()
+    assert len(connection.messages) == 2
+    assert first.rows[0].cell_values[1] == 10
+    assert "patch_control" not in vars(session)
+
+    second.rows[0].values[1] = 21
+    second.update()
+    assert len(connection.messages) == 3
+
+
+def test_batch_of_unmounted_table_sends_nothing(connection):
+    table = make_table()
+
+    with table.batch():
+        table.rows[0].values[1] = 7
+
+    assert connection.messages == []
+
+
+def test_batch_is_reset_by_exceptions(connection, page):
+    table = make_table()
+    page.add(table)
+    connection.messages.clear()
+
+    with pytest.raises(ValueError), table.batch():
+        table.update()
+        raise ValueError
+
+    table.rows[0].values[1] = 7
+    table.update()
+    assert len(connection.messages) == 1
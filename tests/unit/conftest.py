@@ -0,0 +1,56 @@
+import asyncio
+
+import flet as ft
+import msgpack
+import pytest
+from flet.controls.base_control import BaseControl
+from flet.messaging.connection import Connection
+from flet.messaging.protocol import configure_encode_object_for_msgpack
+from flet.messaging.session import Session
+from flet.pubsub.pubsub_hub import PubSubHub
+
+_encode = configure_encode_object_for_msgpack(BaseControl)
+
+
+def encode(message) -> bytes:
+    # as flet's own connections encode messages
+    return msgpack.packb(message, default=_encode)
+
+
+class RecordingConnection(Connection):
+    """
+    A connection to no client, recording the messages sent to it and
+    their encoded sizes.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self.loop = loop
+        self.pubsubhub = PubSubHub()
+        self.messages = []
+        self.sizes = []
+
+    def send_message(self, message):
+        self.messages.append(message)
+        self.sizes.append(len(encode([message.action, message.body])))
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def connection(loop) -> RecordingConnection:
+    connection = RecordingConnection(loop)
+    connection.session = Session(connection)
+    # sends the initial page, as when a client connects
+    encode(connection.session.get_page_patch())
+    return connection
+
+
+@pytest.fixture
+def page(connection) -> ft.Page:
+    return connection.session.page
@@ -0,0 +1,56 @@
+from tables import make_table
+
+import flet_datatable2 as ftd
+from flet_datatable2._patches import count_patch
+
+
+def last_patch(connection) -> list:
+    return connection.messages[-1].body.patch
+
+
+def test_empty_patch():
+    assert count_patch([]) == (0, 0)
+    assert count_patch(None) == (0, 0)
+
+
+def test_changed_values(connection, page):
+    table = make_table(5)
+    page.add(table)
+
+    table.rows[1].values[1] = 10
+    table.rows[3].values = ["x", 30]
+    table.update()
+
+    assert count_patch(last_patch(connection)) == (2, 3)
+
+
+def test_added_rows(connection, page):
+    table = make_table(5)
+    page.add(table)
+
+    table.rows.append(ftd.DataRow2(values=["a", 1]))
+    table.rows.insert(0, ftd.DataRow2(values=["b", 2]))
+    table.update()
+
+    assert count_patch(last_patch(connection)) == (2, 4)
+
+
+def test_removed_and_moved_rows_send_no_rows(connection, page):
+    table = make_table(5)
+    page.add(table)
+
+    del table.rows[2]
+    table.rows.reverse()
+    table.update()
+
+    assert count_patch(last_patch(connection)) == (0, 0)
+
+
+def test_other_properties_send_no_rows(connection, page):
+    table = make_table(5)
+    page.add(table)
+
+    table.column_spacing = 12
+    table.update()
+
+    assert count_patch(last_patch(connection)) == (0, 0)
@@ -0,0 +1,32 @@
+from tables import make_value_table
+
+import flet_datatable2 as ftd
+from flet_datatable2 import _bitset as bitset
+
+
+def visible(table) -> list:
+    bits = int.from_bytes(table.row_visibility, "little")
+    return [row.values[1] for i, row in enumerate(table.rows) if bits >> i & 1]
+
+
+def test_filter_sends_visibility_bitmap(connection, page):
+    table = make_value_table([3, None, 10, 2, 7])
+    page.add(table)
+
+    table.filter([ftd.RangeFilter(1, min=3, max=10)])
+    assert visible(table) == [3, 10, 7]
+    table.filter([ftd.RangeFilter(1, min=3), ftd.ValuesFilter(0, ["n2", "n4"])])
+    assert visible(table) == [10, 7]
+
+    table.rows.append(ftd.DataRow2(values=["n4", 8]))
+    table.update()
+    assert visible(table) == [10, 7, 8]
+
+    table.filter([])
+    assert table.row_visibility is None
+
+
+def test_bitset_round_trip():
+    bits = bitset.from_indexes([0, 9, 3], 12)
+
+    assert bitset.to_bytes(bits, 12) == bytes([0b1001, 0b10])
@@ -0,0 +1,40 @@
+from flet_datatable2._keyed_rows import (
+    POSITION_GAP,
+    assign_positions,
+    longest_increasing_subsequence,
+)
+
+
+def test_longest_increasing_subsequence():
+    assert longest_increasing_subsequence([]) == []
+    assert longest_increasing_subsequence([3, 1, 2, 5, 4, 6]) == [1, 2, 4, 5]
+    assert len(longest_increasing_subsequence([1, 1, 1])) == 1
+
+
+def test_new_rows_are_spaced_by_the_gap():
+    assert assign_positions([None, None]) == [POSITION_GAP, 2 * POSITION_GAP]
+
+
+def test_only_moved_and_added_rows_get_new_positions():
+    # the row at position 30 moved to the front and a row was added
+    positions = assign_positions([30, 10, 20, None, 40])
+
+    assert positions[1:3] == [10, 20]
+    assert positions[4] == 40
+    assert positions[0] < 10
+    assert 20 < positions[3] < 40
+
+
+def test_rows_are_renumbered_without_room_between_neighbours():
+    assert assign_positions([1, None, 2]) == [
+        POSITION_GAP,
+        2 * POSITION_GAP,
+        3 * POSITION_GAP,
+    ]
+
+
+def test_positions_follow_display_order():
+    positions = assign_positions([50, None, 5, None, None, 7, 3])
+
+    assert positions == sorted(positions)
+    assert len(set(positions)) == len(positions)
@@ -0,0 +1,36 @@
+from tables import make_table
+
+import flet_datatable2 as ftd
+
+
+def test_metrics_count_and_measure_the_table_patch(connection, page):
+    table = make_table(5, collect_metrics=True)
+    page.add(table)
+    table.reset_metrics()
+    connection.sizes.clear()
+
+    table.rows[1].values[1] = 10
+    table.rows[2].values = ["x", 20]
+    table.update()
+
+    metrics = table.metrics
+    assert (metrics.updates, metrics.rows_sent, metrics.cells_sent) == (1, 2, 3)
+    assert 0 < metrics.bytes_sent <= connection.sizes[0]
+    assert "send_message" not in vars(connection)
+
+
+def test_metrics_update_mounts_added_rows(connection, page):
+    table = make_table(2, collect_metrics=True)
+    page.add(table)
+    row = ftd.DataRow2(values=["n", 1])
+
+    table.rows.append(row)
+    table.update()
+    del table.rows[0]
+    table.update()
+
+    index = page.session.index
+    assert index[row._i] is row
+    assert all(r._i in index for r in table.rows)
+    assert table.metrics.rows_sent == 0
+    assert table.metrics.updates == 2
@@ -0,0 +1,51 @@
+import flet_datatable2 as ftd
+
+
+def test_select_range_and_count():
+    selection = ftd.SelectionModel(10)
+
+    selection.select_range(2, 6)
+    selection.deselect(3)
+
+    assert list(selection) == [2, 4, 5]
+    assert selection.selected_count == 3
+
+
+def test_inverted_selection():
+    selection = ftd.SelectionModel(5)
+    selection.select(1)
+
+    selection.invert()
+    assert list(selection) == [0, 2, 3, 4]
+    selection.deselect(2)
+    assert list(selection) == [0, 3, 4]
+    assert selection.selected_count == 3
+
+    selection.select_all()
+    assert selection.selected_count == 5
+    assert 4 in selection and 5 not in selection
+
+
+def test_resize_drops_removed_rows_and_leaves_added_rows_unselected():
+    selection = ftd.SelectionModel(4)
+    selection.select_range(2, 4)
+    selection._resize(3)
+    assert list(selection) == [2]
+    assert selection.selected_count == 1
+
+    selection.select_all()
+    selection._resize(6)
+    assert list(selection) == [0, 1, 2]
+    assert selection.selected_count == 3
+
+
+def test_remap_follows_rows_by_identity():
+    a, b, c, d = (object() for _ in range(4))
+    selection = ftd.SelectionModel(3)
+    selection.select_all()
+    selection.deselect(1)
+
+    selection._remap([a, b, c], [d, c, b, a])
+
+    assert list(selection) == [1, 3]
+    assert selection.row_count == 4
@@ -0,0 +1,32 @@
+from tables import make_table
+
+import flet_datatable2 as ftd
+
+
+def test_first_set_rows_of_unchanged_rows_sends_almost_nothing(connection, page):
+    table = make_table(2000)
+    page.add(table)
+    added = sum(connection.sizes)
+    connection.sizes.clear()
+
+    table.set_rows(
+        [ftd.DataRow2(key=f"k{i}", values=[f"n{i}", i]) for i in range(2000)]
+    )
+    table.update()
+
+    assert sum(connection.sizes) < 100 < added
+
+
+def test_set_rows_sends_only_moved_rows(connection, page):
+    table = make_table(2000)
+    page.add(table)
+    connection.sizes.clear()
+
+    order = list(range(2000))
+    order.insert(0, order.pop(1000))
+    table.set_rows([ftd.DataRow2(key=f"k{i}", values=[f"n{i}", i]) for i in order])
+    table.update()
+
+    assert sum(connection.sizes) < 200
+    rows = sorted(table.rows, key=lambda r: r.order_key)
+    assert [r.key for r in rows] == [f"k{i}" for i in order]
@@ -0,0 +1,33 @@
+import flet as ft
+
+import flet_datatable2 as ftd
+
+
+def make_row(key: str, *values) -> ftd.DataRow2:
+    return ftd.DataRow2(key=key, values=list(values))
+
+
+def test_set_rows_reorders_and_updates_values():
+    table = ftd.DataTable2(
+        columns=[ftd.DataColumn2(ft.Text("Name")), ftd.DataColumn2(ft.Text("Value"))],
+        rows=[
+            make_row("k1", "n1", 1),
+            make_row("k2", "n2", 2),
+            make_row("k3", "n3", 3),
+        ],
+    )
+    first, second, third = table.rows
+
+    table.set_rows(
+        [make_row("k3", "n3", 3), make_row("k2", "n2", 99), make_row("k1", "n1", 1)]
+    )
+
+    # existing rows are kept and merged
+    assert table.rows == [first, second, third]
+    assert second.values == ["n2", 99]
+    assert first.values == ["n1", 1]
+    # display order follows the new rows
+    assert sorted(table.rows, key=lambda r: r.order_key) == [third, second, first]
+
+    second.before_update()
+    assert second.cell_values == ["n2", 99]
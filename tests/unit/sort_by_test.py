@@ -0,0 +1,34 @@
+from tables import make_value_table
+
+import flet_datatable2 as ftd
+
+
+def displayed(table) -> list:
+    rows = {row._i: row for row in table.rows}
+    return [rows[i].values[1] for i in table.row_order]
+
+
+def test_sort_by_reorders_rows_on_the_client_only(connection, page):
+    table = make_value_table([3, None, 10, 2])
+    page.add(table)
+    rows = list(table.rows)
+    connection.sizes.clear()
+
+    table.sort_by(1, ascending=False)
+    table.update()
+
+    assert table.rows == rows
+    assert displayed(table) == [10, 3, 2, None]
+    assert (table.sort_column_index, table.sort_ascending) == (1, False)
+    assert sum(connection.sizes) < 100
+
+
+def test_sort_is_kept_as_rows_are_added(connection, page):
+    table = make_value_table([3, 1])
+    page.add(table)
+    table.sort_by(1)
+
+    table.rows.append(ftd.DataRow2(values=["n", 2]))
+    table.update()
+
+    assert displayed(table) == [1, 2, 3]
@@ -0,0 +1,87 @@
+from flet_datatable2._cells import sort_key
+from flet_datatable2._sort_index import _MAX_ORDERS, SortIndex
+
+COLUMNS = [
+    ["b", "a", None, "b", "a", None],
+    [2, 1, 3, None, 1, 2],
+]
+
+
+def make_index(columns=COLUMNS):
+    extracted = []
+
+    def extract_keys(column_index, key):
+        extracted.append((column_index, key))
+        values = columns[column_index]
+        if key is not None:
+            return [key(v) for v in values]
+        return [sort_key(v, column_index == 1) for v in values]
+
+    return SortIndex(extract_keys), extracted
+
+
+def test_single_column_sorts_are_stable_with_empty_cells_last():
+    index, _ = make_index()
+
+    assert index.order([(0, True, None)]) == [1, 4, 0, 3, 2, 5]
+    assert index.order([(0, False, None)]) == [0, 3, 1, 4, 2, 5]
+
+
+def test_multi_column_sorts_combine_ranks():
+    index, _ = make_index()
+
+    assert index.order([(0, True, None), (1, True, None)]) == [1, 4, 0, 3, 5, 2]
+    assert index.order([(0, True, None), (1, False, None)]) == [1, 4, 0, 3, 2, 5]
+    assert index.order([(0, False, None), (1, False, None)]) == [0, 3, 1, 4, 2, 5]
+    assert index.order([(1, False, None), (0, True, None)]) == [2, 0, 5, 1, 4, 3]
+
+
+def test_ranks_are_dense_and_cached():
+    index, extracted = make_index()
+
+    assert index.ranks(1) == ([1, 0, 2, 3, 0, 1], 4)
+    index.order([(1, True, None), (0, True, None)])
+    assert extracted == [(1, None), (0, None)]
+
+
+def test_invalidate_drops_only_the_column():
+    index, extracted = make_index()
+    index.order([(0, True, None)])
+    index.order([(1, True, None)])
+
+    index.invalidate(0)
+    index.order([(0, True, None)])
+    index.order([(1, True, None)])
+
+    assert extracted == [(0, None), (1, None), (0, None)]
+
+
+def test_only_the_last_custom_key_is_kept():
+    index, extracted = make_index()
+
+    def length(v):
+        return len(v or "")
+
+    index.order([(0, True, str)])
+    index.order([(0, True, length)])
+    index.order([(0, True, str)])
+
+    assert extracted == [(0, str), (0, length), (0, str)]
+
+
+def test_orders_cache_is_bounded():
+    columns = [[i] for i in range(_MAX_ORDERS + 5)]
+    index, _ = make_index(columns)
+
+    for column_index in range(len(columns)):
+        index.order([(column_index, True, None)])
+
+    assert len(index._orders) == _MAX_ORDERS
+
+
+def test_range_and_lookup():
+    index, _ = make_index()
+
+    assert index.range(1, (0, 1.0), (0, 2.0)) == [1, 4, 0, 5]
+    assert index.range(1, low=(0, 3.0)) == [2, 3]
+    assert index.lookup(0, [(0, "a"), (0, "b"), (0, "a")]) == [1, 4, 0, 3]
@@ -0,0 +1,121 @@
+import sqlite3
+
+import pytest
+
+import flet_datatable2 as ftd
+from flet_datatable2.sqlite_source import _seek_condition
+
+ROW_COUNT = 200
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "data.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE items (name TEXT, size INTEGER)")
+        connection.executemany(
+            "INSERT INTO items VALUES (?, ?)",
+            [
+                (f"n{i % 7}" if i % 5 else None, None if i % 3 == 0 else i % 11)
+                for i in range(ROW_COUNT)
+            ],
+        )
+    return path
+
+
+def expected_rows(path, order_by: str, where: str = "") -> list[list]:
+    with sqlite3.connect(path) as connection:
+        return [
+            list(row)
+            for row in connection.execute(
+                f"SELECT name, size FROM items {where} ORDER BY {order_by}, rowid"
+            )
+        ]
+
+
+def values(rows) -> list[list]:
+    return [row.values for row in rows]
+
+
+@pytest.mark.parametrize(
+    "order",
+    [
+        [("name", True)],
+        [("size", False)],
+        [("name", False), ("size", True)],
+        [("size", True), ("name", False)],
+    ],
+)
+def test_seek_condition_matches_rows_from_the_boundary(path, order):
+    order = [*order, ("rowid", True)]
+    order_by = ", ".join(f"{e} {'ASC' if asc else 'DESC'}" for e, asc in order)
+    keys = ", ".join(e for e, _ in order)
+    with sqlite3.connect(path) as connection:
+        ordered = connection.execute(
+            f"SELECT {keys} FROM items ORDER BY {order_by}"
+        ).fetchall()
+        for position in range(0, ROW_COUNT, 7):
+            condition, params = _seek_condition(order, ordered[position])
+            rows = connection.execute(
+                f"SELECT {keys} FROM items WHERE {condition} ORDER BY {order_by}",
+                params,
+            ).fetchall()
+            assert rows == ordered[position:]
+
+
+def test_pages_match_offset_paging_in_both_directions(path):
+    source = ftd.SqliteDataSource(path, "items", bookmark_interval=16)
+    for column_index, ascending, order_by in [
+        (0, True, "name ASC"),
+        (1, False, "size DESC"),
+    ]:
+        source.sort(column_index, ascending)
+        expected = expected_rows(path, order_by)
+        # scrolling forward, then back
+        for start in [*range(0, ROW_COUNT, 25), *range(ROW_COUNT - 10, -1, -30)]:
+            assert values(source.get_rows(start, 10)) == expected[start : start + 10]
+    source.close()
+
+
+def test_far_jump_places_bookmarks_once(path):
+    source = ftd.SqliteDataSource(path, "items", bookmark_interval=10)
+    source.sort_by_columns([(1, True), (0, False)])
+    expected = expected_rows(path, "size ASC, name DESC")
+
+    assert values(source.get_rows(170, 20)) == expected[170:190]
+    assert source._all_bookmarks
+    assert source._bookmark_positions == list(range(0, ROW_COUNT, 10))
+    assert values(source.get_rows(55, 5)) == expected[55:60]
+    source.close()
+
+
+def test_filters_restrict_rows_and_count(path):
+    source = ftd.SqliteDataSource(path, "items", bookmark_interval=8)
+    source.sort(1, False)
+    source.filter([ftd.RangeFilter(1, min=3, max=8), ftd.ValuesFilter(0, ["n1", None])])
+    expected = expected_rows(
+        path,
+        "size DESC",
+        "WHERE size BETWEEN 3 AND 8 AND (name = 'n1' OR name IS NULL)",
+    )
+
+    assert source.row_count == len(expected)
+    assert values(source.get_rows(0, ROW_COUNT)) == expected
+    assert values(source.get_rows(len(expected) - 3, 10)) == expected[-3:]
+    source.close()
+
+
+def test_refresh_source_reads_changed_database(path, connection, page):
+    source = ftd.SqliteDataSource(path, "items", bookmark_interval=16)
+    table = ftd.DataTable2(columns=source.columns, source=source)
+    page.add(table)
+    source.get_rows(150, 10)
+    with sqlite3.connect(path) as db:
+        db.executemany("INSERT INTO items VALUES (?, ?)", [("new", 1)] * 20)
+
+    table.refresh_source()
+
+    assert table.source_row_count == ROW_COUNT + 20
+    expected = expected_rows(path, "rowid")
+    assert values(source.get_rows(ROW_COUNT, 30)) == expected[ROW_COUNT:]
+    source.close()
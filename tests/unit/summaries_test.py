@@ -0,0 +1,49 @@
+import random
+
+from flet_datatable2 import _summaries
+from flet_datatable2._summaries import ColumnStats, SortedValues
+
+
+def test_sorted_values_split_and_merge_blocks(monkeypatch):
+    monkeypatch.setattr(_summaries, "_BLOCK_SIZE", 4)
+    rng = random.Random(1)
+    values = [rng.randrange(50) for _ in range(200)]
+    sorted_values = SortedValues()
+
+    for value in values:
+        sorted_values.add(value)
+    assert max(len(block) for block in sorted_values._blocks) <= 8
+    assert [v for block in sorted_values._blocks for v in block] == sorted(values)
+    assert sorted_values._maxes == [block[-1] for block in sorted_values._blocks]
+
+    rng.shuffle(values)
+    while values:
+        assert (sorted_values.min(), sorted_values.max()) == (min(values), max(values))
+        sorted_values.remove(values.pop())
+    assert sorted_values._blocks == [] and sorted_values._maxes == []
+
+
+def test_removing_extremes_updates_min_and_max():
+    stats = ColumnStats(ordered=True)
+    for value in (5, 1, 9, 1):
+        stats.add(value)
+
+    stats.remove(9)
+    stats.remove(1)
+
+    assert stats.value("min") == 1
+    assert stats.value("max") == 5
+    assert stats.value("sum") == 6
+    assert stats.value("count") == 2
+    assert stats.value("mean") == 3
+
+
+def test_float_sums_reset_when_empty():
+    stats = ColumnStats(ordered=False)
+    for value in (0.1, 0.2):
+        stats.add(value)
+    for value in (0.1, 0.2):
+        stats.remove(value)
+
+    assert stats.value("sum") == 0
+    assert stats.value("mean") is None
@@ -0,0 +1,37 @@
+import flet as ft
+
+import flet_datatable2 as ftd
+
+
+def make_model(values) -> ftd.TableModel:
+    columns = [ftd.DataColumn2(ft.Text("Value"), numeric=True)]
+    return ftd.TableModel(columns, {0: values})
+
+
+def test_missing_values_keep_integer_columns_integral():
+    model = make_model([3, None, 1])
+    model.append([None])
+
+    assert model.column_values(0).typecode == "q"
+    assert [model.value(i, 0) for i in range(4)] == [3, None, 1, None]
+    assert [r.values for r in model.get_rows(0, 4)] == [[3], [None], [1], [None]]
+
+
+def test_missing_values_sort_last():
+    model = make_model([3, None, 1, 2])
+
+    model.sort(0, True)
+    assert [r.values[0] for r in model.get_rows(0, 4)] == [1, 2, 3, None]
+    model.sort(0, False)
+    assert [r.values[0] for r in model.get_rows(0, 4)] == [3, 2, 1, None]
+
+
+def test_float_value_widens_column_keeping_missing_values():
+    model = make_model([3, None, 1])
+    model.set_value(0, 0, None)
+    model.set_value(1, 0, 2)
+
+    model.set_value(2, 0, 1.5)
+
+    assert model.column_values(0).typecode == "d"
+    assert [model.value(i, 0) for i in range(3)] == [None, 2, 1.5]
@@ -0,0 +1,22 @@
+import flet as ft
+
+import flet_datatable2 as ftd
+
+
+def make_table(row_count: int = 3, **kwargs) -> ftd.DataTable2:
+    return ftd.DataTable2(
+        columns=[ftd.DataColumn2(ft.Text("Name")), ftd.DataColumn2(ft.Text("Value"))],
+        rows=[ftd.DataRow2(key=f"k{i}", values=[f"n{i}", i]) for i in range(row_count)],
+        **kwargs,
+    )
+
+
+def make_value_table(values) -> ftd.DataTable2:
+    # a table with a numeric column holding the given values
+    return ftd.DataTable2(
+        columns=[
+            ftd.DataColumn2(ft.Text("Name")),
+            ftd.DataColumn2(ft.Text("Value"), numeric=True),
+        ],
+        rows=[ftd.DataRow2(values=[f"n{i}", v]) for i, v in enumerate(values)],
+    )
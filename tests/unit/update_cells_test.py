@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+from tables import make_table
+
+
+def record_cells(table) -> list:
+    sent = []
+
+    async def invoke_method(name, arguments=None, **kwargs):
+        sent.append((name, arguments))
+
+    table._invoke_method = invoke_method
+    return sent
+
+
+def test_update_cells_of_unmounted_table_changes_nothing():
+    table = make_table()
+
+    with pytest.raises(RuntimeError):
+        table.update_cells([("k1", 1, 42)])
+
+    assert table.rows[1].values == ["n1", 1]
+    assert not table._pending_cells
+    assert not table._sending_cells
+
+
+def test_update_cells_sends_after_mounting(page, loop):
+    table = make_table()
+    with pytest.raises(RuntimeError):
+        table.update_cells([("k1", 1, 42)])
+    page.add(table)
+    sent = record_cells(table)
+
+    table.update_cells([("k1", 1, 42)])
+    loop.run_until_complete(drain())
+
+    assert sent == [
+        ("update_cells", {"ids": [table.rows[1]._i], "columns": [1], "values": [42]})
+    ]
+    assert not table._sending_cells
+
+
+def test_update_cells_from_concurrent_threads(page, loop):
+    table = make_table(row_count=50)
+    page.add(table)
+    sent = record_cells(table)
+    barrier = threading.Barrier(8)
+
+    def tick(thread: int):
+        barrier.wait()
+        for value in range(100):
+            table.update_cells([(f"k{thread * 6 + i}", 1, value) for i in range(6)])
+
+    threads = [threading.Thread(target=tick, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    loop.run_until_complete(drain())
+
+    # every cell ends with its last value, both in the rows and as last sent
+    last_sent = {}
+    for _, arguments in sent:
+        for row_id, column, value in zip(
+            arguments["ids"], arguments["columns"], arguments["values"]
+        ):
+            last_sent[row_id, column] = value
+    for row in table.rows[:48]:
+        assert row.values[1] == 99
+        assert last_sent[row._i, 1] == 99
+    assert not table._sending_cells
+    assert not table._pending_cells
+
+
+async def drain():
+    # lets scheduled sends run to completion
+    for _ in range(10):
+        await asyncio.sleep(0)